@@ -0,0 +1,142 @@
+"""
+Startup / Import-Time Benchmark
+Measures process startup for audit-only and notify-only pipeline runs and for
+the dashboard's first paint (the login form), using `python -X importtime`
+
+Each scenario runs in a fresh process. Pipeline runs use an empty temp
+workspace, so the stages find nothing to do and the time measured is almost
+all imports; the dashboard runs from the project root like `streamlit run`.
+
+Usage:
+    python benchmarks/import_time.py --repeat 5 --output startup.json
+    python benchmarks/import_time.py --baseline startup.json
+"""
+
+import os
+import sys
+import json
+import shutil
+import platform
+import argparse
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Renders the dashboard script until its first st.stop() (the login form
+# for a new session) without a Streamlit server
+DASHBOARD_FIRST_PAINT = (
+    "import runpy, streamlit\n"
+    "def stop():\n"
+    "    raise SystemExit(0)\n"
+    "streamlit.stop = stop\n"
+    f"runpy.run_path({os.path.join(ROOT, 'dashboard.py')!r}, run_name='__main__')\n"
+)
+
+# name -> (interpreter arguments, run from the project root instead of a temp workspace)
+SCENARIOS = {
+    "audit-only": ([os.path.join(ROOT, "src", "main.py"), "--stages", "audit"], False),
+    "notify-only": ([os.path.join(ROOT, "src", "main.py"), "--stages", "notify"], False),
+    "dashboard-first-paint": (["-c", DASHBOARD_FIRST_PAINT], True),
+}
+
+# Top-level packages listed per scenario, heaviest first
+TOP_IMPORTS = 10
+
+DEFAULT_TOLERANCE = 0.20
+
+
+def parse_importtime(stderr: str) -> Dict[str, float]:
+    """Cumulative seconds of each top-level import from -X importtime output"""
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.startswith(" ") and not name.startswith("  "):
+            name = name.strip()
+            imports[name] = imports.get(name, 0) + int(cumulative) / 1e6
+    return imports
+
+
+def run_scenario(args: List[str], work_dir: str) -> Dict:
+    env = dict(os.environ, STORAGE_BACKEND="sqlite", PYTHONDONTWRITEBYTECODE="1",
+               JOBSNIPER_SCRAPER_NICE="0", DASHBOARD_USERNAME="bench", DASHBOARD_PASSWORD="bench")
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime"] + args, cwd=work_dir, env=env,
+                          capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+    imports = parse_importtime(proc.stderr)
+    return {"wall_seconds": wall, "import_seconds": sum(imports.values()), "imports": imports}
+
+
+def benchmark(repeat: int) -> List[Dict]:
+    results = []
+    for scenario, (args, in_project) in SCENARIOS.items():
+        runs = []
+        for _ in range(repeat):
+            work_dir = tempfile.mkdtemp(prefix="jobsniper-startup-")
+            try:
+                os.makedirs(os.path.join(work_dir, "data", "raw"))
+                profile = os.path.join(ROOT, "data", "profile.json")
+                if os.path.exists(profile):
+                    shutil.copy(profile, os.path.join(work_dir, "data", "profile.json"))
+                runs.append(run_scenario(args, ROOT if in_project else work_dir))
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+        heaviest = sorted(runs[-1]["imports"].items(), key=lambda item: -item[1])[:TOP_IMPORTS]
+        results.append({
+            "scenario": scenario,
+            "wall_seconds": round(statistics.median(r["wall_seconds"] for r in runs), 3),
+            "import_seconds": round(statistics.median(r["import_seconds"] for r in runs), 3),
+            "heaviest_imports": {name: round(seconds, 3) for name, seconds in heaviest},
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pipeline and dashboard startup benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario (median is reported)")
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--baseline", help="Results JSON to compare against (exit 1 on regression)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.repeat)
+    for result in results:
+        print(f"⏱️ {result['scenario']:<22} {result['wall_seconds']:6.2f}s wall  "
+              f"{result['import_seconds']:6.2f}s imports")
+        print("   " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in result["heaviest_imports"].items()))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"created_at": datetime.now().isoformat(timespec="seconds"),
+                       "python": platform.python_version(), "results": results}, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            previous = {r["scenario"]: r for r in json.load(f)["results"]}
+        regressed = 0
+        print("\n📏 Compared with baseline:")
+        for result in results:
+            before = previous.get(result["scenario"])
+            if not before:
+                continue
+            change = result["wall_seconds"] / before["wall_seconds"] - 1
+            marker = "❌" if change > args.tolerance else "✅"
+            regressed += change > args.tolerance
+            print(f"   {marker} {result['scenario']:<22} {before['wall_seconds']:6.2f}s → "
+                  f"{result['wall_seconds']:6.2f}s ({change:+.0%})")
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Notifier Delivery Benchmark
+Measures email throughput against a local aiosmtpd stand-in server: a fresh
+SMTP connection per message (the old notifier) vs one persistent session
+
+Usage:
+    pip install aiosmtpd
+    python benchmarks/notifier_throughput.py --messages 200 --handshake-ms 50
+"""
+
+import os
+import sys
+import time
+import argparse
+import smtplib
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "modules"))
+from mail_delivery import SMTPDelivery
+from standins import LocalSMTPServer
+
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+
+SENDER = "bench@jobsniper.local"
+RECIPIENTS = ["inbox@jobsniper.local"]
+
+
+def build_message(index: int):
+    msg = MIMEMultipart()
+    msg['From'] = SENDER
+    msg['To'] = ", ".join(RECIPIENTS)
+    msg['Subject'] = f"🎯 JobSniper benchmark #{index}"
+    msg.attach(MIMEText("\n".join(f"<p>🏢 Job card {n}</p>" for n in range(200)), 'html'))
+    return msg
+
+
+def send_per_message(host: str, port: int, count: int):
+    """Old notifier behaviour: connect, greet and quit for every email"""
+    for i in range(count):
+        server = smtplib.SMTP(host, port)
+        server.ehlo()
+        server.sendmail(SENDER, RECIPIENTS, build_message(i).as_string())
+        server.quit()
+
+
+def send_persistent(host: str, port: int, count: int):
+    with SMTPDelivery(host, port, SENDER, use_tls=False) as mailer:
+        for i in range(count):
+            mailer.send(build_message(i), RECIPIENTS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark notifier email delivery")
+    parser.add_argument("--messages", type=int, default=200, help="Emails per strategy")
+    parser.add_argument("--handshake-ms", type=float, default=50,
+                        help="Emulated per-connection handshake latency")
+    args = parser.parse_args()
+
+    try:
+        server = LocalSMTPServer(handshake_seconds=args.handshake_ms / 1000)
+    except ImportError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"📨 {args.messages} messages per strategy, {args.handshake_ms:.0f} ms handshake")
+    results = {}
+    with server:
+        handler = server.handler
+        for name, strategy in [("connection per message", send_per_message),
+                               ("persistent session", send_persistent)]:
+            before = handler.received
+            start = time.perf_counter()
+            strategy(server.host, server.port, args.messages)
+            elapsed = time.perf_counter() - start
+            delivered = handler.received - before
+            results[name] = delivered / elapsed
+            print(f"   {name:<24} {elapsed:7.2f}s  {results[name]:8.1f} msg/s  ({delivered} delivered)")
+
+    speedup = results["persistent session"] / results["connection per message"]
+    print(f"✅ Persistent session is {speedup:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""
+JobSniper Benchmark Suite
+Times the pipeline stages (scrape, dedup, audit, track, notify) offline at
+several job counts and writes machine-readable results for regression checks
+
+Scrapes are replayed from recorded fixtures or synthetic postings, request
+delays and audit cool-downs are disabled, the tracker uses a throwaway
+SQLite database and email goes to a local SMTP stand-in. Each job count runs
+in its own subprocess and temp directory.
+
+Usage:
+    pip install aiosmtpd   # for the notify scenario
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 100000 --output bench.json
+    python benchmarks/run_benchmarks.py --sizes 1000 --baseline bench.json
+    python benchmarks/run_benchmarks.py record --fixtures benchmarks/recorded   # live boards, once
+    python benchmarks/run_benchmarks.py --fixtures benchmarks/recorded --scenarios scrape
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+from contextlib import redirect_stdout
+from datetime import datetime
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_MODULES = os.path.join(ROOT, "src", "modules")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fixtures import SITES, generate_jobs, RecordingScraper, ReplayScraper
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SCENARIOS = ["scrape", "dedup", "audit", "track", "notify"]
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+# Search grid replayed by the scrape scenario (synthetic jobs are split across it)
+BENCH_QUERIES = ["AI Intern", "Machine Learning Intern"]
+BENCH_LOCATIONS = ["Remote", "Bangalore"]
+
+# A scenario regresses if it is this much slower than the baseline...
+DEFAULT_TOLERANCE = 0.20
+# ...and slower by at least this many seconds (ignores timer noise)
+MIN_REGRESSION_SECONDS = 0.05
+
+RESULTS_SCHEMA_VERSION = 1
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KB on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def _prepare_workspace(work_dir: str):
+    """Empty data/ tree (plus the real profile, so scores are realistic)"""
+    for sub in ["raw", "verified"]:
+        os.makedirs(os.path.join(work_dir, "data", sub), exist_ok=True)
+    profile = os.path.join(ROOT, "data", "profile.json")
+    if os.path.exists(profile):
+        shutil.copy(profile, os.path.join(work_dir, "data", "profile.json"))
+    os.chdir(work_dir)
+
+
+def _import_pipeline(work_dir: str):
+    """Import the pipeline modules pointed at work_dir, with delays disabled"""
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, SRC_MODULES)
+    from config import settings
+    settings.DATA_DIR = os.path.join(work_dir, "data", "raw")
+    settings.VERIFIED_DIR = os.path.join(work_dir, "data", "verified")
+    settings.USE_GEMINI = False
+
+    import scraper, auditor, tracker, notifier
+    scraper.REQUEST_DELAY_SECONDS = (0, 0)
+    auditor.COOLDOWN_SECONDS = 0
+    return settings, scraper, auditor, tracker, notifier
+
+
+# --- Worker (one job count, run in a subprocess) ---
+def run_worker(size: int, scenarios: List[str], params: Dict, fixtures_dir: Optional[str] = None) -> List[Dict]:
+    import pandas as pd
+    from standins import LocalSMTPServer, sqlite_env
+
+    work_dir = tempfile.mkdtemp(prefix="jobsniper-bench-")
+    smtp = None
+    try:
+        _prepare_workspace(work_dir)
+        os.environ.update(sqlite_env(work_dir))
+        os.environ["JOBSNIPER_PROGRESS_FILE"] = os.path.join(work_dir, "data", "progress.json")
+        os.environ["NOTIFY_RECIPIENTS"] = "inbox@jobsniper.local"
+        if "notify" in scenarios:
+            smtp = LocalSMTPServer().__enter__()
+            os.environ.update(smtp.env())
+
+        settings, scraper, auditor, tracker, notifier = _import_pipeline(work_dir)
+        raw_jobs = generate_jobs(size, **params)
+        jobs_latest = os.path.join(settings.DATA_DIR, "jobs_latest.csv")
+        results = []
+
+        def timed(scenario: str, fn):
+            with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+                started = time.perf_counter()
+                details = fn() or {}
+                seconds = time.perf_counter() - started
+            results.append({
+                "scenario": scenario,
+                "jobs": size,
+                "seconds": round(seconds, 4),
+                "jobs_per_second": round(size / seconds, 1) if seconds else None,
+                "peak_rss_mb": _peak_rss_mb(),
+                "details": details,
+            })
+
+        def scrape():
+            if fixtures_dir:
+                replay = ReplayScraper(fixtures_dir)
+                combos = replay.recorded_combinations()
+                queries = sorted({query for _, query, _ in combos})
+                locations = sorted({location for _, _, location in combos})
+                sites = sorted({site for site, _, _ in combos})
+            else:
+                queries, locations, sites = BENCH_QUERIES, BENCH_LOCATIONS, SITES
+                replay = ReplayScraper(synthetic=raw_jobs, queries=queries, locations=locations)
+            scraper.scrape_jobs = replay
+            scraped = scraper.run_extraction(queries, locations, sites)
+            return {"calls": replay.calls, "jobs_saved": len(scraped)}
+
+        def dedup():
+            deduped, removed = scraper.deduplicate_jobs(raw_jobs)
+            return {"jobs_out": len(deduped), "duplicates_removed": removed}
+
+        def audit():
+            if not os.path.exists(jobs_latest):
+                scraper.deduplicate_jobs(raw_jobs)[0].to_csv(jobs_latest, index=False)
+            auditor.run_auditor()
+            verified = pd.read_csv(auditor.OUTPUT_FILE) if os.path.exists(auditor.OUTPUT_FILE) else []
+            return {"jobs_verified": len(verified)}
+
+        def ensure_verified():
+            """Verified jobs for track/notify when audit wasn't benchmarked"""
+            if not os.path.exists(auditor.OUTPUT_FILE):
+                verified = scraper.deduplicate_jobs(raw_jobs)[0]
+                verified['relevance_score'] = [(i * 37) % 101 for i in range(len(verified))]
+                verified['match_reason'] = "Synthetic benchmark score"
+                verified['work_mode'] = "Remote"
+                verified['duration'] = "3 months"
+                verified.to_csv(auditor.OUTPUT_FILE, index=False)
+            verified = pd.read_csv(auditor.OUTPUT_FILE)
+            verified['relevance_score'] = pd.to_numeric(verified['relevance_score'], errors='coerce').fillna(0)
+            return verified
+
+        def track():
+            verified = ensure_verified()
+            matches = verified[verified['relevance_score'] >= notifier.MIN_MATCH_SCORE]
+            tracker.update_excel_tracker(matches)
+            return {"jobs_tracked": len(matches)}
+
+        def notify():
+            ensure_verified()
+            notifier.run_notifier()
+            return {"emails_sent": smtp.handler.received}
+
+        steps = {"scrape": scrape, "dedup": dedup, "audit": audit, "track": track, "notify": notify}
+        for scenario in SCENARIOS:
+            if scenario in scenarios:
+                timed(scenario, steps[scenario])
+        return results
+    finally:
+        if smtp:
+            smtp.__exit__(None, None, None)
+        os.chdir(ROOT)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+# --- Parent: run every size, write results, compare to a baseline ---
+def compare_results(results: List[Dict], baseline: Dict, tolerance: float) -> List[Dict]:
+    """Print a comparison and return the regressed entries"""
+    previous = {(r["scenario"], r["jobs"]): r for r in baseline.get("results", [])}
+    regressions = []
+    print(f"\n📏 Compared with baseline ({baseline.get('git_commit') or 'unknown commit'}, "
+          f"{baseline.get('created_at', '?')}):")
+    for result in results:
+        before = previous.get((result["scenario"], result["jobs"]))
+        if not before or not before["seconds"]:
+            continue
+        change = result["seconds"] / before["seconds"] - 1
+        regressed = change > tolerance and result["seconds"] - before["seconds"] > MIN_REGRESSION_SECONDS
+        marker = "❌" if regressed else "✅"
+        print(f"   {marker} {result['scenario']:<7} {result['jobs']:>7} jobs  "
+              f"{before['seconds']:8.3f}s → {result['seconds']:8.3f}s  ({change:+.0%})")
+        if regressed:
+            regressions.append(result)
+    return regressions
+
+
+def run_suite(args) -> int:
+    params = {"description_length": args.description_length, "duplicate_ratio": args.duplicate_ratio,
+              "scam_ratio": args.scam_ratio, "seed": args.seed}
+    print(f"⏱️ JobSniper benchmarks: sizes {args.sizes}, scenarios {args.scenarios}")
+    results = []
+    for size in args.sizes:
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as handle:
+            result_file = handle.name
+        command = [sys.executable, os.path.abspath(__file__), "worker", "--sizes", str(size),
+                   "--scenarios", *args.scenarios, "--result-file", result_file,
+                   "--description-length", str(args.description_length),
+                   "--duplicate-ratio", str(args.duplicate_ratio),
+                   "--scam-ratio", str(args.scam_ratio), "--seed", str(args.seed)]
+        if args.fixtures:
+            command += ["--fixtures", os.path.abspath(args.fixtures)]
+        proc = subprocess.run(command, capture_output=True, text=True)
+        try:
+            if proc.returncode != 0:
+                print(f"❌ {size} jobs failed:\n{proc.stderr[-2000:]}")
+                continue
+            with open(result_file, 'r') as f:
+                size_results = json.load(f)
+        finally:
+            os.remove(result_file)
+        for result in size_results:
+            print(f"   {result['scenario']:<7} {result['jobs']:>7} jobs  {result['seconds']:8.3f}s  "
+                  f"{result['jobs_per_second'] or 0:>10,.0f} jobs/s  peak {result['peak_rss_mb']} MB  "
+                  f"{result['details']}")
+        results.extend(size_results)
+
+    report = {
+        "schema_version": RESULTS_SCHEMA_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {**params, "fixtures": args.fixtures},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} scenario(s) regressed by more than {args.tolerance:.0%}")
+            return 1
+        print("✅ No regressions")
+    return 0
+
+
+def record_fixtures(args) -> int:
+    """Run the real scraper once and save every scrape_jobs result"""
+    from jobspy import scrape_jobs
+
+    work_dir = tempfile.mkdtemp(prefix="jobsniper-record-")
+    try:
+        _prepare_workspace(work_dir)
+        _, scraper, *_ = _import_pipeline(work_dir)
+        scraper.REQUEST_DELAY_SECONDS = (2, 4)  # live boards: stay polite
+        recorder = RecordingScraper(os.path.abspath(os.path.join(ROOT, args.fixtures))
+                                    if not os.path.isabs(args.fixtures) else args.fixtures, scrape_jobs)
+        scraper.scrape_jobs = recorder
+        queries = args.queries or BENCH_QUERIES
+        locations = args.locations or BENCH_LOCATIONS
+        sites = args.sites or SITES
+        scraper.run_extraction(queries, locations, sites)
+        recorder.write_manifest(queries=queries, locations=locations, sites=sites)
+        print(f"📼 Recorded {recorder.recorded} scrape(s) to {recorder.fixtures_dir}")
+        return 0
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline JobSniper pipeline benchmarks")
+    parser.add_argument("command", nargs="?", default="run", choices=["run", "record", "worker"],
+                        help="run benchmarks (default), record live scrape fixtures")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES, help="Job counts to benchmark")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--baseline", help="Results JSON to compare against (exit 1 on regression)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown vs the baseline (0.2 = 20%%)")
+    parser.add_argument("--fixtures", help="Recorded scrape fixtures directory")
+    parser.add_argument("--description-length", type=int, default=1500)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.1)
+    parser.add_argument("--scam-ratio", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--queries", nargs="+", help="record: search queries")
+    parser.add_argument("--locations", nargs="+", help="record: locations")
+    parser.add_argument("--sites", nargs="+", help="record: job boards")
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "worker":
+        params = {"description_length": args.description_length, "duplicate_ratio": args.duplicate_ratio,
+                  "scam_ratio": args.scam_ratio, "seed": args.seed}
+        results = run_worker(args.sizes[0], args.scenarios, params, args.fixtures)
+        with open(args.result_file, 'w') as f:
+            json.dump(results, f)
+        return 0
+    if args.command == "record":
+        if not args.fixtures:
+            print("❌ record needs --fixtures DIR")
+            return 1
+        return record_fixtures(args)
+    return run_suite(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
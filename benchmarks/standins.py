@@ -0,0 +1,88 @@
+"""
+Local Service Stand-ins for Benchmarks
+An in-process SMTP server (aiosmtpd) that accepts any login and counts
+messages, and the environment for a throwaway SQLite tracker database
+"""
+
+import os
+import socket
+import asyncio
+from typing import Dict
+
+try:
+    from aiosmtpd.controller import Controller
+    from aiosmtpd.smtp import AuthResult
+except ImportError:
+    Controller = None
+
+
+def free_port(host: str = "127.0.0.1") -> int:
+    with socket.socket() as probe:
+        probe.bind((host, 0))
+        return probe.getsockname()[1]
+
+
+class CountingHandler:
+    """Accepts every message; EHLO can be delayed to emulate a remote TLS/login handshake"""
+
+    def __init__(self, handshake_seconds: float = 0):
+        self.handshake_seconds = handshake_seconds
+        self.received = 0
+        self.recipients = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        if self.handshake_seconds:
+            await asyncio.sleep(self.handshake_seconds)
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        self.recipients += len(envelope.rcpt_tos)
+        return "250 OK"
+
+
+class LocalSMTPServer:
+    """SMTP stand-in on a free local port (use as a context manager)
+
+    Accepts AUTH with any credentials over plaintext so the notifier's
+    normal login path runs unchanged.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", handshake_seconds: float = 0):
+        if Controller is None:
+            raise ImportError("aiosmtpd is required for the SMTP stand-in: pip install aiosmtpd")
+        self.host = host
+        self.port = free_port(host)
+        self.handler = CountingHandler(handshake_seconds)
+        self._controller = Controller(
+            self.handler, hostname=host, port=self.port,
+            auth_require_tls=False,
+            authenticator=lambda *args: AuthResult(success=True),
+        )
+
+    def __enter__(self):
+        self._controller.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._controller.stop()
+
+    def env(self) -> Dict[str, str]:
+        """Notifier settings pointing at this server"""
+        return {
+            "SMTP_SERVER": self.host,
+            "SMTP_PORT": str(self.port),
+            "SMTP_USE_TLS": "false",
+            "EMAIL_APP_PASSWORD": "benchmark",
+        }
+
+
+def sqlite_env(work_dir: str) -> Dict[str, str]:
+    """Tracker settings for a throwaway SQLite database in work_dir"""
+    return {
+        "STORAGE_BACKEND": "sqlite",
+        "SQLITE_DB_PATH": os.path.join(work_dir, "data", "jobsniper.db"),
+        "SUPABASE_URL": "",
+        "SUPABASE_KEY": "",
+    }
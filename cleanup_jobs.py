@@ -1,22 +1,26 @@
 #!/usr/bin/env python3
 """
 JobSniper Database Cleanup Script
-Removes all job data from Supabase database and local files while preserving structure
+Removes all job data from the tracker database (Supabase or SQLite) and local files while preserving structure
 """
 
 import os
 import sys
 import json
+import gzip
 import pandas as pd
 import argparse
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 try:
-    from modules.db_manager import supabase, get_all_jobs, get_statistics
+    from modules.db_manager import get_backend, get_statistics
+    from modules.excel_export import write_full_export
+    from modules.email_history import get_email_history, HISTORY_LOG_FILE
+    from modules.analytics_store import get_analytics_store
 except ImportError:
     print("❌ Error: Could not import db_manager. Make sure you're in the JobSniper directory.")
     sys.exit(1)
@@ -37,11 +41,15 @@ class Colors:
 DATA_DIR = "data"
 VERIFIED_JOBS_FILE = os.path.join(DATA_DIR, "verified", "verified_jobs.csv")
 TRACKER_FILE = os.path.join(DATA_DIR, "Job_Application_Tracker.xlsx")
-HISTORY_FILE = os.path.join(DATA_DIR, "history.json")
+HISTORY_FILE = HISTORY_LOG_FILE
 PROCESSED_FILE = os.path.join(DATA_DIR, "processed.json")
 PROCESSED_METADATA_FILE = os.path.join(DATA_DIR, "processed_metadata.json")
 BACKUP_DIR = os.path.join(DATA_DIR, "backups")
 
+# Rows fetched per backup page / id span deleted per request
+BACKUP_PAGE_SIZE = 1000
+DELETE_CHUNK_SIZE = 500
+
 def print_header(text):
     """Print formatted header"""
     print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*60}{Colors.ENDC}")
@@ -72,16 +80,16 @@ def create_backup(backup_db=True, backup_local=True):
     backup_files = []
     
     try:
-        if backup_db and supabase:
-            # Backup database to JSON
+        if backup_db and get_backend():
+            # Backup database to gzipped NDJSON, one page at a time
             print_info("Creating database backup...")
-            df = get_all_jobs()
-            if len(df) > 0:
-                backup_file = os.path.join(BACKUP_DIR, f"database_backup_{timestamp}.json")
-                df.to_json(backup_file, orient='records', indent=2)
+            backup_file = os.path.join(BACKUP_DIR, f"database_backup_{timestamp}.ndjson.gz")
+            row_count = stream_database_backup(backup_file)
+            if row_count > 0:
                 backup_files.append(backup_file)
-                print_success(f"Database backed up to: {backup_file}")
+                print_success(f"Database backed up to: {backup_file} ({row_count} jobs)")
             else:
+                os.remove(backup_file)
                 print_info("Database is already empty, no backup needed")
         
         if backup_local:
@@ -113,12 +121,39 @@ def create_backup(backup_db=True, backup_local=True):
         print_error(f"Backup failed: {e}")
         return False
 
+def stream_database_backup(backup_file, page_size=BACKUP_PAGE_SIZE):
+    """Write every job to a gzipped NDJSON file using keyset pagination
+
+    Only one page of rows is held in memory at a time.
+
+    Returns:
+        int: Number of jobs written
+    """
+    backend = get_backend()
+    row_count = 0
+    last_id = 0
+    
+    with gzip.open(backup_file, 'wt', encoding='utf-8') as f:
+        while True:
+            page = backend.fetch_jobs_page(after_id=last_id, limit=page_size)
+            if not page:
+                break
+            for row in page:
+                f.write(json.dumps(row, default=str) + "\n")
+            row_count += len(page)
+            last_id = page[-1]['id']
+            print(f"\r   ...{row_count} jobs backed up", end="", flush=True)
+    
+    if row_count:
+        print()
+    return row_count
+
 def get_current_stats():
     """Get current statistics before cleanup"""
     stats = {}
     
     # Database stats
-    if supabase:
+    if get_backend():
         try:
             db_stats = get_statistics()
             stats['database'] = {
@@ -144,13 +179,10 @@ def get_current_stats():
         except:
             stats['local_files']['verified_jobs'] = 0
     
-    if os.path.exists(HISTORY_FILE):
-        try:
-            with open(HISTORY_FILE, 'r') as f:
-                history = json.load(f)
-                stats['local_files']['history'] = len(history)
-        except:
-            stats['local_files']['history'] = 0
+    try:
+        stats['local_files']['history'] = len(get_email_history())
+    except:
+        stats['local_files']['history'] = 0
     
     if os.path.exists(PROCESSED_FILE):
         try:
@@ -184,19 +216,60 @@ def display_stats(stats):
         print(f"  Email History: {local.get('history', 0)}")
         print(f"  Processed Jobs: {local.get('processed', 0)}")
 
-def clean_database():
-    """Delete all jobs from Supabase database (preserves table structure)"""
-    if not supabase:
-        print_error("Supabase client not initialized. Cannot clean database.")
+def clean_database(older_than_days=None, delete_rejected=False, chunk_size=DELETE_CHUNK_SIZE):
+    """Delete jobs from the tracker database (preserves table structure)
+    
+    Deletes in bounded id-range chunks so no single request can time out.
+    
+    Args:
+        older_than_days: Retention mode - only delete jobs found more than N days ago
+        delete_rejected: Retention mode - only delete jobs with status Rejected
+        chunk_size: Number of ids covered by each delete request
+    """
+    backend = get_backend()
+    if not backend:
+        print_error("Database backend not initialized. Cannot clean database.")
         return False
     
+    older_than = None
+    if older_than_days is not None:
+        older_than = (datetime.now() - timedelta(days=older_than_days)).strftime("%Y-%m-%d")
+    statuses = ["Rejected"] if delete_rejected else None
+    retention = older_than is not None or statuses is not None
+    
     try:
-        print_info("Deleting all jobs from Supabase database...")
+        if retention:
+            criteria = []
+            if older_than:
+                criteria.append(f"found before {older_than}")
+            if statuses:
+                criteria.append("status Rejected")
+            print_info(f"Deleting jobs ({' or '.join(criteria)}) from {backend.label} database...")
+        else:
+            print_info(f"Deleting all jobs from {backend.label} database...")
+        
+        min_id, max_id = backend.id_bounds()
+        if min_id is None:
+            print_info("Database is already empty")
+            return True
         
-        # Delete all records (this preserves the table structure)
-        result = supabase.table('jobs').delete().neq('id', 0).execute()
+        # Delete records chunk by chunk (this preserves the table structure)
+        deleted = 0
+        span = max_id - min_id + 1
+        for id_from in range(min_id, max_id + 1, chunk_size):
+            id_to = min(id_from + chunk_size, max_id + 1)
+            deleted += backend.delete_jobs(id_from, id_to, older_than=older_than, statuses=statuses)
+            percent = (id_to - min_id) / span * 100
+            print(f"\r   ...{percent:5.1f}% scanned, {deleted} jobs deleted", end="", flush=True)
+        print()
         
-        print_success("Database cleaned successfully! (Table structure preserved)")
+        # Analytics aggregates are rebuilt from the remaining jobs on next view
+        get_analytics_store().reset()
+        
+        if retention:
+            print_success(f"Retention cleanup removed {deleted} job(s)! (Table structure preserved)")
+        else:
+            print_success("Database cleaned successfully! (Table structure preserved)")
         return True
     
     except Exception as e:
@@ -219,30 +292,17 @@ def clean_local_files():
         
         # Clean tracker Excel - keep file with headers only
         if os.path.exists(TRACKER_FILE):
-            empty_df = pd.DataFrame(columns=[
-                'Date Found', 'Company', 'Role', 'Location', 'Duration', 
-                'Link', 'Match Score', 'Status'
-            ])
-            empty_df.to_excel(TRACKER_FILE, index=False)
-            
-            # Add dropdown validation
-            from openpyxl import load_workbook
-            from openpyxl.worksheet.datavalidation import DataValidation
-            
-            wb = load_workbook(TRACKER_FILE)
-            ws = wb.active
-            
-            options = '"Not Applied,Applied,Ongoing,Interviewing,Got Selected,Rejected"'
-            dv = DataValidation(type="list", formula1=options, allow_blank=True)
-            dv.add('H2:H100')
-            ws.add_data_validation(dv)
-            
-            wb.save(TRACKER_FILE)
+            # Header row plus Status dropdown, written in a single pass
+            write_full_export([], TRACKER_FILE)
             print_success("Cleaned: Job_Application_Tracker.xlsx")
         
+        # Clean email history - keep the (empty) append-only log
+        if os.path.exists(HISTORY_FILE):
+            get_email_history().clear()
+            print_success(f"Cleaned: {os.path.basename(HISTORY_FILE)}")
+        
         # Clean JSON files - reset to empty arrays/objects
         json_files = [
-            (HISTORY_FILE, []),
             (PROCESSED_FILE, []),
             (PROCESSED_METADATA_FILE, {})
         ]
@@ -271,11 +331,13 @@ Examples:
   python cleanup_jobs.py --local-only       # Clean only local files
   python cleanup_jobs.py --all --no-backup  # Clean without backup
   python cleanup_jobs.py --all --force      # Clean without confirmation
+  python cleanup_jobs.py --older-than 30    # Prune DB jobs found 30+ days ago
+  python cleanup_jobs.py --rejected         # Prune DB jobs with status Rejected
         """
     )
     
     parser.add_argument('--database-only', action='store_true',
-                        help='Clean only Supabase database')
+                        help='Clean only the tracker database')
     parser.add_argument('--local-only', action='store_true',
                         help='Clean only local files')
     parser.add_argument('--all', action='store_true',
@@ -284,16 +346,26 @@ Examples:
                         help='Skip backup creation')
     parser.add_argument('--force', action='store_true',
                         help='Skip confirmation prompts')
+    parser.add_argument('--older-than', type=int, metavar='DAYS',
+                        help='Retention mode: delete only database jobs found more than DAYS days ago')
+    parser.add_argument('--rejected', action='store_true',
+                        help='Retention mode: delete only database jobs with status Rejected')
+    parser.add_argument('--chunk-size', type=int, default=DELETE_CHUNK_SIZE,
+                        help=f'Job ids covered per delete request (default: {DELETE_CHUNK_SIZE})')
     
     args = parser.parse_args()
     
+    retention = args.older_than is not None or args.rejected
+    if retention and args.local_only:
+        parser.error("--older-than/--rejected apply to the database and cannot be combined with --local-only")
+    
     # Default to --all if no specific option is chosen
     if not args.database_only and not args.local_only:
         args.all = True
     
-    # Determine what to clean
+    # Determine what to clean (retention mode only prunes the database)
     clean_db = args.database_only or args.all
-    clean_local = args.local_only or args.all
+    clean_local = (args.local_only or args.all) and not retention
     
     # Print header
     print_header("JobSniper Data Cleanup Tool")
@@ -312,7 +384,10 @@ Examples:
     
     # Confirmation
     if not args.force:
-        print(f"\n{Colors.WARNING}{Colors.BOLD}WARNING: This will permanently delete all job data!{Colors.ENDC}")
+        if retention:
+            print(f"\n{Colors.WARNING}{Colors.BOLD}WARNING: This will permanently delete matching database jobs!{Colors.ENDC}")
+        else:
+            print(f"\n{Colors.WARNING}{Colors.BOLD}WARNING: This will permanently delete all job data!{Colors.ENDC}")
         print(f"{Colors.WARNING}Structure (database tables, file formats) will be preserved.{Colors.ENDC}")
         
         if not args.no_backup:
@@ -340,7 +415,9 @@ Examples:
     success = True
     
     if clean_db:
-        if not clean_database():
+        if not clean_database(older_than_days=args.older_than,
+                              delete_rejected=args.rejected,
+                              chunk_size=args.chunk_size):
             success = False
     
     if clean_local:
@@ -350,7 +427,11 @@ Examples:
     # Final summary
     print_header("Cleanup Complete")
     
-    if success:
+    if success and retention:
+        print_success("✅ Retention cleanup finished; all other jobs were kept.")
+        if not args.no_backup:
+            print_info(f"\n📦 Backups saved in: {BACKUP_DIR}")
+    elif success:
         print_success("✅ All data has been successfully cleaned!")
         print_info("\nWhat was preserved:")
         print("  • Database table structure (jobs table still exists)")
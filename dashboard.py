@@ -5,7 +5,6 @@ Manual scraping control with background execution
 """
 
 import streamlit as st
-import pandas as pd
 import json
 import os
 import sys
@@ -13,9 +12,6 @@ import subprocess
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-import plotly.express as px
-import plotly.graph_objects as go
-import bcrypt
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -23,48 +19,25 @@ load_dotenv()
 
 # Import background scraper
 sys.path.insert(0, 'src/modules')
-from background_scraper import get_scraper
+from background_scraper import get_scraper, BackgroundScraper
+from run_queue import get_run_queue, describe_params, RUN_PRESETS
+from email_history import get_email_history
+from analytics_store import SCORE_BIN_WIDTH
+from login_guard import get_login_limiter, log_auth_attempt, LOCKOUT_DURATION
+from run_metrics import load_run_metrics
+from run_profiler import load_profile_summaries
 
 # --- Security Configuration ---
-AUDIT_LOG_FILE = "data/auth_audit.log"
-MAX_LOGIN_ATTEMPTS = 5
-LOCKOUT_DURATION = 900  # 15 minutes in seconds
 SESSION_TIMEOUT = 1800  # 30 minutes in seconds
 
-def log_auth_attempt(username, success, ip="unknown"):
-    """Log authentication attempts for security audit"""
-    os.makedirs("data", exist_ok=True)
-    timestamp = datetime.now().isoformat()
-    status = "SUCCESS" if success else "FAILED"
-    log_entry = f"{timestamp} | {status} | User: {username} | IP: {ip}\n"
-    
-    with open(AUDIT_LOG_FILE, 'a') as f:
-        f.write(log_entry)
-
 def check_rate_limit(username):
     """Check if user is rate limited due to too many failed attempts"""
-    if not os.path.exists(AUDIT_LOG_FILE):
-        return True
-    
-    # Read recent failed attempts
-    cutoff_time = datetime.now() - timedelta(seconds=LOCKOUT_DURATION)
-    failed_attempts = 0
-    
-    try:
-        with open(AUDIT_LOG_FILE, 'r') as f:
-            for line in f:
-                if "FAILED" in line and username in line:
-                    try:
-                        timestamp_str = line.split(" | ")[0]
-                        attempt_time = datetime.fromisoformat(timestamp_str)
-                        if attempt_time > cutoff_time:
-                            failed_attempts += 1
-                    except:
-                        continue
-    except:
-        return True
-    
-    return failed_attempts < MAX_LOGIN_ATTEMPTS
+    return get_login_limiter().is_allowed(username)
+
+def record_failed_login(username):
+    """Audit a failed login and count it towards the user's lockout"""
+    get_login_limiter().record_failure(username)
+    log_auth_attempt(username, False)
 
 def check_session_timeout():
     """Check if session has timed out due to inactivity"""
@@ -88,12 +61,9 @@ def check_password():
     VALID_USERNAME = os.getenv("DASHBOARD_USERNAME", "zenthoriax")
     VALID_PASSWORD = os.getenv("DASHBOARD_PASSWORD", "9806")
     
-    # Hash the password for comparison (bcrypt)
-    if "password_hash" not in st.session_state:
-        st.session_state["password_hash"] = bcrypt.hashpw(VALID_PASSWORD.encode(), bcrypt.gensalt())
-    
     def password_entered():
         """Validate credentials with rate limiting"""
+        import bcrypt
         username = st.session_state.get("username", "")
         password = st.session_state.get("password", "")
         
@@ -101,7 +71,7 @@ def check_password():
         if not check_rate_limit(username):
             st.session_state["password_correct"] = False
             st.session_state["rate_limited"] = True
-            log_auth_attempt(username, False)
+            record_failed_login(username)
             return
         
         # Validate credentials
@@ -120,7 +90,7 @@ def check_password():
         else:
             st.session_state["password_correct"] = False
             st.session_state["rate_limited"] = False
-            log_auth_attempt(username, False)
+            record_failed_login(username)
     
     # Check session timeout
     if "password_correct" in st.session_state and st.session_state["password_correct"]:
@@ -154,7 +124,7 @@ def check_password():
         
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
-            st.error(f"🚫 Too many failed login attempts. Please wait 15 minutes before trying again.")
+            st.error(f"🚫 Too many failed login attempts. Please wait {LOCKOUT_DURATION // 60} minutes before trying again.")
             st.info("This security measure protects against brute force attacks.")
         
         return False
@@ -185,6 +155,10 @@ def check_password():
 if not check_password():
     st.stop()
 
+# Heavy imports wait until after login so the login form paints quickly
+# (plotly is imported by the pages that chart)
+import pandas as pd
+
 # --- Configuration ---
 st.set_page_config(
     page_title="JobSniper Dashboard",
@@ -273,7 +247,6 @@ st.markdown("""
 VERIFIED_JOBS_FILE = "data/verified/verified_jobs.csv"
 TRACKER_FILE = "data/Job_Application_Tracker.xlsx"
 PROFILE_FILE = "data/profile.json"
-HISTORY_FILE = "data/history.json"
 PROCESSED_FILE = "data/processed.json"
 SCRAPER_LOG_FILE = "data/scraper_log.txt"
 
@@ -307,11 +280,8 @@ def save_profile(profile_data):
         json.dump(profile_data, f, indent=2)
 
 def load_history():
-    """Load email history"""
-    if os.path.exists(HISTORY_FILE):
-        with open(HISTORY_FILE, 'r') as f:
-            return json.load(f)
-    return []
+    """Load email history (shared append-only log, refreshed incrementally)"""
+    return get_email_history()
 
 def load_processed():
     """Load processed jobs"""
@@ -320,6 +290,18 @@ def load_processed():
             return json.load(f)
     return []
 
+@st.cache_data(ttl=60)
+def load_tracker_stats():
+    """Load tracker statistics from the database (cached between reruns)"""
+    from db_manager import get_statistics
+    return get_statistics()
+
+def render_sidebar_footer():
+    """Render the sidebar footer shown under every page"""
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("Made with ❤️ by JobSniper")
+    st.sidebar.markdown("v3.0 - Manual Control Edition")
+
 def load_config():
     """Load scraper configuration"""
     import sys
@@ -337,23 +319,257 @@ def load_config():
     except:
         return {}
 
+PROGRESS_REFRESH_SECONDS = 5
+LIVE_LOG_LINES = 30
+SEARCH_RESULT_LIMIT = 50
+RUN_METRICS_LIMIT = 30
+PROFILE_TOP_N = 20
+
+@st.fragment(run_every=PROGRESS_REFRESH_SECONDS)
+def live_progress_panel():
+    """Live progress metrics and log tail for a running scrape
+    
+    Runs as a Streamlit fragment: the auto-refresh reruns only this function,
+    never the sidebar or page-level database queries.
+    """
+    scraper = get_scraper()
+    
+    if not scraper.is_running():
+        # Run just finished: one full rerun to show the summary and fresh data
+        st.cache_data.clear()
+        st.rerun(scope="app")
+    
+    progress = scraper.get_progress()
+    
+    st.subheader("📊 Live Progress")
+    
+    # Progress metrics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Phase", (progress.get("phase") or "Unknown").title())
+    with col2:
+        st.metric("Jobs Scraped", progress.get("jobs_scraped", 0))
+    with col3:
+        st.metric("Verified", progress.get("jobs_verified", 0))
+    with col4:
+        st.metric("High Score (75+)", progress.get("high_score_jobs", 0))
+    
+    # Phase progress (combination i/N while scraping, job i/N while auditing)
+    step, total_steps = progress.get("step") or 0, progress.get("total_steps")
+    if total_steps:
+        label = f"{(progress.get('phase') or '').title()}: {step}/{total_steps}"
+        if progress.get("current_search"):
+            label += f" · {progress['current_search']}"
+        if progress.get("eta_seconds") is not None:
+            eta_minutes, eta_seconds = divmod(int(progress["eta_seconds"]), 60)
+            label += f" · ETA {eta_minutes}m {eta_seconds}s"
+        st.progress(min(step / total_steps, 1.0), text=label)
+    
+    # Elapsed time
+    if progress.get("start_time"):
+        try:
+            start_time = datetime.fromisoformat(progress["start_time"])
+            elapsed = datetime.now() - start_time
+            minutes = int(elapsed.total_seconds() // 60)
+            seconds = int(elapsed.total_seconds() % 60)
+            st.info(f"⏱️ Running for: {minutes}m {seconds}s")
+        except:
+            pass
+    
+    # Resource usage of the scraper process (sampled by the pipeline itself)
+    telemetry = scraper.get_telemetry()
+    if telemetry:
+        latest = telemetry[-1]
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Memory (RSS)", f"{latest['rss_mb']:.0f} MB",
+                      help=f"Peak this run: {progress.get('peak_rss_mb', latest['rss_mb']):.0f} MB")
+        with col2:
+            st.metric("CPU", f"{latest['cpu_percent']:.0f}%")
+        with col3:
+            st.metric("Open Files", latest["open_files"])
+        
+        usage_df = pd.DataFrame(telemetry).set_index("elapsed")[["rss_mb", "cpu_percent"]]
+        usage_df.columns = ["Memory (MB)", "CPU (%)"]
+        st.line_chart(usage_df, height=180)
+    
+    # Live logs: follow the file from the last offset instead of re-reading the tail
+    st.markdown("### 📋 Live Logs")
+    log_state = st.session_state.get("live_log")
+    if not log_state or log_state["run"] != progress.get("start_time"):
+        log_state = {"run": progress.get("start_time"), "offset": 0, "lines": []}
+        st.session_state["live_log"] = log_state
+    new_text, log_state["offset"] = scraper.read_logs_since(log_state["offset"])
+    if new_text:
+        log_state["lines"] = (log_state["lines"] + new_text.splitlines())[-LIVE_LOG_LINES:]
+    logs = "\n".join(log_state["lines"])
+    if logs:
+        st.code(logs, language="text")
+    else:
+        st.info("⏳ Initializing scraper... Logs will appear shortly.")
+    
+    st.caption(f"💡 Auto-refreshing every {PROGRESS_REFRESH_SECONDS} seconds · "
+               f"last update {datetime.now().strftime('%H:%M:%S')}")
+
+@st.fragment(run_every=PROGRESS_REFRESH_SECONDS)
+def run_queue_panel():
+    """Recent queued/scheduled runs with live phase and yields"""
+    run_queue = get_run_queue()
+    runs = run_queue.list_runs(limit=25)
+    
+    if not runs:
+        st.info("No queued runs yet.")
+        return
+    
+    rows = []
+    for run in runs:
+        phase = run.get("phase") or ""
+        if run["status"] == "running" and run.get("total_steps"):
+            phase += f" {run.get('step', 0)}/{run['total_steps']}"
+        rows.append({
+            "Run": run["id"],
+            "Status": run["status"],
+            "Phase": phase,
+            "Params": describe_params(run["params"]),
+            "Source": run["source"],
+            "Queued": run["created_at"][:16].replace("T", " "),
+            "Duration (s)": round(run["duration_seconds"]) if run["duration_seconds"] else None,
+            "Scraped": run.get("jobs_scraped"),
+            "Verified": run.get("jobs_verified"),
+            "High Score": run.get("high_score_jobs"),
+            "Emailed": run.get("jobs_emailed"),
+            "Peak MB": run.get("peak_rss_mb"),
+        })
+    st.dataframe(pd.DataFrame(rows), hide_index=True, width="stretch")
+    
+    active = [run["id"] for run in runs if run["status"] in ("queued", "running")]
+    if active:
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            run_id = st.selectbox("Run", active, key="cancel_run_id", label_visibility="collapsed")
+        with col2:
+            if st.button("✖️ Cancel run", key="cancel_run"):
+                if run_queue.cancel(run_id):
+                    st.success(f"Run #{run_id} cancelled")
+
+@st.fragment(run_every=PROGRESS_REFRESH_SECONDS)
+def rescore_run_panel(run_id):
+    """Progress of the re-score queued by a profile save, then its report"""
+    run = next((run for run in get_run_queue().list_runs(limit=25) if run["id"] == run_id), None)
+    if run is None:
+        return
+    
+    if run["status"] == "queued":
+        st.info(f"🔁 Re-score of stored jobs queued as run #{run_id}; it starts when a run slot is free.")
+    elif run["status"] == "running":
+        step, total = run.get("step") or 0, run.get("total_steps")
+        st.info(f"🔁 Re-scoring stored jobs (run #{run_id})...")
+        if run.get("phase") == "rescoring" and total:
+            st.progress(min(step / total, 1.0), text=f"{step}/{total} postings")
+    else:
+        if st.session_state.get("rescore_run_done") != run_id:
+            # Scores changed under the cached listings and stats
+            st.session_state["rescore_run_done"] = run_id
+            st.cache_data.clear()
+        if run["status"] == "completed":
+            st.success(f"🔁 Re-score run #{run_id} finished")
+        else:
+            st.error(f"❌ Re-score run #{run_id} {run['status']}: {run.get('error') or 'see the run log'}")
+        if run.get("run_dir"):
+            st.code(BackgroundScraper(run["run_dir"]).get_logs(tail_lines=LIVE_LOG_LINES), language=None)
+
+def run_metrics_panel():
+    """Stage timings and peak memory across recent runs (data/metrics/)"""
+    import plotly.express as px
+    
+    runs = load_run_metrics(limit=RUN_METRICS_LIMIT)
+    if not runs:
+        st.info("No run metrics yet. They are recorded at the end of every pipeline run.")
+        return
+    
+    stage_rows = [
+        {"Run": run["started_at"].replace("T", " ")[:16], "Stage": stage["name"],
+         "Seconds": stage["seconds"], "Peak MB": stage["peak_rss_mb"]}
+        for run in runs for stage in run.get("stages", [])
+    ]
+    if stage_rows:
+        stage_df = pd.DataFrame(stage_rows)
+        col1, col2 = st.columns(2)
+        with col1:
+            fig_time = px.bar(stage_df, x="Run", y="Seconds", color="Stage",
+                              title="Time per Stage", labels={"Run": ""})
+            st.plotly_chart(fig_time, width="stretch")
+        with col2:
+            fig_memory = px.line(stage_df, x="Run", y="Peak MB", color="Stage", markers=True,
+                                 title="Peak Memory per Stage", labels={"Run": ""})
+            st.plotly_chart(fig_memory, width="stretch")
+    
+    labels = [f"{run['started_at'].replace('T', ' ')[:19]} · {run['status']} · {run['total_seconds']:.0f}s"
+              for run in runs]
+    selected = st.selectbox("Run details", range(len(runs)), index=len(runs) - 1,
+                            format_func=lambda i: labels[i], key="run_metrics_run")
+    run = runs[selected]
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        spans = pd.DataFrame.from_dict(run.get("spans", {}), orient="index")
+        if len(spans) > 0:
+            spans = spans.rename(columns={"count": "Calls", "total_seconds": "Total (s)",
+                                          "mean_ms": "Mean (ms)", "max_ms": "Max (ms)"})
+            st.dataframe(spans, width="stretch")
+    with col2:
+        counters = run.get("counters", {})
+        if counters:
+            st.dataframe(pd.Series(counters, name="Count"), width="stretch")
+
+def profiler_panel():
+    """Hottest functions of a profiled run (data/profiles/)"""
+    summaries = load_profile_summaries()
+    if not summaries:
+        st.info("No profiled runs yet. Tick \"🔬 Profile this run\" or run `python src/main.py --profile`.")
+        return
+    
+    labels = [f"{s['created_at'].replace('T', ' ')} · {s['status']} · {s['total_seconds']:.0f}s" for s in summaries]
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        selected = st.selectbox("Profile", range(len(summaries)), format_func=lambda i: labels[i],
+                                key="profile_summary")
+    with col2:
+        sort = st.radio("Rank by", ["Self time", "Cumulative time"], horizontal=True, key="profile_sort")
+    with col3:
+        top_n = st.number_input("Top N", min_value=5, max_value=50, value=PROFILE_TOP_N, step=5,
+                                key="profile_top_n")
+    
+    summary = summaries[selected]
+    rows = summary["top_self"] if sort == "Self time" else summary["top_cumulative"]
+    hot_df = pd.DataFrame(rows[:int(top_n)]).rename(columns={
+        "function": "Function", "calls": "Calls", "primitive_calls": "Primitive Calls",
+        "self_seconds": "Self (s)", "cumulative_seconds": "Cumulative (s)"})
+    if len(hot_df) > 0:
+        hot_df["% of Run"] = (hot_df["Self (s)" if sort == "Self time" else "Cumulative (s)"]
+                              / max(summary["total_seconds"] or 0, 1e-9) * 100).round(1)
+    st.dataframe(hot_df, hide_index=True, width="stretch")
+    
+    if os.path.exists(summary["prof_path"]):
+        with open(summary["prof_path"], "rb") as f:
+            st.download_button("⬇️ Download .prof (pstats / snakeviz)", f.read(),
+                               file_name=os.path.basename(summary["prof_path"]), key="profile_download")
+
 # --- Sidebar ---
 st.sidebar.title("🦅 JobSniper")
 st.sidebar.markdown("**Manual Job Hunter**")
 
-# Database Connection Status
+# Database Connection Status (health check is cached, not re-run on every rerun)
 try:
-    from src.modules.db_manager import supabase
-    if supabase:
-        # Test connection
-        try:
-            test_result = supabase.table('jobs').select("id").limit(1).execute()
-            st.sidebar.success("🟢 Supabase Connected")
-        except Exception as e:
-            st.sidebar.error("🔴 Database Error")
-            st.sidebar.caption(f"Error: {str(e)[:50]}...")
-    else:
+    from db_manager import get_health
+    health = get_health()
+    if health["ok"]:
+        st.sidebar.success(f"🟢 {health['label']} Connected")
+    elif health["backend"] is None:
         st.sidebar.warning("🟡 No Database Config")
+    else:
+        st.sidebar.error("🔴 Database Error")
+        st.sidebar.caption(f"Error: {str(health['error'])[:50]}...")
 except Exception as e:
     st.sidebar.error("🔴 Connection Failed")
 
@@ -367,13 +583,9 @@ page = st.sidebar.radio(
 st.sidebar.markdown("---")
 st.sidebar.markdown("### Quick Stats")
 
-# Get data from Supabase instead of verified CSV for accurate stats
+# Get data from the tracker database instead of verified CSV for accurate stats
 try:
-    from src.modules.db_manager import get_all_jobs, get_statistics
-    
-    # Get jobs from Supabase
-    tracker_jobs = get_all_jobs()
-    stats = get_statistics()
+    stats = load_tracker_stats()
     
     st.sidebar.metric("Jobs in Tracker", stats.get('total_jobs', 0))
     st.sidebar.metric("Not Applied", stats.get('not_applied', 0))
@@ -407,6 +619,8 @@ if page == "🎯 Scraper Control":
     scraper = get_scraper()
     is_scraper_running = scraper.is_running()
     progress = scraper.get_progress()
+    # Queued runs share the pipeline CSVs (and rollback backups) with a manual run
+    queued_running = get_run_queue().running_count()
     
     # Status indicator
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -437,16 +651,23 @@ if page == "🎯 Scraper Control":
     # Run button
     col_a, col_b, col_c = st.columns([1, 1, 2])
     
+    with col_c:
+        profile_run = st.checkbox("🔬 Profile this run", key="profile_run",
+                                  help="Run under cProfile; hot functions appear under Run Performance")
+    
     with col_a:
-        if st.button("🚀 Run Scraper Now", type="primary", width="stretch", disabled=is_scraper_running):
-            result = scraper.start()
+        if st.button("🚀 Run Scraper Now", type="primary", width="stretch",
+                     disabled=is_scraper_running or queued_running > 0):
+            result = scraper.start(["--profile"] if profile_run else None)
             if result["success"]:
                 st.success("✅ Scraper started in background!")
-                st.info("💡 Dashboard will remain responsive. Refresh to see progress.")
+                st.info("💡 Dashboard will remain responsive; progress below updates automatically.")
                 time.sleep(2)
                 st.rerun()
             else:
                 st.error(f"❌ {result['error']}")
+        if queued_running and not is_scraper_running:
+            st.caption(f"⏳ {queued_running} queued run(s) in progress; wait for them to finish")
     
     with col_b:
         # Stop button with rollback option
@@ -506,46 +727,10 @@ if page == "🎯 Scraper Control":
         st.markdown("---")
     
     
-    # Progress display
+    # Progress display (self-refreshing fragment; the rest of the page stays put)
     if is_scraper_running:
         st.markdown("---")
-        st.subheader("📊 Live Progress")
-        
-        # Progress metrics
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric("Phase", progress.get("phase", "Unknown").title())
-        with col2:
-            st.metric("Jobs Scraped", progress.get("jobs_scraped", 0))
-        with col3:
-            st.metric("Verified", progress.get("jobs_verified", 0))
-        with col4:
-            st.metric("High Score (75+)", progress.get("high_score_jobs", 0))
-        
-        # Elapsed time
-        if progress.get("start_time"):
-            try:
-                start_time = datetime.fromisoformat(progress["start_time"])
-                elapsed = datetime.now() - start_time
-                minutes = int(elapsed.total_seconds() // 60)
-                seconds = int(elapsed.total_seconds() % 60)
-                st.info(f"⏱️ Running for: {minutes}m {seconds}s")
-            except:
-                pass
-        
-        # Live logs
-        st.markdown("### 📋 Live Logs")
-        logs = scraper.get_logs(tail_lines=30)
-        if logs:
-            st.code(logs, language="text")
-        else:
-            st.info("⏳ Initializing scraper... Logs will appear shortly.")
-        
-        # Auto-refresh
-        st.info("💡 Page auto-refreshes every 5 seconds during scraping")
-        time.sleep(5)
-        st.rerun()
+        live_progress_panel()
     
     # Completed run summary
     elif progress.get("status") in ["completed", "cancelled"] or (not is_scraper_running and progress.get("jobs_verified", 0) > 0):
@@ -565,6 +750,9 @@ if page == "🎯 Scraper Control":
                 success_rate = (progress.get("high_score_jobs", 0) / progress.get("jobs_verified", 1)) * 100
                 st.metric("Quality Rate", f"{success_rate:.0f}%")
         
+        if progress.get("peak_rss_mb"):
+            st.caption(f"🧠 Peak memory: {progress['peak_rss_mb']:.0f} MB")
+        
         # Show logs
         with st.expander("📋 View Full Logs"):
             logs = scraper.get_logs(tail_lines=100)
@@ -588,6 +776,82 @@ if page == "🎯 Scraper Control":
             if logs:
                 st.code(logs, language="text")
 
+    # Run queue & schedules
+    st.markdown("---")
+    st.subheader("🗓️ Run Queue & Schedules")
+    st.caption("Queue targeted runs (a few queries, sites or stages) instead of the full sweep; "
+               "runs start in order as slots free up.")
+    
+    run_queue = get_run_queue()
+    config = load_config()
+    
+    with st.expander("➕ Queue or schedule a run"):
+        with st.form("queue_run_form"):
+            preset = st.selectbox("Run type", list(RUN_PRESETS.keys()))
+            run_queries = st.multiselect("Queries (empty = all)", config.get("queries", []))
+            run_locations = st.multiselect("Locations (empty = all)", config.get("locations", []))
+            run_sites = st.multiselect("Sites (empty = all)", config.get("sites", []))
+            run_profiled = st.checkbox("🔬 Profile the run")
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                schedule_name = st.text_input("Schedule name (optional)")
+            with col2:
+                schedule_cron = st.text_input("Cron (minute hour day month weekday)",
+                                              placeholder="0 */6 * * *")
+            
+            col_q, col_s = st.columns(2)
+            with col_q:
+                queue_now = st.form_submit_button("📥 Queue now", width="stretch")
+            with col_s:
+                save_schedule = st.form_submit_button("🗓️ Save schedule", width="stretch")
+        
+        run_params = {
+            "queries": run_queries,
+            "locations": run_locations,
+            "sites": run_sites,
+            "stages": RUN_PRESETS[preset],
+            "profile": run_profiled,
+        }
+        if queue_now:
+            run_id = run_queue.enqueue(run_params)
+            st.success(f"✅ Queued run #{run_id} ({describe_params(run_params)})")
+        if save_schedule:
+            if not schedule_name or not schedule_cron:
+                st.error("❌ Schedule name and cron expression are required")
+            else:
+                try:
+                    run_queue.add_schedule(schedule_name.strip(), schedule_cron.strip(), run_params)
+                    st.success(f"✅ Schedule '{schedule_name}' saved")
+                except ValueError as e:
+                    st.error(f"❌ Invalid schedule: {e}")
+    
+    schedules = run_queue.list_schedules()
+    if schedules:
+        st.markdown("**Schedules**")
+        for schedule in schedules:
+            col1, col2, col3 = st.columns([3, 1, 1])
+            with col1:
+                st.markdown(f"`{schedule['cron']}` **{schedule['name']}** · "
+                            f"{describe_params(schedule['params'])}")
+            with col2:
+                enabled = st.toggle("Enabled", value=schedule["enabled"], key=f"schedule_on_{schedule['name']}")
+                if enabled != schedule["enabled"]:
+                    run_queue.set_schedule_enabled(schedule["name"], enabled)
+            with col3:
+                if st.button("🗑️ Remove", key=f"schedule_rm_{schedule['name']}"):
+                    run_queue.remove_schedule(schedule["name"])
+                    st.rerun()
+    
+    run_queue_panel()
+    
+    st.markdown("---")
+    st.subheader("⏱️ Run Performance")
+    run_metrics_panel()
+    
+    st.markdown("#### 🔬 Profiled Runs")
+    profiler_panel()
+
 # --- PAGE 1: Overview ---
 elif page == "📊 Overview":
     st.title("📊 Dashboard Overview")
@@ -597,16 +861,6 @@ elif page == "📊 Overview":
     verified_df = load_verified_jobs()
     history = load_history()
     
-    # Get data from Supabase
-    try:
-        from src.modules.db_manager import get_all_jobs, get_statistics
-        tracker_jobs = get_all_jobs()
-        stats = get_statistics()
-    except Exception as e:
-        st.error(f"Error loading data: {e}")
-        tracker_jobs = pd.DataFrame()
-        stats = {}
-    
     # Key Metrics
     col1, col2, col3, col4 = st.columns(4)
     
@@ -691,9 +945,46 @@ elif page == "📊 Overview":
 elif page == "💼 Job Listings":
     st.title("💼 Job Listings")
     
+    # Full-text search over every audited posting (ranked, with snippets)
+    search_query = st.text_input(
+        "🔎 Search jobs",
+        placeholder='e.g. python "machine learning" remote',
+        help="Searches title, company, description and match reason"
+    )
+    
+    if search_query.strip():
+        from search_index import get_search_index
+        
+        st.sidebar.markdown("### Filters")
+        min_score = st.sidebar.slider("Minimum Score", 0, 100, 0)
+        selected_mode = st.sidebar.selectbox("Work Mode", ["All", "Remote", "Hybrid", "On-site"])
+        
+        search_started = time.perf_counter()
+        hits = get_search_index().search(
+            search_query, limit=SEARCH_RESULT_LIMIT, min_score=min_score,
+            work_mode=None if selected_mode == "All" else selected_mode
+        )
+        elapsed_ms = (time.perf_counter() - search_started) * 1000
+        
+        st.markdown(f"### {len(hits)} results")
+        st.caption(f"Searched in {elapsed_ms:.0f} ms")
+        
+        for hit in hits:
+            score = hit['relevance_score'] or 0
+            with st.expander(f"**{hit['title']}** at {hit['company']} - Score: {score:.0f}/100", expanded=True):
+                st.markdown(hit['snippet'])
+                details = [d for d in (hit['work_mode'], hit['location'], hit['duration']) if d]
+                if details:
+                    st.caption(" | ".join(details))
+                st.markdown(f"[🚀 Apply Now]({hit['job_url']})")
+        
+        # Search results replace the browse view below
+        render_sidebar_footer()
+        st.stop()
+    
     # Load jobs from Supabase Application Tracker
     try:
-        from src.modules.db_manager import get_all_jobs
+        from db_manager import get_all_jobs
         jobs_df = get_all_jobs()
         
         # Rename columns to match expected format
@@ -797,13 +1088,19 @@ elif page == "📋 Application Tracker":
     import sys
     sys.path.insert(0, 'src/modules')
     from db_manager import (
-        get_all_jobs, get_jobs_by_status, update_job_status, 
-        update_job_notes, delete_job, get_statistics, sync_to_excel,
-        VALID_STATUSES
+        get_jobs_page, get_jobs_by_status, queue_job_changes,
+        sync_to_excel, get_write_queue, VALID_STATUSES
     )
     
+    TRACKER_PAGE_SIZE = 50
+    
     # Get statistics
-    stats = get_statistics()
+    stats = load_tracker_stats()
+    
+    # Edits waiting in the local write queue (e.g. while offline)
+    pending_writes = get_write_queue().pending_count()
+    if pending_writes:
+        st.caption(f"⏳ {pending_writes} change(s) saved locally, syncing to the database...")
     
     # Summary stats
     col1, col2, col3, col4, col5 = st.columns(5)
@@ -827,82 +1124,96 @@ elif page == "📋 Application Tracker":
     with tab1:
         st.subheader("All Applications")
         
-        # Get all jobs
-        jobs_df = get_all_jobs()
+        # Filters are applied by the database; only one page is loaded
+        fcol1, fcol2, fcol3 = st.columns([1, 2, 1])
+        with fcol1:
+            status_filter = st.selectbox("Status", ["All"] + VALID_STATUSES, key="tracker_status_filter")
+        with fcol2:
+            search_filter = st.text_input("Search company or role", key="tracker_search")
+        with fcol3:
+            min_score_filter = st.number_input("Min Score", min_value=0, max_value=100, value=0, step=5,
+                                               key="tracker_min_score")
+        
+        filters = dict(
+            status=None if status_filter == "All" else status_filter,
+            search=search_filter.strip() or None,
+            min_score=min_score_filter or None
+        )
         
-        if len(jobs_df) == 0:
-            st.info("No applications tracked yet. Jobs will appear here after the scraper runs and emails you.")
+        page_num = st.session_state.get("tracker_page", 1)
+        jobs_df, total_jobs = get_jobs_page(page_num, TRACKER_PAGE_SIZE, **filters)
+        total_pages = max(1, -(-total_jobs // TRACKER_PAGE_SIZE))
+        if page_num > total_pages:
+            # Filters shrank the result set; jump back to the first page
+            st.session_state["tracker_page"] = page_num = 1
+            jobs_df, total_jobs = get_jobs_page(page_num, TRACKER_PAGE_SIZE, **filters)
+        
+        if total_jobs == 0:
+            if any(v is not None for v in filters.values()):
+                st.info("No applications match these filters.")
+            else:
+                st.info("No applications tracked yet. Jobs will appear here after the scraper runs and emails you.")
         else:
-            # Display each job as an interactive card
-            for idx, job in jobs_df.iterrows():
-                with st.expander(f"**{job['company']}** - {job['role']} ({job['status']})", expanded=False):
-                    col1, col2 = st.columns([2, 1])
-                    
-                    with col1:
-                        st.markdown(f"**Company:** {job['company']}")
-                        st.markdown(f"**Role:** {job['role']}")
-                        st.markdown(f"**Location:** {job['location'] if pd.notna(job['location']) else 'N/A'}")
-                        st.markdown(f"**Duration:** {job['duration'] if pd.notna(job['duration']) else 'N/A'}")
-                        st.markdown(f"**Match Score:** {job['match_score']:.0f}/100")
-                        st.markdown(f"**Date Found:** {job['date_found']}")
-                        if pd.notna(job['date_applied']):
-                            st.markdown(f"**Date Applied:** {job['date_applied']}")
-                        
-                        st.markdown(f"[🔗 View Job]({job['link']})")
-                    
-                    with col2:
-                        # Status badge
-                        status_colors = {
-                            "Not Applied": "🔵",
-                            "Applied": "🟡",
-                            "Ongoing": "🟠",
-                            "Interviewing": "🟣",
-                            "Got Selected": "🟢",
-                            "Rejected": "🔴"
-                        }
-                        st.markdown(f"### {status_colors.get(job['status'], '⚪')} {job['status']}")
-                        
-                        # Update status
-                        new_status = st.selectbox(
-                            "Change Status",
-                            VALID_STATUSES,
-                            index=VALID_STATUSES.index(job['status']),
-                            key=f"status_{job['id']}"
-                        )
-                        
-                        if st.button("💾 Update Status", key=f"update_{job['id']}"):
-                            if update_job_status(job['id'], new_status):
-                                sync_to_excel()
-                                st.success("Status updated!")
-                                st.cache_data.clear()
-                                st.rerun()
-                    
-                    # Notes section
-                    st.markdown("---")
-                    st.markdown("**📝 Notes:**")
-                    current_notes = job['notes'] if pd.notna(job['notes']) else ""
-                    notes = st.text_area(
-                        "Add notes/comments",
-                        value=current_notes,
-                        key=f"notes_{job['id']}",
-                        height=100
-                    )
-                    
-                    col_a, col_b = st.columns([1, 1])
-                    with col_a:
-                        if st.button("💾 Save Notes", key=f"save_notes_{job['id']}"):
-                            if update_job_notes(job['id'], notes):
-                                sync_to_excel()
-                                st.success("Notes saved!")
-                                st.cache_data.clear()
-                    
-                    with col_b:
-                        if st.button("🗑️ Delete Job", key=f"delete_{job['id']}", type="secondary"):
-                            if delete_job(job['id']):
-                                sync_to_excel()
-                                st.success("Job deleted!")
-                                st.cache_data.clear()
-                                st.rerun()
+            # One editable grid per page instead of a widget set per job
+            grid_df = jobs_df[['id', 'company', 'role', 'location', 'match_score',
+                               'date_found', 'status', 'notes', 'link']].copy()
+            grid_df['notes'] = grid_df['notes'].fillna("")
+            grid_df['delete'] = False
+            
+            edited_df = st.data_editor(
+                grid_df,
+                key=f"tracker_grid_{page_num}_{status_filter}_{search_filter}_{min_score_filter}",
+                hide_index=True,
+                column_order=['company', 'role', 'location', 'match_score', 'date_found',
+                              'status', 'notes', 'link', 'delete'],
+                disabled=['company', 'role', 'location', 'match_score', 'date_found', 'link'],
+                column_config={
+                    "company": "Company",
+                    "role": "Role",
+                    "location": "Location",
+                    "match_score": st.column_config.ProgressColumn(
+                        "Match Score", min_value=0, max_value=100, format="%.0f"
+                    ),
+                    "date_found": "Date Found",
+                    "status": st.column_config.SelectboxColumn(
+                        "Status", options=VALID_STATUSES, required=True
+                    ),
+                    "notes": st.column_config.TextColumn("📝 Notes", width="large"),
+                    "link": st.column_config.LinkColumn("Link", display_text="🔗 View"),
+                    "delete": st.column_config.CheckboxColumn("🗑️ Delete")
+                }
+            )
+            
+            # Diff the grid against what was loaded; only edited jobs are sent
+            changes = {}
+            deletes = {}
+            for before, after in zip(grid_df.itertuples(index=False), edited_df.itertuples(index=False)):
+                if after.delete:
+                    deletes[before.id] = before.link
+                    continue
+                edit = {}
+                if after.status != before.status:
+                    edit["status"] = after.status
+                if (after.notes or "") != before.notes:
+                    edit["notes"] = after.notes or ""
+                if edit:
+                    changes[before.id] = edit
+            
+            col_a, col_b, col_c = st.columns([1, 1, 2])
+            with col_a:
+                st.number_input(f"Page (of {total_pages})", min_value=1, max_value=total_pages,
+                                key="tracker_page")
+            with col_b:
+                st.markdown(f"**{total_jobs} jobs** · {len(changes) + len(deletes)} unsaved change(s)")
+            with col_c:
+                if st.button("💾 Save Changes", type="primary", disabled=not (changes or deletes)):
+                    # Queued write: saved locally now, synced in the background
+                    if queue_job_changes(changes, deletes):
+                        st.success(f"Saved {len(changes)} update(s) and {len(deletes)} deletion(s)!")
+                        st.cache_data.clear()
+                        st.rerun()
+                    else:
+                        st.error("Could not save changes")
     
     with tab2:
         st.subheader("Filter by Status")
@@ -952,46 +1263,36 @@ elif page == "📋 Application Tracker":
 
 # --- PAGE 4: Analytics ---
 elif page == "📈 Analytics":
+    import plotly.express as px
+    
     st.title("📈 Job Market Analytics")
     st.markdown("### Visualize your job search data")
     
-    # Load jobs from Supabase
+    # Precomputed aggregates (kept up to date as jobs are added and edited)
     try:
-        from src.modules.db_manager import get_all_jobs
-        jobs_df = get_all_jobs()
-        
-        # Rename columns to match expected format
-        if len(jobs_df) > 0:
-            verified_df = jobs_df.rename(columns={
-                'company': 'company',
-                'role': 'title',
-                'match_score': 'relevance_score',
-                'location': 'location'
-            })
-            # Add work_mode if not present
-            if 'work_mode' not in verified_df.columns:
-                verified_df['work_mode'] = verified_df['location'].apply(
-                    lambda x: 'Remote' if x and 'remote' in str(x).lower() else 'On-site'
-                )
-        else:
-            verified_df = pd.DataFrame()
+        from db_manager import get_job_analytics
+        analytics = get_job_analytics()
     except Exception as e:
-        st.error(f"Error loading jobs: {e}")
-        verified_df = pd.DataFrame()
+        st.error(f"Error loading analytics: {e}")
+        analytics = {}
     
-    if len(verified_df) == 0:
+    if not analytics.get('total'):
         st.warning("No data available yet. Run the scraper first!")
     else:
+        total_jobs = analytics['total']
+        company_counts = pd.Series(analytics['company'], dtype=int).sort_values(ascending=False)
+        
         # Score Distribution
         st.subheader("📊 Score Distribution")
-        fig_score = px.histogram(
-            verified_df,
-            x='relevance_score',
-            nbins=20,
+        score_bins = pd.Series(analytics['score_bins'], dtype=int).sort_index()
+        fig_score = px.bar(
+            x=score_bins.index + SCORE_BIN_WIDTH / 2,
+            y=score_bins.values,
             title="Job Match Score Distribution",
-            labels={'relevance_score': 'Match Score', 'count': 'Number of Jobs'},
+            labels={'x': 'Match Score', 'y': 'Number of Jobs'},
             color_discrete_sequence=['#1f77b4']
         )
+        fig_score.update_traces(width=SCORE_BIN_WIDTH * 0.95)
         st.plotly_chart(fig_score, width="stretch")
         
         col1, col2 = st.columns(2)
@@ -999,10 +1300,10 @@ elif page == "📈 Analytics":
         with col1:
             # Top Companies
             st.subheader("🏢 Top Companies Hiring")
-            company_counts = verified_df['company'].value_counts().head(10)
+            top_companies = company_counts.head(10)
             fig_companies = px.bar(
-                x=company_counts.values,
-                y=company_counts.index,
+                x=top_companies.values,
+                y=top_companies.index,
                 orientation='h',
                 title="Top 10 Companies",
                 labels={'x': 'Number of Jobs', 'y': 'Company'},
@@ -1013,16 +1314,51 @@ elif page == "📈 Analytics":
         
         with col2:
             # Work Mode Distribution
-            if 'work_mode' in verified_df.columns:
-                st.subheader("🌍 Work Mode Distribution")
-                work_mode_counts = verified_df['work_mode'].value_counts()
-                fig_mode = px.pie(
-                    values=work_mode_counts.values,
-                    names=work_mode_counts.index,
-                    title="Remote vs On-site vs Hybrid",
-                    color_discrete_sequence=px.colors.qualitative.Set3
+            st.subheader("🌍 Work Mode Distribution")
+            work_mode_counts = pd.Series(analytics['work_mode'], dtype=int)
+            fig_mode = px.pie(
+                values=work_mode_counts.values,
+                names=work_mode_counts.index,
+                title="Remote vs On-site vs Hybrid",
+                color_discrete_sequence=px.colors.qualitative.Set3
+            )
+            st.plotly_chart(fig_mode, width="stretch")
+        
+        # Application Funnel
+        st.subheader("🔻 Application Funnel")
+        funnel_df = pd.DataFrame.from_dict(analytics['funnel_by_date'], orient='index')
+        funnel_df.index = pd.to_datetime(funnel_df.index, errors='coerce')
+        funnel_df = funnel_df[funnel_df.index.notna()].sort_index()
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            stage_totals = funnel_df.sum() if len(funnel_df) > 0 else pd.Series(dtype=int)
+            fig_funnel = px.funnel(
+                x=stage_totals.values,
+                y=stage_totals.index,
+                title="Found → Applied → Interviewing → Selected",
+                color_discrete_sequence=['#9b59b6']
+            )
+            st.plotly_chart(fig_funnel, width="stretch")
+        
+        with col2:
+            if len(funnel_df) > 0:
+                weekly = funnel_df.resample('W').sum()
+                weekly = weekly[weekly['Found'] > 0]
+                conversion = pd.DataFrame({
+                    'Jobs Found': weekly['Found'],
+                    'Applied %': (weekly['Applied'] / weekly['Found'] * 100).round(1),
+                    'Interviewing %': (weekly['Interviewing'] / weekly['Found'] * 100).round(1),
+                })
+                fig_conversion = px.line(
+                    conversion,
+                    y=['Applied %', 'Interviewing %'],
+                    markers=True,
+                    title="Weekly Conversion (by week found)",
+                    labels={'index': 'Week', 'value': '% of Jobs Found', 'variable': ''}
                 )
-                st.plotly_chart(fig_mode, width="stretch")
+                st.plotly_chart(fig_conversion, width="stretch")
         
         # Key Insights
         st.subheader("💡 Key Insights")
@@ -1030,17 +1366,14 @@ elif page == "📈 Analytics":
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            avg_score = verified_df['relevance_score'].mean()
-            st.metric("Average Match Score", f"{avg_score:.1f}/100")
+            st.metric("Average Match Score", f"{analytics['avg_score']:.1f}/100")
         
         with col2:
-            top_company = verified_df['company'].value_counts().index[0]
-            top_count = verified_df['company'].value_counts().values[0]
-            st.metric("Most Active Company", top_company, f"{top_count} jobs")
+            st.metric("Most Active Company", company_counts.index[0], f"{company_counts.iloc[0]} jobs")
         
         with col3:
-            high_score = len(verified_df[verified_df['relevance_score'] >= 75])
-            st.metric("Excellent Matches (75+)", high_score, f"{(high_score/len(verified_df)*100):.0f}%")
+            high_score = sum(n for score_bin, n in analytics['score_bins'].items() if score_bin >= 75)
+            st.metric("Excellent Matches (75+)", high_score, f"{(high_score/total_jobs*100):.0f}%")
 
 # --- PAGE 5: Profile Management ---
 elif page == "👤 Profile":
@@ -1085,6 +1418,9 @@ elif page == "👤 Profile":
         
         # Save Button
         if st.button("💾 Save Profile", type="primary", width="stretch"):
+            from profile_manager import profile_version
+            previous_version = profile_version(profile)
+            
             # Update profile
             profile['name'] = name
             profile['target_role'] = target_role
@@ -1104,8 +1440,21 @@ elif page == "👤 Profile":
             
             save_profile(profile)
             st.success("✅ Profile saved successfully!")
+            
+            # Scoring inputs changed: queue a re-score of stored jobs instead of
+            # waiting for a scrape (a run still waiting will read this profile)
+            if profile_version(profile) != previous_version:
+                run_queue = get_run_queue()
+                waiting = [run for run in run_queue.list_runs(limit=25)
+                           if run["status"] == "queued" and run["params"]["stages"] == ["rescore"]]
+                st.session_state["rescore_run_id"] = (
+                    waiting[0]["id"] if waiting else run_queue.enqueue({"stages": ["rescore"]}, source="profile")
+                )
             st.cache_data.clear()
         
+        if "rescore_run_id" in st.session_state:
+            rescore_run_panel(st.session_state["rescore_run_id"])
+        
         # Display current profile
         st.markdown("---")
         st.subheader("📄 Current Profile JSON")
@@ -1114,6 +1463,4 @@ elif page == "👤 Profile":
 
 
 # --- Footer ---
-st.sidebar.markdown("---")
-st.sidebar.markdown("Made with ❤️ by JobSniper")
-st.sidebar.markdown("v3.0 - Manual Control Edition")
+render_sidebar_footer()
@@ -46,6 +46,7 @@ def main():
             if name: manager.delete_project(name)
 
         elif choice == '6':
+            manager.rescore_if_changed()
             print("Exiting...")
             break
         else:
@@ -1,66 +1,158 @@
 import sys
 import os
 import time
-import json
-import pandas as pd
+import argparse
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from modules.scraper import run_extraction
-from modules.auditor import run_auditor
-from modules.notifier import run_notifier
-from modules.tracker import update_excel_tracker
+# Stage modules (and pandas, jobspy, openpyxl, ...) are imported by the stage
+# that needs them, so audit-only or notify-only runs start quickly
+from modules.progress_reporter import begin_run, start_phase, finish_run
+from modules.resource_monitor import apply_resource_limits, TelemetrySampler
+# Bare import: the same collector instance the modules record their spans into
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "modules"))
+from run_metrics import get_run_metrics
+from run_profiler import PipelineProfiler
 
-# Load settings to match Notifier logic
-HISTORY_FILE = os.path.join("data", "history.json")
 # Lowered to 55 to work with enhanced local scoring
 MIN_MATCH_SCORE = 55 
 
-def load_history():
-    if not os.path.exists(HISTORY_FILE): return []
-    try:
-        with open(HISTORY_FILE, 'r') as f: return json.load(f)
-    except: return []
+# Pipeline stages, in execution order
+STAGES = ["scrape", "audit", "track", "notify"]
+# Stages only run when asked for (not part of the default sweep)
+ON_DEMAND_STAGES = ["rescore"]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="JobSniper job-hunting pipeline")
+    parser.add_argument("--queries", nargs="+", metavar="QUERY",
+                        help="Search only these queries (default: all from settings)")
+    parser.add_argument("--locations", nargs="+", metavar="LOCATION",
+                        help="Search only these locations (default: all from settings)")
+    parser.add_argument("--sites", nargs="+", metavar="SITE",
+                        help="Search only these job sites (default: all from settings)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES + ON_DEMAND_STAGES, default=STAGES,
+                        help="Pipeline stages to run, e.g. '--stages audit' or '--stages track notify'; "
+                             "'rescore' re-scores stored jobs against the current profile")
+    parser.add_argument("--profile", action="store_true",
+                        help="Run under cProfile and save the profile to data/profiles/")
+    return parser.parse_args(argv)
 
-def main():
+def main(argv=None):
+    args = parse_args(argv)
     start_time = time.time()
     print("==========================================")
     print("   🦅 JobSniper: Autonomous Hunter v2.0   ")
     print("==========================================")
+    if args.stages != STAGES:
+        print(f"🧩 Stages: {', '.join(args.stages)}")
+    begin_run()
+    apply_resource_limits()
+    telemetry = TelemetrySampler().start()
+    metrics = get_run_metrics()
+    metrics.reset()
+    profiler = PipelineProfiler().start() if args.profile else None
+    
+    error = None
+    try:
+        with telemetry.enforce_memory_limit():
+            run_pipeline(args, metrics)
+    except Exception as e:
+        error = e
+    finally:
+        telemetry.stop()
+    if error:
+        finish_run("error", str(error), peak_rss_mb=telemetry.peak_rss_mb)
+        metrics.write("error", str(error), stages_requested=args.stages)
+        if profiler:
+            profiler.stop()
+            profiler.save("error", stages_requested=args.stages)
+        raise error
+    finish_run(peak_rss_mb=telemetry.peak_rss_mb)
+    if profiler:
+        profiler.stop()
+        profile_file = profiler.save(stages_requested=args.stages)
+        profiler.print_top()
+        print(f"🔬 Profile saved to {profile_file}")
+    metrics_file = metrics.write(stages_requested=args.stages)
+    print(f"🧠 Peak memory: {telemetry.peak_rss_mb:.0f} MB")
+
+    elapsed = round(time.time() - start_time, 2)
+    print("\n⏱️ Stage timings:")
+    for stage in metrics.stages:
+        print(f"   {stage['name']:<7} {stage['seconds']:>8.2f}s   peak {stage['peak_rss_mb']:.0f} MB")
+    print(f"📊 Run metrics saved to {metrics_file}")
+    print(f"\n✅ Mission Complete. Total execution time: {elapsed}s")
+
+def run_pipeline(args, metrics):
+    stages = args.stages
     
     # 1. HUNT
-    run_extraction()
+    if "scrape" in stages:
+        with metrics.stage("scrape"):
+            from modules.scraper import run_extraction
+            run_extraction(args.queries, args.locations, args.sites)
     
     # 2. AUDIT
-    run_auditor()
+    if "audit" in stages:
+        with metrics.stage("audit"):
+            from modules.auditor import run_auditor
+            from modules.rescorer import rescore, print_report, restore_pending_promotions
+            run_auditor()
+            
+            # Profile edited since the last run: re-score stored jobs too
+            with metrics.span("audit.rescore"):
+                report = rescore()
+            if report["changed"]:
+                print_report(report)
+            # Jobs promoted by earlier re-scores (e.g. a dashboard profile
+            # save) that the audit just wrote over
+            restored = restore_pending_promotions()
+            if restored:
+                print(f"⬆️ Re-added {restored} re-scored job(s) awaiting tracking/email")
+    
+    # 2b. RE-SCORE on request (e.g. after a dashboard profile edit); the audit
+    # stage already re-scores when the profile changed
+    if "rescore" in stages and "audit" not in stages:
+        with metrics.stage("rescore"):
+            from modules.rescorer import rescore, print_report
+            print_report(rescore(force=True))
     
     # 3. TRACK & NOTIFY PREP
     # We need to identify exactly which jobs are "New" and "Good"
     verified_path = os.path.join("data", "verified", "verified_jobs.csv")
     
-    if os.path.exists(verified_path):
-        df = pd.read_csv(verified_path)
-        
-        if not df.empty:
-            # A. Filter by Score (Same as Notifier)
-            df['relevance_score'] = pd.to_numeric(df['relevance_score'], errors='coerce').fillna(0)
-            high_quality_df = df[df['relevance_score'] >= MIN_MATCH_SCORE]
-            
-            # B. Filter by History (Only "New" jobs)
-            history = load_history()
-            jobs_to_email = high_quality_df[~high_quality_df['job_url'].isin(history)]
-            
-            # C. Update Tracker ONLY with these specific jobs
-            if not jobs_to_email.empty:
-                update_excel_tracker(jobs_to_email)
-            else:
-                print("ℹ️ No new jobs to add to tracker.")
+    if "track" in stages and os.path.exists(verified_path):
+        with metrics.stage("track"):
+            track_new_jobs(verified_path)
 
     # 4. REPORT (Emails & Updates History)
-    run_notifier()
+    if "notify" in stages:
+        with metrics.stage("notify"):
+            from modules.notifier import run_notifier
+            run_notifier()
 
-    elapsed = round(time.time() - start_time, 2)
-    print(f"\n✅ Mission Complete. Total execution time: {elapsed}s")
+def track_new_jobs(verified_path):
+    import pandas as pd
+    from modules.tracker import update_excel_tracker
+    from modules.email_history import get_email_history
+    
+    df = pd.read_csv(verified_path)
+    
+    if not df.empty:
+        # A. Filter by Score (Same as Notifier)
+        df['relevance_score'] = pd.to_numeric(df['relevance_score'], errors='coerce').fillna(0)
+        high_quality_df = df[df['relevance_score'] >= MIN_MATCH_SCORE]
+        
+        # B. Filter by History (Only "New" jobs)
+        history = get_email_history()
+        jobs_to_email = high_quality_df[[url not in history for url in high_quality_df['job_url']]]
+        
+        # C. Update Tracker ONLY with these specific jobs
+        start_phase("tracking")
+        if not jobs_to_email.empty:
+            update_excel_tracker(jobs_to_email)
+        else:
+            print("ℹ️ No new jobs to add to tracker.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
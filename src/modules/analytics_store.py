@@ -0,0 +1,249 @@
+"""
+Analytics Aggregates for JobSniper
+Keeps precomputed counts of tracker jobs (score histogram, company, work
+mode, status, date and status-by-date for the funnel) in a local SQLite
+file, updated incrementally as jobs are added, edited or deleted
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+ANALYTICS_FILE = os.path.join("data", "analytics.db")
+
+# Matches the 20-bin score histogram on the Analytics page
+SCORE_BIN_WIDTH = 5
+
+# How often the aggregates are cross-checked against the backend's
+# per-status counts (catches edits made outside db_manager)
+VERIFY_INTERVAL_SECONDS = 300
+
+# Funnel stages: a job counts towards a stage if its status is in the set
+FUNNEL_STAGES = [
+    ("Found", None),
+    ("Applied", {"Applied", "Ongoing", "Interviewing", "Got Selected", "Rejected"}),
+    ("Interviewing", {"Interviewing", "Got Selected"}),
+    ("Selected", {"Got Selected"}),
+]
+
+ANALYTICS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS facts (
+    job_id INTEGER PRIMARY KEY,
+    company TEXT,
+    work_mode TEXT,
+    status TEXT,
+    date_found TEXT,
+    score REAL
+);
+CREATE TABLE IF NOT EXISTS counts (
+    dim TEXT NOT NULL,
+    key TEXT NOT NULL,
+    n REAL NOT NULL,
+    PRIMARY KEY (dim, key)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def work_mode_for(location) -> str:
+    """Work mode derived from a job's location"""
+    return 'Remote' if location and 'remote' in str(location).lower() else 'On-site'
+
+
+def _fact(row: Dict) -> Dict:
+    score = row.get('match_score')
+    try:
+        score = float(score) if score is not None else 0.0
+    except (TypeError, ValueError):
+        score = 0.0
+    if score != score:  # NaN
+        score = 0.0
+    return {
+        "job_id": int(row['id']),
+        "company": str(row.get('company') or "Unknown"),
+        "work_mode": row.get('work_mode') or work_mode_for(row.get('location')),
+        "status": row.get('status') or "Not Applied",
+        "date_found": str(row.get('date_found') or "")[:10],
+        "score": score,
+    }
+
+
+def _contributions(fact: Dict) -> List:
+    """(dim, key, amount) rows one job adds to the aggregates"""
+    score_bin = min(int(fact["score"] // SCORE_BIN_WIDTH), 100 // SCORE_BIN_WIDTH - 1)
+    return [
+        ("total", "", 1),
+        ("score_sum", "", fact["score"]),
+        ("score_bin", str(max(score_bin, 0) * SCORE_BIN_WIDTH), 1),
+        ("company", fact["company"], 1),
+        ("work_mode", fact["work_mode"], 1),
+        ("status", fact["status"], 1),
+        ("date", fact["date_found"], 1),
+        ("date_status", f"{fact['date_found']}|{fact['status']}", 1),
+    ]
+
+
+class AnalyticsStore:
+    """Incrementally maintained aggregates over the tracker's jobs
+
+    Each job's last-seen facts are kept so an update can subtract its old
+    contribution before adding the new one; reads only touch the small
+    counts table.
+    """
+
+    def __init__(self, db_path: str = ANALYTICS_FILE):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(ANALYTICS_SCHEMA)
+
+    # --- Updates ---
+    def _apply(self, fact: Dict, sign: int):
+        for dim, key, amount in _contributions(fact):
+            self.conn.execute(
+                "INSERT INTO counts (dim, key, n) VALUES (?, ?, ?) "
+                "ON CONFLICT (dim, key) DO UPDATE SET n = n + excluded.n",
+                (dim, key, sign * amount)
+            )
+
+    def _replace(self, fact: Dict):
+        old = self.conn.execute("SELECT * FROM facts WHERE job_id = ?", (fact["job_id"],)).fetchone()
+        if old:
+            self._apply(dict(old), -1)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO facts (job_id, company, work_mode, status, date_found, score) "
+            "VALUES (:job_id, :company, :work_mode, :status, :date_found, :score)", fact
+        )
+        self._apply(fact, 1)
+
+    def _cleanup(self):
+        self.conn.execute("DELETE FROM counts WHERE dim != 'score_sum' AND n <= 0")
+
+    def upsert(self, rows: Iterable[Dict]):
+        """Add jobs or refresh ones already counted (rows from the jobs table)"""
+        with self._lock, self.conn:
+            for row in rows:
+                if row.get('id') is not None:
+                    self._replace(_fact(row))
+            self._cleanup()
+
+    def patch(self, job_id: int, fields: Dict):
+        """Apply a partial update (e.g. a status change) to a counted job"""
+        with self._lock, self.conn:
+            old = self.conn.execute("SELECT * FROM facts WHERE job_id = ?", (int(job_id),)).fetchone()
+            if not old:
+                return
+            fact = dict(old)
+            if fields.get('status'):
+                fact["status"] = fields['status']
+            if 'match_score' in fields:
+                fact["score"] = _fact({"id": job_id, "match_score": fields['match_score']})["score"]
+            self._replace(fact)
+            self._cleanup()
+
+    def remove(self, job_ids: Iterable[int]):
+        with self._lock, self.conn:
+            for job_id in job_ids:
+                old = self.conn.execute("SELECT * FROM facts WHERE job_id = ?", (int(job_id),)).fetchone()
+                if old:
+                    self._apply(dict(old), -1)
+                    self.conn.execute("DELETE FROM facts WHERE job_id = ?", (int(job_id),))
+            self._cleanup()
+
+    def rebuild(self, rows: Iterable[Dict]):
+        """Recompute everything from a full list of jobs"""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM facts")
+            self.conn.execute("DELETE FROM counts")
+            for row in rows:
+                if row.get('id') is not None:
+                    self._replace(_fact(row))
+            self._cleanup()
+            self._set_meta("verified_at", time.time())
+
+    def reset(self):
+        """Drop all aggregates; the next verify rebuilds them"""
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM facts")
+            self.conn.execute("DELETE FROM counts")
+            self.conn.execute("DELETE FROM meta")
+
+    # --- Verification ---
+    def _set_meta(self, key: str, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def needs_verify(self, interval: float = VERIFY_INTERVAL_SECONDS) -> bool:
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'verified_at'").fetchone()
+        return row is None or time.time() - float(row["value"]) > interval
+
+    def matches(self, summary: Dict) -> bool:
+        """True if the aggregates agree with a backend status_summary()"""
+        counts = self.counts("status")
+        by_status = {status: n for status, n in summary.get("by_status", {}).items() if n}
+        return (self.counts("total").get("", 0) == summary.get("total", 0)
+                and {(status or "Not Applied"): n for status, n in by_status.items()} == counts)
+
+    def mark_verified(self):
+        with self._lock, self.conn:
+            self._set_meta("verified_at", time.time())
+
+    # --- Reads ---
+    def counts(self, dim: str) -> Dict[str, float]:
+        with self._lock:
+            rows = self.conn.execute("SELECT key, n FROM counts WHERE dim = ?", (dim,)).fetchall()
+        return {row["key"]: (int(row["n"]) if dim != "score_sum" else row["n"]) for row in rows}
+
+    def summary(self) -> Dict:
+        """All aggregates, ready for charting
+
+        Returns:
+            dict: total, avg_score, score_bins, company, work_mode, status,
+            date (each {key: count}) and funnel_by_date
+            ({date: {stage: count}})
+        """
+        with self._lock:
+            rows = self.conn.execute("SELECT dim, key, n FROM counts").fetchall()
+        dims = defaultdict(dict)
+        for row in rows:
+            dims[row["dim"]][row["key"]] = row["n"]
+
+        total = int(dims["total"].get("", 0))
+        funnel_by_date = defaultdict(lambda: {stage: 0 for stage, _ in FUNNEL_STAGES})
+        for key, n in dims["date_status"].items():
+            date, status = key.split("|", 1)
+            for stage, statuses in FUNNEL_STAGES:
+                if statuses is None or status in statuses:
+                    funnel_by_date[date][stage] += int(n)
+
+        return {
+            "total": total,
+            "avg_score": dims["score_sum"].get("", 0) / total if total else 0,
+            "score_bins": {int(k): int(n) for k, n in dims["score_bin"].items()},
+            "company": {k: int(n) for k, n in dims["company"].items()},
+            "work_mode": {k: int(n) for k, n in dims["work_mode"].items()},
+            "status": {k: int(n) for k, n in dims["status"].items()},
+            "date": {k: int(n) for k, n in dims["date"].items()},
+            "funnel_by_date": dict(funnel_by_date),
+        }
+
+
+# Shared store per process
+_store: Optional[AnalyticsStore] = None
+_store_lock = threading.Lock()
+
+def get_analytics_store() -> AnalyticsStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = AnalyticsStore()
+        return _store
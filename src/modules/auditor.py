@@ -1,23 +1,19 @@
 import os
 import time
 import json
+import copy
 import pandas as pd
-import google.generativeai as genai
-from google.api_core import exceptions
 from config import settings
 import re
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 import sys
 
-# Add database connector
+# Make sibling modules (db_manager, ...) importable for the tracker stage
 sys.path.insert(0, 'src/modules')
-try:
-    from db_connector import get_db
-    db = get_db()
-except:
-    db = None
-    print("⚠️ Database connector not available, using CSV only")
+from progress_reporter import start_phase, report_progress
+from search_index import get_search_index
+from run_metrics import span, count
 
 load_dotenv()
 API_KEY = os.getenv("GEMINI_API_KEY")
@@ -33,21 +29,54 @@ PROCESSED_METADATA_LOG = os.path.join("data", "processed_metadata.json")
 
 MODEL_NAME = "models/gemini-flash-latest"
 
-# Only configure genai if user explicitly allows using the Gemini API
-if settings.USE_GEMINI and API_KEY:
-    try:
-        genai.configure(api_key=API_KEY)
-    except Exception:
-        print("⚠️ Could not configure Gemini API; falling back to local auditor.")
-        settings.USE_GEMINI = False
+# Pause after each audited job (keeps Gemini within its free-tier rate limit)
+COOLDOWN_SECONDS = 2
+
+_genai = None
+
+def load_gemini():
+    """Import and configure the Gemini SDK on first use
+
+    The SDK takes about a second to import, so runs that never call the API
+    (USE_GEMINI = False, or no key) don't load it at all.
+
+    Returns:
+        module: google.generativeai, or None if it could not be configured
+    """
+    global _genai
+    if _genai is None:
+        try:
+            import google.generativeai as genai
+            genai.configure(api_key=API_KEY)
+            _genai = genai
+        except Exception:
+            print("⚠️ Could not configure Gemini API; falling back to local auditor.")
+            settings.USE_GEMINI = False
+    return _genai
+
+# path -> ((mtime_ns, size), parsed JSON). Unchanged files aren't re-parsed,
+# which keeps the pipeline daemon's seen-job set and profile warm between runs
+_json_cache = {}
+
+def _load_json_cached(path):
+    """Parse a JSON file, reusing the previous parse if the file is unchanged
+
+    Returns a shallow copy, so callers may add or remove top-level keys.
+    """
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _json_cache.get(path)
+    if cached is None or cached[0] != key:
+        with open(path, 'r') as f:
+            cached = _json_cache[path] = (key, json.load(f))
+    return copy.copy(cached[1])
 
 def load_processed_metadata():
     """Loads metadata about processed jobs including timestamps."""
     if not os.path.exists(PROCESSED_METADATA_LOG):
         return {}
     try:
-        with open(PROCESSED_METADATA_LOG, 'r') as f:
-            return json.load(f)
+        return _load_json_cached(PROCESSED_METADATA_LOG)
     except:
         return {}
 
@@ -112,13 +141,17 @@ def save_processed_urls(new_urls):
 
 def load_user_profile():
     try:
-        with open(PROFILE_PATH, 'r') as f: return json.load(f)
+        return _load_json_cached(PROFILE_PATH)
     except FileNotFoundError: return {"target_role": "AI Intern", "skills": ["Python"]}
 
 def analyze_with_gemini(job_text, location_raw, user_profile):
     # If API usage is disabled, fall back to a local heuristic analyzer.
     if not settings.USE_GEMINI or not API_KEY:
         return analyze_locally(job_text, location_raw, user_profile)
+    genai = load_gemini()
+    if genai is None:
+        return analyze_locally(job_text, location_raw, user_profile)
+    from google.api_core import exceptions
 
     # (Same function as before)
     truncated_text = str(job_text)[:4000]
@@ -148,12 +181,14 @@ def analyze_with_gemini(job_text, location_raw, user_profile):
     retries = 0
     while retries < 3:
         try:
-            response = model.generate_content(prompt)
+            with span("audit.gemini_request"):
+                response = model.generate_content(prompt)
             raw_text = response.text.replace("```json", "").replace("```", "").strip()
             return json.loads(raw_text)
         except exceptions.ResourceExhausted:
             print(f"   ⏳ Rate Limit. Sleeping 60s...")
-            time.sleep(60)
+            with span("audit.rate_limit_wait"):
+                time.sleep(60)
             retries += 1
         except Exception as e:
             print(f"   ⚠️ API Error: {e}")
@@ -377,19 +412,25 @@ def run_auditor():
     processed_now = [] # Track what we check in this run
 
     print(f"📂 Auditing {len(df)} NEW jobs...")
+    start_phase("auditing", len(df))
+    high_score_count = 0
 
     for index, row in df.iterrows():
         print(f"[{index+1}/{len(df)}] {row['title']} @ {row['company']}...")
         
         # Audit
-        audit = analyze_with_gemini(row['description'], row.get('location', 'Unknown'), profile)
+        with span("audit.job"):
+            audit = analyze_with_gemini(row['description'], row.get('location', 'Unknown'), profile)
+        count("jobs_audited")
         
         # Mark as processed immediately so we don't check it again next time
         processed_now.append(row['job_url'])
 
         # Safety Delay (reduced for efficiency)
-        print("   ⏳ Cooling down (2s)...")
-        time.sleep(2)
+        if COOLDOWN_SECONDS:
+            print(f"   ⏳ Cooling down ({COOLDOWN_SECONDS}s)...")
+            with span("audit.cooldown"):
+                time.sleep(COOLDOWN_SECONDS)
 
         if audit:
             if not audit['is_scam']:
@@ -399,14 +440,24 @@ def run_auditor():
                 row['work_mode'] = audit.get('work_mode', 'On-site')
                 
                 verified_jobs.append(row)
+                if pd.to_numeric(audit['relevance_score'], errors='coerce') >= 75:
+                    high_score_count += 1
                 print(f"   ✅ Verified! Score: {audit['relevance_score']} | {row['work_mode']}")
             else:
+                count("scams_rejected")
                 print(f"   ⛔ SCAM: {audit['scam_reason']}")
         else:
+            count("audit_failures")
             print("   ⚠️ Audit Failed.")
+        
+        with span("audit.progress_update"):
+            report_progress(step=len(processed_now), jobs_verified=len(verified_jobs),
+                            high_score_jobs=high_score_count)
 
     # Save the "Processed" list so we remember them for tomorrow
-    save_processed_urls(processed_now)
+    with span("audit.save_processed"):
+        save_processed_urls(processed_now)
+    count("jobs_verified", len(verified_jobs))
 
     if verified_jobs:
         out_df = pd.DataFrame(verified_jobs).sort_values(by='relevance_score', ascending=False)
@@ -415,26 +466,12 @@ def run_auditor():
         out_df.to_csv(OUTPUT_FILE, index=False)
         print(f"\n🎉 Success! Saved {len(out_df)} new jobs to {OUTPUT_FILE}")
         
-        # Save to PostgreSQL database
-        if db and db.use_database:
-            saved_count = 0
-            for _, job in out_df.iterrows():
-                job_data = {
-                    'job_url': job.get('job_url'),
-                    'title': job.get('title'),
-                    'company': job.get('company'),
-                    'location': job.get('location'),
-                    'description': job.get('description'),
-                    'date_posted': job.get('date_posted'),
-                    'relevance_score': job.get('relevance_score'),
-                    'match_reason': job.get('match_reason'),
-                    'duration': job.get('duration'),
-                    'work_mode': job.get('work_mode'),
-                    'site': job.get('site')
-                }
-                if db.insert_verified_job(job_data):
-                    saved_count += 1
-            print(f"✅ Also saved {saved_count} jobs to PostgreSQL database")
+        # Make the new postings searchable from the dashboard
+        try:
+            with span("audit.search_index"):
+                get_search_index().add_dataframe(out_df)
+        except Exception as e:
+            print(f"⚠️ Could not update search index: {e}")
     else:
         print("\n😔 No high-quality jobs found in this batch.")
 
@@ -13,6 +13,12 @@ import time
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from progress_reporter import PROGRESS_FILE_ENV, read_progress, write_json_atomic
+from backup_store import BackupStore
+from resource_monitor import TELEMETRY_FILE, TELEMETRY_FILE_ENV, parse_telemetry
+from pipeline_daemon import submit_run
+
 # File paths
 PROGRESS_FILE = "data/scraper_progress.json"
 PID_FILE = "data/scraper.pid"
@@ -22,31 +28,83 @@ BACKUP_DIR = "data/backups"
 # Backup file paths
 VERIFIED_JOBS_FILE = "data/verified/verified_jobs.csv"
 RAW_JOBS_FILE = "data/raw/jobs_latest.csv"
-HISTORY_FILE = "data/history.json"
+HISTORY_FILE = "data/history.jsonl"
 PROCESSED_FILE = "data/processed.json"
 
+# (live file, name inside a backup)
+BACKUP_FILES = [
+    (VERIFIED_JOBS_FILE, "verified_jobs.csv"),
+    (RAW_JOBS_FILE, "jobs_latest.csv"),
+    (HISTORY_FILE, "history.jsonl"),
+    (PROCESSED_FILE, "processed.json")
+]
+
+# Log reading
+LOG_READ_BLOCK_SIZE = 8192
+LOG_FOLLOW_MAX_BYTES = 64 * 1024
+TELEMETRY_MAX_POINTS = 300
+
+
+def tail_file(path, line_count):
+    """Return the last line_count lines of a file as bytes
+    
+    Seeks backwards from the end in fixed-size blocks, so the cost depends on
+    line_count rather than on the file size.
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b""
+        # One extra newline guarantees the first kept line is complete
+        while pos > 0 and data.count(b"\n") <= line_count:
+            read_size = min(LOG_READ_BLOCK_SIZE, pos)
+            pos -= read_size
+            f.seek(pos)
+            data = f.read(read_size) + data
+    return b"".join(data.splitlines(keepends=True)[-line_count:])
+
 class BackgroundScraper:
     """Manages background scraper process"""
     
-    def __init__(self):
-        self.progress_file = PROGRESS_FILE
-        self.pid_file = PID_FILE
-        self.log_file = LOG_FILE
+    def __init__(self, run_dir=None):
+        """
+        Args:
+            run_dir: Directory for this scraper's progress/PID/log files;
+                None uses the dashboard's default files under data/
+        """
+        if run_dir:
+            os.makedirs(run_dir, exist_ok=True)
+            self.progress_file = os.path.join(run_dir, os.path.basename(PROGRESS_FILE))
+            self.pid_file = os.path.join(run_dir, os.path.basename(PID_FILE))
+            self.log_file = os.path.join(run_dir, os.path.basename(LOG_FILE))
+            self.telemetry_file = os.path.join(run_dir, os.path.basename(TELEMETRY_FILE))
+        else:
+            self.progress_file = PROGRESS_FILE
+            self.pid_file = PID_FILE
+            self.log_file = LOG_FILE
+            self.telemetry_file = TELEMETRY_FILE
         os.makedirs("data", exist_ok=True)
     
+    def _read_pid(self):
+        """Return (pid, create_time) from the PID file; create_time may be None"""
+        with open(self.pid_file, 'r') as f:
+            parts = f.read().split()
+        return int(parts[0]), (float(parts[1]) if len(parts) > 1 else None)
+    
     def is_running(self):
         """Check if scraper is currently running"""
         if not os.path.exists(self.pid_file):
             return False
         
         try:
-            with open(self.pid_file, 'r') as f:
-                pid = int(f.read().strip())
+            pid, create_time = self._read_pid()
             
             # Check if process exists and is running
             if psutil.pid_exists(pid):
                 process = psutil.Process(pid)
-                # Check if it's actually our scraper process
+                # Check if it's actually our scraper process (not a reused PID)
+                if create_time is not None and abs(process.create_time() - create_time) > 1:
+                    raise psutil.NoSuchProcess(pid)
                 if process.is_running() and process.status() != psutil.STATUS_ZOMBIE:
                     return True
             
@@ -57,8 +115,13 @@ class BackgroundScraper:
             self.cleanup()
             return False
     
-    def start(self):
-        """Start scraper in background with automatic backup"""
+    def start(self, args=None):
+        """Start scraper in background with automatic backup
+        
+        Args:
+            args: Extra command-line arguments for src/main.py (e.g. a
+                subset of queries or stages); None runs the full pipeline
+        """
         if self.is_running():
             return {
                 "success": False,
@@ -70,7 +133,7 @@ class BackgroundScraper:
             self.cleanup()
             
             # Create backup before starting
-            backup_path = self._create_backup()
+            backup_name = self._create_backup()
             
             # Initialize progress file
             self._update_progress({
@@ -81,7 +144,7 @@ class BackgroundScraper:
                 "high_score_jobs": 0,
                 "start_time": datetime.now().isoformat(),
                 "last_update": datetime.now().isoformat(),
-                "backup_path": backup_path,
+                "backup_name": backup_name,
                 "error": None
             })
             
@@ -90,25 +153,50 @@ class BackgroundScraper:
             
             # Start scraper as detached background process
             # Use nohup-like approach for true background execution
-            with open(self.log_file, 'w') as log_f:
-                process = subprocess.Popen(
-                    [python_exe, "-u", "src/main.py"],
-                    stdout=log_f,
-                    stderr=subprocess.STDOUT,
-                    stdin=subprocess.DEVNULL,
-                    start_new_session=True,  # Detach from parent
-                    cwd=os.getcwd()
-                )
+            # Fresh telemetry series for this run
+            if os.path.exists(self.telemetry_file):
+                os.remove(self.telemetry_file)
+            
+            # Resource limits (JOBSNIPER_SCRAPER_MEMORY_MB/_CPU_SECONDS/_NICE) are
+            # inherited through the environment and applied by the child itself
+            run_env = {
+                PROGRESS_FILE_ENV: self.progress_file,
+                TELEMETRY_FILE_ENV: self.telemetry_file,
+            }
+            open(self.log_file, 'w').close()
+            
+            # A running pipeline daemon forks the run from its warm state;
+            # otherwise start a fresh interpreter
+            daemon_run = submit_run(list(args or []), run_env, self.log_file)
+            if daemon_run:
+                pid, create_time = daemon_run["pid"], daemon_run.get("create_time")
+            else:
+                with open(self.log_file, 'w') as log_f:
+                    process = subprocess.Popen(
+                        [python_exe, "-u", "src/main.py"] + list(args or []),
+                        stdout=log_f,
+                        stderr=subprocess.STDOUT,
+                        stdin=subprocess.DEVNULL,
+                        start_new_session=True,  # Detach from parent
+                        cwd=os.getcwd(),
+                        env=dict(os.environ, **run_env)
+                    )
+                pid = process.pid
+                try:
+                    create_time = psutil.Process(pid).create_time()
+                except psutil.Error:
+                    create_time = None
             
-            # Save PID
+            # Save PID with the process start time so a reused PID isn't mistaken for us
             with open(self.pid_file, 'w') as f:
-                f.write(str(process.pid))
+                f.write(f"{pid} {create_time}" if create_time else str(pid))
             
             return {
                 "success": True,
-                "pid": process.pid,
-                "backup_path": backup_path,
-                "message": "Scraper started in background (backup created)"
+                "pid": pid,
+                "backup_name": backup_name,
+                "message": ("Scraper started by the warm pipeline daemon (backup created)" if daemon_run
+                            else "Scraper started in background (backup created)")
             }
         
         except Exception as e:
@@ -137,11 +225,11 @@ class BackgroundScraper:
         try:
             # Get backup path before stopping
             progress = self.get_progress()
-            backup_path = progress.get("backup_path")
+            # backup_path: runs started before the backup store
+            backup_name = progress.get("backup_name") or progress.get("backup_path")
             
             # Stop the process
-            with open(self.pid_file, 'r') as f:
-                pid = int(f.read().strip())
+            pid, _ = self._read_pid()
             
             process = psutil.Process(pid)
             
@@ -157,8 +245,8 @@ class BackgroundScraper:
             
             # Perform rollback if requested
             rollback_success = False
-            if rollback and backup_path:
-                rollback_success = self._restore_backup(backup_path)
+            if rollback and backup_name:
+                rollback_success = self._restore_backup(backup_name)
             
             # Update progress
             self._update_progress({
@@ -201,33 +289,79 @@ class BackgroundScraper:
                 "high_score_jobs": 0
             }
         
-        try:
-            with open(self.progress_file, 'r') as f:
-                progress = json.load(f)
-            
-            # Update with real-time data from files
-            if progress.get("status") == "running":
-                progress = self._enrich_progress(progress)
-            
-            return progress
-        except:
+        # Counters are published by the pipeline itself (see progress_reporter)
+        progress = read_progress(self.progress_file)
+        if not progress:
             return {
                 "status": "error",
                 "error": "Failed to read progress"
             }
+        return progress
     
     def get_logs(self, tail_lines=50):
-        """Get scraper logs"""
+        """Get the last lines of the scraper log (seek-based, see tail_file)"""
         if not os.path.exists(self.log_file):
             return ""
         
         try:
-            with open(self.log_file, 'r') as f:
-                lines = f.readlines()
-                return "".join(lines[-tail_lines:])
+            return tail_file(self.log_file, tail_lines).decode("utf-8", errors="replace")
         except:
             return ""
     
+    def get_telemetry(self, max_points=TELEMETRY_MAX_POINTS):
+        """Get the most recent resource samples of the current/last run
+        
+        Returns:
+            list: Dicts with time, elapsed, rss_mb, cpu_percent, open_files
+        """
+        if not os.path.exists(self.telemetry_file):
+            return []
+        
+        try:
+            lines = tail_file(self.telemetry_file, max_points).decode("utf-8", errors="replace")
+            return parse_telemetry(lines.splitlines())
+        except:
+            return []
+    
+    def read_logs_since(self, offset=0, max_bytes=LOG_FOLLOW_MAX_BYTES):
+        """Return log output appended since a byte offset
+        
+        Only complete lines are returned; a trailing partial line is left for
+        the next call. If the log was recreated (new run) reading restarts at
+        the beginning, and a backlog larger than max_bytes is skipped down to
+        its most recent part.
+        
+        Args:
+            offset: Byte offset returned by the previous call (0 to start)
+            max_bytes: Upper bound on bytes read per call
+        
+        Returns:
+            tuple: (new_text, new_offset)
+        """
+        if not os.path.exists(self.log_file):
+            return "", 0
+        
+        try:
+            with open(self.log_file, 'rb') as f:
+                size = f.seek(0, os.SEEK_END)
+                if size < offset:
+                    offset = 0
+                skipped = size - offset > max_bytes
+                if skipped:
+                    offset = size - max_bytes
+                f.seek(offset)
+                data = f.read(size - offset)
+            
+            if skipped:
+                # Drop the partial line we landed in
+                cut = data.find(b"\n") + 1
+                data, offset = data[cut:], offset + cut
+            
+            end = data.rfind(b"\n") + 1
+            return data[:end].decode("utf-8", errors="replace"), offset + end
+        except:
+            return "", offset
+    
     def cleanup(self):
         """Clean up PID and temporary files"""
         for file in [self.pid_file]:
@@ -241,129 +375,41 @@ class BackgroundScraper:
         """Update progress file"""
         try:
             # Load existing progress
-            existing = {}
-            if os.path.exists(self.progress_file):
-                with open(self.progress_file, 'r') as f:
-                    existing = json.load(f)
+            existing = read_progress(self.progress_file)
             
             # Merge with new data
             existing.update(data)
             
             # Save
-            with open(self.progress_file, 'w') as f:
-                json.dump(existing, f, indent=2)
+            write_json_atomic(self.progress_file, existing)
         except:
             pass
     
-    def _enrich_progress(self, progress):
-        """Enrich progress with real-time file data"""
-        # Check jobs_latest.csv for scraped jobs
-        jobs_file = "data/raw/jobs_latest.csv"
-        if os.path.exists(jobs_file):
-            try:
-                import pandas as pd
-                df = pd.read_csv(jobs_file)
-                progress["jobs_scraped"] = len(df)
-            except:
-                pass
-        
-        # Check verified_jobs.csv for verified jobs
-        verified_file = "data/verified/verified_jobs.csv"
-        if os.path.exists(verified_file):
-            try:
-                import pandas as pd
-                df = pd.read_csv(verified_file)
-                progress["jobs_verified"] = len(df)
-                
-                # Count high score jobs
-                df['relevance_score'] = pd.to_numeric(df['relevance_score'], errors='coerce').fillna(0)
-                progress["high_score_jobs"] = len(df[df['relevance_score'] >= 75])
-            except:
-                pass
-        
-        progress["last_update"] = datetime.now().isoformat()
-        return progress
-    
     def _create_backup(self):
-        """Create backup of current data files before scraping
+        """Snapshot current data files before scraping
+        
+        Unchanged files are deduplicated by content, so this is cheap when
+        little changed since the last run; retention is applied on each call.
         
         Returns:
-            str: Path to backup directory
+            str: Backup name
         """
-        import shutil
-        
-        # Create backup directory with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = os.path.join(BACKUP_DIR, f"backup_{timestamp}")
-        os.makedirs(backup_path, exist_ok=True)
-        
-        # Files to backup
-        files_to_backup = [
-            (VERIFIED_JOBS_FILE, "verified_jobs.csv"),
-            (RAW_JOBS_FILE, "jobs_latest.csv"),
-            (HISTORY_FILE, "history.json"),
-            (PROCESSED_FILE, "processed.json")
-        ]
-        
-        backed_up_count = 0
-        for source, dest_name in files_to_backup:
-            if os.path.exists(source):
-                try:
-                    dest = os.path.join(backup_path, dest_name)
-                    shutil.copy2(source, dest)
-                    backed_up_count += 1
-                except Exception as e:
-                    print(f"Warning: Failed to backup {source}: {e}")
-        
-        # Save backup metadata
-        metadata = {
-            "timestamp": timestamp,
-            "files_backed_up": backed_up_count,
-            "created_at": datetime.now().isoformat()
-        }
-        
-        with open(os.path.join(backup_path, "metadata.json"), 'w') as f:
-            json.dump(metadata, f, indent=2)
-        
-        return backup_path
+        return BackupStore(BACKUP_DIR).create(BACKUP_FILES)["name"]
     
-    def _restore_backup(self, backup_path):
+    def _restore_backup(self, backup_name):
         """Restore data from backup
         
         Args:
-            backup_path: Path to backup directory
+            backup_name: Backup name (or path of a pre-store backup directory)
             
         Returns:
             bool: True if restore successful
         """
-        import shutil
-        
-        if not os.path.exists(backup_path):
-            return False
-        
         try:
-            # Files to restore
-            files_to_restore = [
-                ("verified_jobs.csv", VERIFIED_JOBS_FILE),
-                ("jobs_latest.csv", RAW_JOBS_FILE),
-                ("history.json", HISTORY_FILE),
-                ("processed.json", PROCESSED_FILE)
-            ]
-            
-            restored_count = 0
-            for source_name, dest in files_to_restore:
-                source = os.path.join(backup_path, source_name)
-                if os.path.exists(source):
-                    try:
-                        # Ensure destination directory exists
-                        os.makedirs(os.path.dirname(dest), exist_ok=True)
-                        shutil.copy2(source, dest)
-                        restored_count += 1
-                    except Exception as e:
-                        print(f"Warning: Failed to restore {source_name}: {e}")
-            
+            restored_count = BackupStore(BACKUP_DIR).restore(
+                backup_name, [(name, path) for path, name in BACKUP_FILES]
+            )
             return restored_count > 0
-        
         except Exception as e:
             print(f"Error during restore: {e}")
             return False
@@ -372,29 +418,9 @@ class BackgroundScraper:
         """List all available backups
         
         Returns:
-            list: List of backup info dicts
+            list: List of backup info dicts (newest first)
         """
-        if not os.path.exists(BACKUP_DIR):
-            return []
-        
-        backups = []
-        for backup_name in os.listdir(BACKUP_DIR):
-            backup_path = os.path.join(BACKUP_DIR, backup_name)
-            if os.path.isdir(backup_path):
-                metadata_file = os.path.join(backup_path, "metadata.json")
-                if os.path.exists(metadata_file):
-                    try:
-                        with open(metadata_file, 'r') as f:
-                            metadata = json.load(f)
-                        metadata["path"] = backup_path
-                        metadata["name"] = backup_name
-                        backups.append(metadata)
-                    except:
-                        pass
-        
-        # Sort by timestamp (newest first)
-        backups.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-        return backups
+        return BackupStore(BACKUP_DIR).list()
 
 
 # Singleton instance
@@ -0,0 +1,293 @@
+"""
+Content-Addressed Backup Store for JobSniper
+Stores each distinct file version once (keyed by SHA-256), with optional gzip
+compression, a small JSON manifest index and a retention policy
+"""
+
+import os
+import json
+import gzip
+import shutil
+import hashlib
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies
+    fcntl = None
+
+BACKUP_DIR = os.path.join("data", "backups")
+
+# Retention: keep at most this many snapshots, none older than the age limit
+# (the newest snapshot is always kept)
+BACKUP_KEEP_LAST = 20
+BACKUP_MAX_AGE_DAYS = 30
+BACKUP_COMPRESS = True
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Guards the index within this process; index.lock (flock) guards it across
+# processes, e.g. the dashboard and a scheduled run backing up at once
+_index_lock = threading.Lock()
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _backup_order(backup: Dict):
+    return backup.get("timestamp", ""), backup.get("created_at") or ""
+
+
+class BackupStore:
+    """Snapshots of a few data files, deduplicated by content
+
+    Layout under `root`:
+        index.json            manifests (newest last) + a stat->hash cache
+        blobs/ab/abcdef...    one blob per distinct file content (.gz if compressed)
+
+    Unchanged files cost a stat() and a manifest entry, not a copy: their
+    hash comes from the cache (keyed on mtime and size) and the blob exists.
+    """
+
+    def __init__(self, root: str = BACKUP_DIR, compress: bool = BACKUP_COMPRESS,
+                 keep_last: int = BACKUP_KEEP_LAST, max_age_days: int = BACKUP_MAX_AGE_DAYS):
+        self.root = root
+        self.compress = compress
+        self.keep_last = keep_last
+        self.max_age_days = max_age_days
+        self.index_file = os.path.join(root, "index.json")
+        self.lock_file = os.path.join(root, "index.lock")
+        self.blob_dir = os.path.join(root, "blobs")
+
+    @contextmanager
+    def _locked(self):
+        """Hold the index lock (thread and process) for a read-modify-write"""
+        with _index_lock:
+            if fcntl is None:
+                yield
+                return
+            os.makedirs(self.root, exist_ok=True)
+            with open(self.lock_file, 'a') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    # --- Index ---
+    def _load_index(self) -> Dict:
+        try:
+            with open(self.index_file, 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {"backups": [], "hash_cache": {}}
+            if self._import_legacy(index):
+                self._save_index(index)
+        return index
+
+    def _save_index(self, index: Dict):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.index_file}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f, indent=1)
+        os.replace(tmp_path, self.index_file)
+
+    def _import_legacy(self, index: Dict) -> int:
+        """Fold old full-copy backup_* directories into the store
+
+        Returns:
+            int: Number of directories imported
+        """
+        if not os.path.isdir(self.root):
+            return 0
+        imported = 0
+        for name in sorted(os.listdir(self.root)):
+            path = os.path.join(self.root, name)
+            metadata_file = os.path.join(path, "metadata.json")
+            if not (name.startswith("backup_") and os.path.isfile(metadata_file)):
+                continue
+            try:
+                with open(metadata_file, 'r') as f:
+                    metadata = json.load(f)
+                files = {}
+                for file_name in os.listdir(path):
+                    if file_name != "metadata.json":
+                        files[file_name] = self._store_file(os.path.join(path, file_name), index,
+                                                            cache_hash=False)
+                index["backups"].append({
+                    "name": name,
+                    "timestamp": metadata.get("timestamp", name[len("backup_"):]),
+                    "created_at": metadata.get("created_at"),
+                    "files": files,
+                    "files_backed_up": len(files),
+                })
+                imported += 1
+            except Exception as e:
+                print(f"Warning: Could not import legacy backup {name}: {e}")
+                continue
+            # Only delete the copy once it is fully stored as blobs
+            shutil.rmtree(path, ignore_errors=True)
+        return imported
+
+    # --- Blobs ---
+    def _blob_path(self, sha: str) -> str:
+        return os.path.join(self.blob_dir, sha[:2], sha + (".gz" if self.compress else ""))
+
+    def _find_blob(self, sha: str) -> Optional[str]:
+        for suffix in (".gz", ""):
+            path = os.path.join(self.blob_dir, sha[:2], sha + suffix)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _store_file(self, source: str, index: Dict, cache_hash: bool = True) -> Dict:
+        """Hash a file (reusing the cached hash if unchanged) and store its blob once"""
+        stat = os.stat(source)
+        cache_key = os.path.abspath(source)
+        cached = index["hash_cache"].get(cache_key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            sha = cached[2]
+        else:
+            sha = _file_sha256(source)
+            if cache_hash:
+                index["hash_cache"][cache_key] = [stat.st_mtime_ns, stat.st_size, sha]
+
+        if not self._find_blob(sha):
+            blob_path = self._blob_path(sha)
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            tmp_path = f"{blob_path}.tmp"
+            with open(source, 'rb') as src:
+                dst = gzip.open(tmp_path, 'wb', compresslevel=1) if self.compress else open(tmp_path, 'wb')
+                with dst:
+                    shutil.copyfileobj(src, dst)
+            os.replace(tmp_path, blob_path)
+
+        return {"sha256": sha, "size": stat.st_size}
+
+    # --- Public API ---
+    def create(self, files: List[Tuple[str, str]]) -> Dict:
+        """Snapshot the given files
+
+        Args:
+            files: (source path, name in backup) pairs; missing sources are skipped
+
+        Returns:
+            dict: The new manifest ({"name", "timestamp", "files", ...})
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        with self._locked():
+            index = self._load_index()
+
+            stored = {}
+            for source, dest_name in files:
+                if os.path.exists(source):
+                    try:
+                        stored[dest_name] = self._store_file(source, index)
+                    except Exception as e:
+                        print(f"Warning: Failed to backup {source}: {e}")
+
+            names = {backup["name"] for backup in index["backups"]}
+            name, suffix = f"backup_{timestamp}", 1
+            while name in names:
+                suffix += 1
+                name = f"backup_{timestamp}_{suffix}"
+
+            manifest = {
+                "name": name,
+                "timestamp": timestamp,
+                "created_at": datetime.now().isoformat(),
+                "files": stored,
+                "files_backed_up": len(stored),
+            }
+            index["backups"].append(manifest)
+            self._apply_retention(index)
+            self._save_index(index)
+        return manifest
+
+    def get(self, name: str) -> Optional[Dict]:
+        """Return the manifest for a backup name (or a legacy backup directory path)"""
+        name = os.path.basename(os.path.normpath(name))
+        with self._locked():
+            index = self._load_index()
+        return next((b for b in index["backups"] if b["name"] == name), None)
+
+    def restore(self, name: str, files: List[Tuple[str, str]]) -> int:
+        """Restore files from a backup
+
+        Args:
+            files: (name in backup, destination path) pairs
+
+        Returns:
+            int: Number of files restored
+        """
+        manifest = self.get(name)
+        if not manifest:
+            return 0
+
+        restored = 0
+        for source_name, dest in files:
+            entry = manifest["files"].get(source_name)
+            blob = entry and self._find_blob(entry["sha256"])
+            if not blob:
+                continue
+            try:
+                os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+                tmp_path = f"{dest}.restore.tmp"
+                src = gzip.open(blob, 'rb') if blob.endswith(".gz") else open(blob, 'rb')
+                with src, open(tmp_path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+                os.replace(tmp_path, dest)
+                restored += 1
+            except Exception as e:
+                print(f"Warning: Failed to restore {source_name}: {e}")
+        return restored
+
+    def list(self) -> List[Dict]:
+        """All backups, newest first"""
+        with self._locked():
+            index = self._load_index()
+        return sorted(index["backups"], key=_backup_order, reverse=True)
+
+    def prune(self) -> int:
+        """Apply the retention policy now
+
+        Returns:
+            int: Number of backups removed
+        """
+        with self._locked():
+            index = self._load_index()
+            removed = self._apply_retention(index)
+            self._save_index(index)
+        return removed
+
+    def _apply_retention(self, index: Dict) -> int:
+        backups = sorted(index["backups"], key=_backup_order)
+        cutoff = (datetime.now() - timedelta(days=self.max_age_days)).strftime("%Y%m%d_%H%M%S")
+        keep = [b for b in backups[-self.keep_last:] if b.get("timestamp", "") >= cutoff] or backups[-1:]
+        removed = len(backups) - len(keep)
+        index["backups"] = keep
+        if removed:
+            self._collect_garbage(index)
+        return removed
+
+    def _collect_garbage(self, index: Dict):
+        """Delete blobs no manifest references any more"""
+        referenced = {entry["sha256"] for b in index["backups"] for entry in b["files"].values()}
+        if not os.path.isdir(self.blob_dir):
+            return
+        for prefix in os.listdir(self.blob_dir):
+            prefix_dir = os.path.join(self.blob_dir, prefix)
+            for blob in os.listdir(prefix_dir):
+                if blob.split(".")[0] not in referenced:
+                    os.remove(os.path.join(prefix_dir, blob))
+        # Drop cached hashes whose blob is gone
+        index["hash_cache"] = {path: entry for path, entry in index["hash_cache"].items()
+                               if entry[2] in referenced}
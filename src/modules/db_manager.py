@@ -1,26 +1,31 @@
 """
 Database Manager for JobSniper Application Tracker
-Handles Supabase cloud database operations and Excel synchronization
+Handles tracker database operations (Supabase or local SQLite) and Excel synchronization
 """
 
 import pandas as pd
 import os
+import sys
+import atexit
 from datetime import datetime
-from typing import List, Dict, Optional
-from supabase import create_client, Client
+from typing import Callable, List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from storage_backends import get_backend, get_health
+from write_queue import WriteBehindQueue
+from excel_export import write_full_export, ExcelExportScheduler
+from analytics_store import AnalyticsStore, get_analytics_store
+
 # Supabase configuration
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-# Initialize Supabase client
-supabase: Client = None
-if SUPABASE_URL and SUPABASE_KEY:
-    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+# The storage backend (Supabase when configured, SQLite otherwise) is created
+# lazily by get_backend() on first use, so importing this module is free
 
 EXCEL_FILE = "data/Job_Application_Tracker.xlsx"
 
@@ -35,27 +40,33 @@ VALID_STATUSES = [
 ]
 
 def init_db():
-    """Initialize the Supabase database with the jobs table"""
-    if not supabase:
-        raise Exception("Supabase client not initialized. Please set SUPABASE_URL and SUPABASE_KEY in .env file")
+    """Verify the connection to the configured jobs table"""
+    if not get_backend():
+        raise Exception("Database backend not initialized. Please set SUPABASE_URL and SUPABASE_KEY in .env file or STORAGE_BACKEND=sqlite")
     
-    # Note: Table creation should be done via Supabase dashboard or migration script
-    # This function verifies the connection
-    try:
-        # Test connection by querying the table
-        result = supabase.table('jobs').select("id").limit(1).execute()
-        print("✅ Supabase database connection successful")
+    # Note: Supabase tables are created via the Supabase dashboard or a migration
+    # script; the SQLite backend creates its schema when it is constructed
+    health = get_health(force=True)
+    if health["ok"]:
+        print(f"✅ {health['label']} database connection successful")
         return True
+    print(f"⚠️ Database connection error: {health['error']}")
+    print("💡 Make sure the 'jobs' table exists in Supabase")
+    return False
+
+def _update_analytics(update: Callable[[AnalyticsStore], None]):
+    """Keep the analytics aggregates in step with a write (never fails the write)"""
+    try:
+        update(get_analytics_store())
     except Exception as e:
-        print(f"⚠️ Database connection error: {e}")
-        print("💡 Make sure the 'jobs' table exists in Supabase")
-        return False
+        print(f"Warning: Failed to update analytics: {e}")
 
 def add_job(company: str, role: str, link: str, match_score: float, 
             location: str = None, duration: str = None) -> bool:
     """Add a new job to the database"""
-    if not supabase:
-        print("Error: Supabase client not initialized")
+    backend = get_backend()
+    if not backend:
+        print("Error: Database backend not initialized")
         return False
     
     try:
@@ -73,7 +84,8 @@ def add_job(company: str, role: str, link: str, match_score: float,
             "date_updated": date_found
         }
         
-        result = supabase.table('jobs').insert(job_data).execute()
+        job_id = backend.insert_job(job_data)
+        _update_analytics(lambda store: store.upsert([{**job_data, "id": job_id}]))
         return True
     except Exception as e:
         # Check if it's a duplicate link error
@@ -84,16 +96,17 @@ def add_job(company: str, role: str, link: str, match_score: float,
 
 def get_all_jobs() -> pd.DataFrame:
     """Get all jobs from the database as a DataFrame"""
-    if not supabase:
-        print("Error: Supabase client not initialized")
+    backend = get_backend()
+    if not backend:
+        print("Error: Database backend not initialized")
         return pd.DataFrame()
     
     try:
-        result = supabase.table('jobs').select("*").order('date_found', desc=True).order('match_score', desc=True).execute()
+        rows = backend.fetch_jobs()
         
-        if result.data:
-            df = pd.DataFrame(result.data)
-            return df
+        if rows:
+            df = pd.DataFrame(rows)
+            return _apply_pending(df)
         return pd.DataFrame()
     except Exception as e:
         print(f"Error getting jobs: {e}")
@@ -101,42 +114,80 @@ def get_all_jobs() -> pd.DataFrame:
 
 def get_jobs_by_status(status: str) -> pd.DataFrame:
     """Get jobs filtered by status"""
-    if not supabase:
-        print("Error: Supabase client not initialized")
+    backend = get_backend()
+    if not backend:
+        print("Error: Database backend not initialized")
         return pd.DataFrame()
     
     try:
-        result = supabase.table('jobs').select("*").eq('status', status).order('date_found', desc=True).execute()
+        rows = backend.fetch_jobs(status=status)
         
-        if result.data:
-            return pd.DataFrame(result.data)
+        if rows:
+            df = _apply_pending(pd.DataFrame(rows))
+            return df[df['status'] == status]
         return pd.DataFrame()
     except Exception as e:
         print(f"Error getting jobs by status: {e}")
         return pd.DataFrame()
 
+def _status_update_data(new_status: str) -> Dict:
+    """Build the column updates for a status change"""
+    date_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    update_data = {
+        "status": new_status,
+        "date_updated": date_updated
+    }
+    
+    # If status is "Applied", also set date_applied
+    if new_status == "Applied":
+        update_data["date_applied"] = datetime.now().strftime("%Y-%m-%d")
+    
+    return update_data
+
+def _notes_update_data(notes: str) -> Dict:
+    """Build the column updates for a notes change"""
+    return {
+        "notes": notes,
+        "date_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+def get_jobs_page(page: int = 1, page_size: int = 50, status: Optional[str] = None,
+                  search: Optional[str] = None, min_score: Optional[float] = None) -> Tuple[pd.DataFrame, int]:
+    """Get one page of jobs with filters applied by the database
+    
+    Returns:
+        (DataFrame of the page's jobs, total number of matching jobs)
+    """
+    backend = get_backend()
+    if not backend:
+        print("Error: Database backend not initialized")
+        return pd.DataFrame(), 0
+    
+    try:
+        offset = max(page - 1, 0) * page_size
+        rows, total = backend.query_jobs(status=status, search=search, min_score=min_score,
+                                         offset=offset, limit=page_size)
+        if rows:
+            return _apply_pending(pd.DataFrame(rows)), total
+        return pd.DataFrame(), total
+    except Exception as e:
+        print(f"Error getting jobs page: {e}")
+        return pd.DataFrame(), 0
+
 def update_job_status(job_id: int, new_status: str) -> bool:
     """Update the status of a job"""
     if new_status not in VALID_STATUSES:
         return False
     
-    if not supabase:
-        print("Error: Supabase client not initialized")
+    backend = get_backend()
+    if not backend:
+        print("Error: Database backend not initialized")
         return False
     
     try:
-        date_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        update_data = {
-            "status": new_status,
-            "date_updated": date_updated
-        }
-        
-        # If status is "Applied", also set date_applied
-        if new_status == "Applied":
-            update_data["date_applied"] = datetime.now().strftime("%Y-%m-%d")
-        
-        result = supabase.table('jobs').update(update_data).eq('id', job_id).execute()
+        backend.update_job(job_id, _status_update_data(new_status))
+        _update_analytics(lambda store: store.patch(job_id, {"status": new_status}))
         return True
     except Exception as e:
         print(f"Error updating status: {e}")
@@ -144,63 +195,266 @@ def update_job_status(job_id: int, new_status: str) -> bool:
 
 def update_job_notes(job_id: int, notes: str) -> bool:
     """Update notes for a job"""
-    if not supabase:
-        print("Error: Supabase client not initialized")
+    backend = get_backend()
+    if not backend:
+        print("Error: Database backend not initialized")
         return False
     
     try:
-        date_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        update_data = {
-            "notes": notes,
-            "date_updated": date_updated
-        }
-        
-        result = supabase.table('jobs').update(update_data).eq('id', job_id).execute()
+        backend.update_job(job_id, _notes_update_data(notes))
         return True
     except Exception as e:
         print(f"Error updating notes: {e}")
         return False
 
+def update_job_scores(scores: Dict[str, float]) -> int:
+    """Set match scores by job link (e.g. after re-scoring against a new profile)
+
+    Args:
+        scores: {link: new match score}; links not in the tracker are ignored
+
+    Returns:
+        int: Number of jobs whose score changed
+    """
+    backend = get_backend()
+    if not backend or not scores:
+        return 0
+
+    try:
+        date_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        changed = []
+        for row in backend.fetch_jobs_by_links(list(scores)):
+            new_score = scores.get(row.get('link'))
+            if new_score is None or row.get('match_score') == new_score:
+                continue
+            changed.append({**row, "match_score": new_score, "date_updated": date_updated})
+
+        if changed:
+            backend.update_jobs(changed, ["match_score", "date_updated"])
+            _update_analytics(lambda store: store.upsert(changed))
+            get_excel_scheduler().request_patch(changed)
+        return len(changed)
+    except Exception as e:
+        print(f"Error updating scores: {e}")
+        return 0
+
 def delete_job(job_id: int) -> bool:
     """Delete a job from the database"""
-    if not supabase:
-        print("Error: Supabase client not initialized")
+    backend = get_backend()
+    if not backend:
+        print("Error: Database backend not initialized")
         return False
     
     try:
-        result = supabase.table('jobs').delete().eq('id', job_id).execute()
+        backend.delete_job(job_id)
+        _update_analytics(lambda store: store.remove([job_id]))
         return True
     except Exception as e:
         print(f"Error deleting job: {e}")
         return False
 
+# --- Write-behind queue (non-blocking tracker edits) ---
+_write_queue: Optional[WriteBehindQueue] = None
+_excel_scheduler: Optional[ExcelExportScheduler] = None
+
+def _apply_queued_writes(writes: List[Tuple[int, str, Dict]]):
+    """Apply a batch of queued writes (raises so they stay queued)
+
+    Deletes go out as one request; updates are grouped by the columns they
+    change, one bulk write per group. Updates to rows that no longer exist
+    are dropped.
+    """
+    backend = get_backend()
+    if not backend:
+        raise Exception("Database backend not initialized")
+    deletes = [job_id for job_id, op, _ in writes if op == "delete"]
+    updates = {job_id: fields for job_id, op, fields in writes if op == "update" and fields}
+
+    if updates:
+        groups: Dict[Tuple[str, ...], List[Dict]] = {}
+        for row in backend.fetch_jobs_by_ids(list(updates)):
+            fields = updates[row['id']]
+            groups.setdefault(tuple(sorted(fields)), []).append({**row, **fields})
+        for columns, rows in groups.items():
+            backend.update_jobs(rows, list(columns))
+    if deletes:
+        backend.delete_jobs_by_ids(deletes)
+
+def _after_queue_flush(writes: List):
+    """Patch the changed rows into the Excel export (debounced) and analytics"""
+    scheduler = get_excel_scheduler()
+    deleted_ids = [job_id for job_id, op, _ in writes if op == "delete"]
+    updated_ids = [job_id for job_id, op, _ in writes if op == "update"]
+    rows = get_backend().fetch_jobs_by_ids(updated_ids) if updated_ids else []
+    
+    def update(store):
+        store.upsert(rows)
+        store.remove(deleted_ids)
+    _update_analytics(update)
+    
+    deleted_links = [fields.get('link') for _, op, fields in writes if op == "delete"]
+    if None in deleted_links:
+        # Can't locate the row without its link; rewrite the workbook instead
+        scheduler.request_full()
+        return
+    scheduler.request_patch(rows, deleted_links)
+
+def get_write_queue() -> WriteBehindQueue:
+    """Get the process-wide write queue, starting its flusher on first use
+
+    Writes left in the journal by a previous process are replayed as soon
+    as the flusher starts.
+    """
+    global _write_queue
+    if _write_queue is None:
+        # Create the Excel scheduler first so its atexit flush runs after
+        # the queue's final flush (atexit handlers run last-in, first-out)
+        get_excel_scheduler()
+        _write_queue = WriteBehindQueue(_apply_queued_writes, on_flush=_after_queue_flush)
+        _write_queue.start()
+        atexit.register(_write_queue.stop)
+    return _write_queue
+
+def queue_job_status(job_id: int, new_status: str) -> bool:
+    """Queue a status change; returns immediately and is flushed in the background"""
+    if new_status not in VALID_STATUSES:
+        return False
+    
+    try:
+        get_write_queue().enqueue_update(job_id, _status_update_data(new_status))
+        return True
+    except Exception as e:
+        print(f"Error queueing status update: {e}")
+        return False
+
+def queue_job_notes(job_id: int, notes: str) -> bool:
+    """Queue a notes change; returns immediately and is flushed in the background"""
+    try:
+        get_write_queue().enqueue_update(job_id, _notes_update_data(notes))
+        return True
+    except Exception as e:
+        print(f"Error queueing notes update: {e}")
+        return False
+
+def queue_job_delete(job_id: int, link: Optional[str] = None) -> bool:
+    """Queue a job deletion; returns immediately and is flushed in the background
+
+    Passing the job link lets the Excel export drop just that row.
+    """
+    try:
+        get_write_queue().enqueue_delete(job_id, {"link": link} if link else None)
+        return True
+    except Exception as e:
+        print(f"Error queueing delete: {e}")
+        return False
+
+def queue_job_changes(changes: Dict[int, Dict], deletes: Optional[Dict[int, str]] = None) -> bool:
+    """Queue a batch of tracker edits in one go
+    
+    Args:
+        changes: {job_id: {"status": ..., "notes": ...}} with only the edited keys
+        deletes: {job_id: link} for jobs to delete
+    """
+    updates = {}
+    for job_id, edit in changes.items():
+        update_data = {}
+        if "status" in edit:
+            if edit["status"] not in VALID_STATUSES:
+                return False
+            update_data.update(_status_update_data(edit["status"]))
+        if "notes" in edit:
+            update_data.update(_notes_update_data(edit["notes"]))
+        if update_data:
+            updates[int(job_id)] = update_data
+    
+    try:
+        get_write_queue().enqueue_changes(updates, {
+            int(job_id): {"link": link} if link else None for job_id, link in (deletes or {}).items()
+        })
+        return True
+    except Exception as e:
+        print(f"Error queueing changes: {e}")
+        return False
+
+def flush_pending_writes() -> int:
+    """Synchronously flush queued writes; returns the number applied"""
+    try:
+        return get_write_queue().flush_all()
+    except Exception as e:
+        print(f"Error flushing queued writes: {e}")
+        return 0
+
+def _apply_pending(df: pd.DataFrame) -> pd.DataFrame:
+    """Overlay queued (not yet flushed) writes so reads see the user's edits"""
+    if _write_queue is None or len(df) == 0 or 'id' not in df.columns:
+        return df
+    
+    pending = _write_queue.pending()
+    if not pending:
+        return df
+    
+    deleted = [job_id for job_id, write in pending.items() if write["op"] == "delete"]
+    df = df[~df['id'].isin(deleted)].copy()
+    for job_id, write in pending.items():
+        if write["op"] != "update":
+            continue
+        mask = df['id'] == job_id
+        if mask.any():
+            for column, value in write["fields"].items():
+                df.loc[mask, column] = value
+    return df
+
+def _apply_pending_summary(backend, summary: Dict) -> Dict:
+    """Overlay queued status changes and deletes onto a status_summary()"""
+    if _write_queue is None:
+        return summary
+    pending = {job_id: write for job_id, write in _write_queue.pending().items()
+               if write["op"] == "delete" or "status" in write["fields"]}
+    if not pending:
+        return summary
+    
+    by_status = dict(summary['by_status'])
+    total = summary['total']
+    avg = summary['avg_match_score']
+    for row in backend.fetch_jobs_by_ids(list(pending)):
+        write = pending[row['id']]
+        old_status = row.get('status')
+        by_status[old_status] = by_status.get(old_status, 0) - 1
+        if write["op"] == "delete":
+            score = row.get('match_score')
+            if avg is not None and score is not None and total > 1:
+                avg = (avg * total - float(score)) / (total - 1)
+            total -= 1
+        else:
+            new_status = write["fields"]["status"]
+            by_status[new_status] = by_status.get(new_status, 0) + 1
+    return {"total": total, "by_status": by_status, "avg_match_score": avg}
+
 def get_statistics() -> Dict:
     """Get statistics about applications"""
-    if not supabase:
-        print("Error: Supabase client not initialized")
+    backend = get_backend()
+    if not backend:
+        print("Error: Database backend not initialized")
         return {}
     
     try:
-        # Get all jobs for statistics
-        all_jobs = get_all_jobs()
+        # Aggregate counts (server-side where the backend supports it),
+        # including edits still waiting in the write queue
+        summary = _apply_pending_summary(backend, backend.status_summary())
         
         stats = {}
         
         # Total jobs
-        stats['total_jobs'] = len(all_jobs)
+        stats['total_jobs'] = summary['total']
         
         # Count by status
         for status in VALID_STATUSES:
             status_key = status.lower().replace(' ', '_')
-            stats[status_key] = len(all_jobs[all_jobs['status'] == status]) if len(all_jobs) > 0 else 0
+            stats[status_key] = summary['by_status'].get(status, 0)
         
         # Average match score
-        if len(all_jobs) > 0:
-            avg_score = all_jobs['match_score'].mean()
-            stats['avg_match_score'] = round(avg_score, 1) if pd.notna(avg_score) else 0
-        else:
-            stats['avg_match_score'] = 0
+        avg_score = summary['avg_match_score']
+        stats['avg_match_score'] = round(avg_score, 1) if avg_score is not None and pd.notna(avg_score) else 0
         
         # Success rate (Got Selected / Applied)
         applied = stats['applied'] + stats['ongoing'] + stats['interviewing'] + stats['got_selected'] + stats['rejected']
@@ -214,14 +468,38 @@ def get_statistics() -> Dict:
         print(f"Error getting statistics: {e}")
         return {}
 
+def get_job_analytics() -> Dict:
+    """Get the precomputed analytics aggregates (see AnalyticsStore.summary)
+
+    Every few minutes the aggregates are checked against the backend's
+    per-status counts and rebuilt from a full scan if they have drifted.
+    """
+    backend = get_backend()
+    if not backend:
+        print("Error: Database backend not initialized")
+        return {}
+    
+    try:
+        store = get_analytics_store()
+        if store.needs_verify():
+            if store.matches(backend.status_summary()):
+                store.mark_verified()
+            else:
+                store.rebuild(backend.fetch_jobs())
+        return store.summary()
+    except Exception as e:
+        print(f"Error getting analytics: {e}")
+        return {}
+
 def sync_from_excel():
     """Import jobs from Excel to database (one-time migration)"""
     if not os.path.exists(EXCEL_FILE):
         print("No Excel file found to sync from")
         return
     
-    if not supabase:
-        print("Error: Supabase client not initialized")
+    backend = get_backend()
+    if not backend:
+        print("Error: Database backend not initialized")
         return
     
     try:
@@ -241,9 +519,8 @@ def sync_from_excel():
             # Update status if it exists
             if 'Status' in row and pd.notna(row['Status']):
                 # Find the job we just added by link
-                result = supabase.table('jobs').select("id").eq('link', row['Link']).execute()
-                if result.data and len(result.data) > 0:
-                    job_id = result.data[0]['id']
+                job_id = backend.find_job_id(row['Link'])
+                if job_id is not None:
                     update_job_status(job_id, row['Status'])
         
         print(f"✅ Synced {len(df)} jobs from Excel to database")
@@ -253,45 +530,25 @@ def sync_from_excel():
 def sync_to_excel():
     """Export database to Excel (for compatibility)"""
     try:
-        df = get_all_jobs()
+        backend = get_backend()
+        rows = backend.fetch_jobs() if backend else []
         
-        if len(df) == 0:
+        if len(rows) == 0:
             print("No jobs to sync to Excel")
             return
         
-        # Reorder and rename columns to match Excel format
-        export_df = pd.DataFrame()
-        export_df['Date Found'] = df['date_found']
-        export_df['Company'] = df['company']
-        export_df['Role'] = df['role']
-        export_df['Location'] = df['location']
-        export_df['Duration'] = df['duration']
-        export_df['Link'] = df['link']
-        export_df['Match Score'] = df['match_score']
-        export_df['Status'] = df['status']
-        
-        export_df.to_excel(EXCEL_FILE, index=False)
-        
-        # Add dropdowns
-        from openpyxl import load_workbook
-        from openpyxl.worksheet.datavalidation import DataValidation
-        
-        wb = load_workbook(EXCEL_FILE)
-        ws = wb.active
-        
-        options = '"Not Applied,Applied,Ongoing,Interviewing,Got Selected,Rejected"'
-        dv = DataValidation(type="list", formula1=options, allow_blank=True)
-        dv.add(f'H2:H{len(export_df) + 50}')
-        ws.add_data_validation(dv)
-        
-        wb.save(EXCEL_FILE)
-        print(f"✅ Synced {len(df)} jobs to Excel")
+        # Stream rows straight into a write-only workbook (one file write)
+        count = write_full_export(rows, EXCEL_FILE)
+        print(f"✅ Synced {count} jobs to Excel")
     except Exception as e:
         print(f"Error syncing to Excel: {e}")
 
-# Initialize database connection on import
-if SUPABASE_URL and SUPABASE_KEY:
-    init_db()
-else:
-    print("⚠️ Supabase credentials not found in .env file")
-    print("Please add SUPABASE_URL and SUPABASE_KEY to your .env file")
+def get_excel_scheduler() -> ExcelExportScheduler:
+    """Get the process-wide debounced Excel writer"""
+    global _excel_scheduler
+    if _excel_scheduler is None:
+        _excel_scheduler = ExcelExportScheduler(
+            lambda: get_backend().fetch_jobs(), path=EXCEL_FILE
+        )
+        atexit.register(_excel_scheduler.flush)
+    return _excel_scheduler
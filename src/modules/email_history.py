@@ -0,0 +1,151 @@
+"""
+Emailed-Jobs History for JobSniper
+Append-only JSONL log of job URLs that have been emailed, mirrored by an
+in-memory set for O(1) membership checks. Shared by the pipeline, the
+notifier and the dashboard.
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+from typing import Iterable, Set
+
+HISTORY_LOG_FILE = os.path.join("data", "history.jsonl")
+
+# Pre-JSONL history (a JSON list of URLs), folded into the log when found
+LEGACY_HISTORY_FILE = os.path.join("data", "history.json")
+
+
+class EmailHistory:
+    """Append-only set of emailed job URLs
+
+    Each line of the log is {"url": ..., "emailed_at": ...}. The in-memory
+    set is refreshed incrementally: only bytes appended since the last read
+    are parsed, so another process's writes are picked up cheaply. If the
+    log shrank (cleared or restored from a backup) it is re-read in full.
+    """
+
+    def __init__(self, path: str = HISTORY_LOG_FILE, legacy_path: str = LEGACY_HISTORY_FILE):
+        self.path = path
+        self.legacy_path = legacy_path
+        self._urls: Set[str] = set()
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    # --- Loading ---
+    def _import_legacy(self):
+        """Fold a legacy history.json into the log, then retire it"""
+        if not self.legacy_path or not os.path.exists(self.legacy_path):
+            return
+        try:
+            with open(self.legacy_path, 'r') as f:
+                legacy = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Could not read {self.legacy_path}: {e}")
+            return
+        self._refresh_locked()
+        self._append_locked([url for url in legacy if url], emailed_at=None)
+        os.replace(self.legacy_path, f"{self.legacy_path}.migrated")
+        print(f"📦 Migrated {len(legacy)} history entries to {self.path}")
+
+    def _refresh_locked(self):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        if size < self._offset:
+            self._urls.clear()
+            self._offset = 0
+        if size == self._offset:
+            return
+
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            data = f.read(size - self._offset)
+        # Leave a partially written last line for the next refresh
+        end = data.rfind(b"\n") + 1
+        lines = [line for line in data[:end].splitlines() if line.strip()]
+        try:
+            # Parse the whole chunk in one call; fall back line by line on a bad entry
+            self._urls.update(entry["url"] for entry in json.loads(b"[" + b",".join(lines) + b"]"))
+        except (ValueError, KeyError, TypeError):
+            for line in lines:
+                try:
+                    self._urls.add(json.loads(line)["url"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+        self._offset += end
+
+    def refresh(self) -> "EmailHistory":
+        """Pick up entries appended since the last call (by any process)"""
+        with self._lock:
+            self._import_legacy()
+            self._refresh_locked()
+        return self
+
+    # --- Queries ---
+    def __contains__(self, url) -> bool:
+        return url in self._urls
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def __iter__(self):
+        return iter(list(self._urls))
+
+    # --- Writes ---
+    def _append_locked(self, urls: Iterable[str], emailed_at=datetime.now) -> int:
+        new_urls = []
+        for url in urls:
+            if url not in self._urls:
+                self._urls.add(url)
+                new_urls.append(url)
+        if not new_urls:
+            return 0
+
+        timestamp = emailed_at() if callable(emailed_at) else emailed_at
+        lines = "".join(
+            json.dumps({"url": url, "emailed_at": timestamp.isoformat() if timestamp else None}) + "\n"
+            for url in new_urls
+        ).encode("utf-8")
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, 'ab') as f:
+            f.write(lines)
+            end = f.tell()
+        # Skip past our own lines only if nobody appended between the last
+        # refresh and this write; otherwise the next refresh reads theirs
+        # (ours are already in the set)
+        if end == self._offset + len(lines):
+            self._offset = end
+        return len(new_urls)
+
+    def add(self, urls: Iterable[str]) -> int:
+        """Record URLs as emailed, appending only ones not already present
+
+        Returns:
+            int: Number of URLs appended
+        """
+        with self._lock:
+            self._refresh_locked()
+            return self._append_locked(urls)
+
+    def clear(self):
+        """Empty the history (keeps the file)"""
+        with self._lock:
+            open(self.path, 'w').close()
+            self._urls.clear()
+            self._offset = 0
+
+
+# Shared instance per process
+_history = None
+_history_lock = threading.Lock()
+
+def get_email_history() -> EmailHistory:
+    """Get the shared history, refreshed with any new entries"""
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = EmailHistory()
+    return _history.refresh()
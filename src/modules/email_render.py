@@ -0,0 +1,178 @@
+"""
+Email Digest Renderer for JobSniper Notifications
+Renders job digests from precompiled templates in one pass, keeps the HTML
+under a size budget (Gmail clips messages past ~102 KB) and builds a
+plaintext alternative
+"""
+
+import os
+import html
+import math
+from string import Template
+from typing import Dict, Iterable, List, Tuple
+
+# HTML budget for the whole message; overflow jobs are summarized instead
+EMAIL_MAX_BYTES = int(os.getenv("EMAIL_MAX_BYTES", "95000"))
+
+# Linked from the overflow section
+DASHBOARD_URL = os.getenv("DASHBOARD_URL", "http://localhost:8501")
+
+# Scores above this get the green badge
+HIGH_SCORE_BADGE = 75
+
+JOB_CARD = Template("""
+        <div style="margin-bottom: 25px; padding: 20px; border: 1px solid #e0e0e0; border-radius: 12px; font-family: sans-serif; background-color: #ffffff;">
+            <div style="border-bottom: 1px solid #f0f0f0; padding-bottom: 10px; margin-bottom: 10px;">
+                <h2 style="margin: 0; color: #2c3e50; font-size: 20px;">$title</h2>
+                <p style="margin: 5px 0; color: #7f8c8d; font-size: 16px;">🏢 <strong>$company</strong></p>
+            </div>
+            <div style="display: flex; gap: 15px; margin-bottom: 15px; font-size: 14px;">
+                <span style="background-color: #e8f6f3; color: #16a085; padding: 5px 10px; border-radius: 5px;">📍 $work_mode</span>
+                <span style="background-color: #fef9e7; color: #f1c40f; padding: 5px 10px; border-radius: 5px;">⏳ $duration</span>
+                <span style="background-color: $color; color: white; padding: 5px 10px; border-radius: 5px; font-weight: bold;">🎯 Score: $score/100</span>
+            </div>
+            <div style="background-color: #f9f9f9; padding: 15px; border-radius: 8px; margin-bottom: 15px; color: #444; line-height: 1.5;">
+                <strong>💡 Why this matches:</strong><br>
+                $match_reason
+            </div>
+            <div style="text-align: right;">
+                <a href="$job_url" style="background-color: #007bff; color: white; padding: 10px 20px; text-decoration: none; border-radius: 6px; font-weight: bold; font-size: 14px;">Apply Now 🚀</a>
+            </div>
+        </div>""")
+
+OVERFLOW_ROW = Template("""
+                <li><a href="$job_url" style="color: #007bff;">$title</a> @ $company ($score/100)</li>""")
+
+OVERFLOW_SECTION = Template("""
+        <div style="margin-bottom: 25px; padding: 20px; border: 1px dashed #bbb; border-radius: 12px; font-family: sans-serif; background-color: #ffffff;">
+            <h3 style="margin: 0 0 10px 0; color: #2c3e50;">+$count more matches</h3>
+            <ul style="padding-left: 18px; color: #444; line-height: 1.6;">$rows
+            </ul>
+            <p style="margin: 10px 0 0 0;"><a href="$dashboard_url" style="color: #007bff; font-weight: bold;">View all matches in the dashboard →</a></p>
+        </div>""")
+
+PAGE = Template("""
+    <html>
+    <body style="background-color: #f4f6f8; padding: 20px; font-family: sans-serif;">
+        <div style="max-width: 600px; margin: 0 auto; background-color: transparent;">
+            <h2 style="text-align: center; color: #2c3e50;">🎯 JobSniper $heading</h2>
+            <p style="text-align: center; color: #7f8c8d;">Found <strong>$total</strong> new matches for you today.</p>
+$cards
+            <hr style="border: 0; border-top: 1px solid #ddd; margin-top: 30px;">
+            <p style="text-align: center; font-size: 12px; color: #999;">Generated by JobSniper v2.0</p>
+        </div>
+    </body>
+    </html>
+    """)
+
+
+def _text(value, default: str = "") -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return default
+    return str(value)
+
+
+def _fields(job: Dict) -> Dict[str, str]:
+    """Escaped template fields for one job"""
+    score = job.get("relevance_score", 0)
+    score_text = _text(score, "0")
+    if isinstance(score, float) and score.is_integer():
+        score_text = str(int(score))
+    return {
+        "title": html.escape(_text(job.get("title"))),
+        "company": html.escape(_text(job.get("company"))),
+        "work_mode": html.escape(_text(job.get("work_mode"), "On-site")),
+        "duration": html.escape(_text(job.get("duration"), "Not Specified")),
+        "score": score_text,
+        "color": "#27ae60" if (score or 0) > HIGH_SCORE_BADGE else "#d35400",  # Green or Orange
+        "match_reason": html.escape(_text(job.get("match_reason"))),
+        "job_url": html.escape(_text(job.get("job_url")), quote=True),
+    }
+
+
+def render_digest(jobs: Iterable[Dict], heading: str = "Daily Brief",
+                  max_bytes: int = EMAIL_MAX_BYTES,
+                  dashboard_url: str = DASHBOARD_URL) -> Tuple[str, str, int]:
+    """Render a job digest as HTML plus a plaintext alternative
+
+    Full cards are added while they fit in max_bytes; the remaining jobs are
+    listed compactly in a "+N more" section (itself trimmed to the budget)
+    that links to the dashboard. The plaintext part gets the same budget and
+    ends with a "+N more" line pointing at the dashboard when it runs out.
+
+    Args:
+        jobs: Job dicts (title, company, job_url, relevance_score, ...)
+        heading: Digest name shown in the title
+
+    Returns:
+        tuple: (html, text, number of jobs shown as full cards)
+    """
+    jobs = list(jobs)
+    fields = [_fields(job) for job in jobs]
+
+    shell = PAGE.substitute(heading=html.escape(heading), total=len(jobs), cards="")
+    # Reserve room for the overflow box so it always fits
+    overflow_shell = OVERFLOW_SECTION.substitute(count=len(jobs), rows="", dashboard_url=html.escape(dashboard_url))
+    budget = max_bytes - len(shell.encode("utf-8")) - len(overflow_shell.encode("utf-8"))
+
+    cards: List[str] = []
+    for job_fields in fields:
+        card = JOB_CARD.substitute(job_fields)
+        size = len(card.encode("utf-8"))
+        if size > budget:
+            break
+        cards.append(card)
+        budget -= size
+
+    overflow = fields[len(cards):]
+    if overflow:
+        rows: List[str] = []
+        for job_fields in overflow:
+            row = OVERFLOW_ROW.substitute(job_fields)
+            size = len(row.encode("utf-8"))
+            if size > budget:
+                break
+            rows.append(row)
+            budget -= size
+        cards.append(OVERFLOW_SECTION.substitute(count=len(overflow), rows="".join(rows),
+                                                 dashboard_url=html.escape(dashboard_url)))
+
+    html_body = PAGE.substitute(heading=html.escape(heading), total=len(jobs), cards="".join(cards))
+    text_body = render_text(jobs, heading, dashboard_url, max_bytes=max_bytes)
+    return html_body, text_body, len(cards) - (1 if overflow else 0)
+
+
+def render_text(jobs: List[Dict], heading: str = "Daily Brief",
+                dashboard_url: str = DASHBOARD_URL,
+                max_bytes: int = EMAIL_MAX_BYTES) -> str:
+    """Plaintext version of a digest, trimmed to max_bytes
+
+    Jobs that don't fit are counted in a closing line that links to the
+    dashboard.
+    """
+    header = "\n".join([f"JobSniper {heading}", f"Found {len(jobs)} new matches for you today.", "", ""])
+    # Reserve room for the overflow line so it always fits
+    overflow_line = f"+{len(jobs)} more matches: view the rest in the dashboard: {dashboard_url}\n"
+    budget = max_bytes - len(header.encode("utf-8")) - len(overflow_line.encode("utf-8"))
+
+    blocks: List[str] = []
+    for job in jobs:
+        lines = [f"* {_text(job.get('title'))} @ {_text(job.get('company'))} "
+                 f"- Score {_fields(job)['score']}/100",
+                 f"  {_text(job.get('work_mode'), 'On-site')} | {_text(job.get('duration'), 'Not Specified')}"]
+        if _text(job.get("match_reason")):
+            lines.append(f"  Why: {_text(job.get('match_reason'))}")
+        lines.append(f"  Apply: {_text(job.get('job_url'))}")
+        block = "\n".join(lines) + "\n\n"
+        size = len(block.encode("utf-8"))
+        if size > budget:
+            break
+        blocks.append(block)
+        budget -= size
+
+    remaining = len(jobs) - len(blocks)
+    if remaining:
+        footer = f"+{remaining} more matches: view the rest in the dashboard: {dashboard_url}"
+    else:
+        footer = f"Dashboard: {dashboard_url}"
+    return header + "".join(blocks) + footer
@@ -0,0 +1,243 @@
+"""
+Excel Export Engine for JobSniper Application Tracker
+Streams full exports with openpyxl write-only mode, patches changed rows in
+place, and debounces bursts of edits into a single workbook write
+"""
+
+import os
+import sys
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+# openpyxl is imported where workbooks are written: db_manager (and so every
+# dashboard page) imports this module, but most pages never touch the workbook
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from run_metrics import timed
+
+TRACKER_FILE = os.path.join("data", "Job_Application_Tracker.xlsx")
+
+# Excel header -> tracker database column
+COLUMN_MAP = [
+    ("Date Found", "date_found"),
+    ("Company", "company"),
+    ("Role", "role"),
+    ("Location", "location"),
+    ("Duration", "duration"),
+    ("Link", "link"),
+    ("Match Score", "match_score"),
+    ("Status", "status"),
+]
+HEADERS = [header for header, _ in COLUMN_MAP]
+STATUS_COLUMN = "H"
+STATUS_OPTIONS = '"Not Applied,Applied,Ongoing,Interviewing,Got Selected,Rejected"'
+
+# Spare rows covered by the Status dropdown for manual additions
+DROPDOWN_HEADROOM = 50
+
+# Seconds to wait for further edits before writing the workbook
+EXPORT_DEBOUNCE_SECONDS = 2.0
+
+
+def _cell_value(value):
+    """Convert NaN/numpy values into something openpyxl writes cleanly"""
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _row_values(job: Dict) -> List:
+    return [_cell_value(job.get(column)) for _, column in COLUMN_MAP]
+
+
+def _status_validation(total_rows: int):
+    from openpyxl.worksheet.datavalidation import DataValidation
+    dv = DataValidation(type="list", formula1=STATUS_OPTIONS, allow_blank=True)
+    dv.add(f'{STATUS_COLUMN}2:{STATUS_COLUMN}{total_rows + DROPDOWN_HEADROOM}')
+    return dv
+
+
+@timed("excel.save")
+def _save_atomic(wb, path: str):
+    """Save to a temp file and rename so readers never see a partial workbook"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    wb.save(tmp_path)
+    os.replace(tmp_path, path)
+
+
+@timed("excel.full_export")
+def write_full_export(jobs: Iterable[Dict], path: str = TRACKER_FILE) -> int:
+    """Write every job to a fresh workbook, streaming rows in write-only mode
+
+    Args:
+        jobs: Tracker rows as dicts keyed by database column
+        path: Workbook to (re)create
+
+    Returns:
+        int: Number of job rows written
+    """
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(HEADERS)
+
+    count = 0
+    for job in jobs:
+        ws.append(_row_values(job))
+        count += 1
+
+    ws.data_validations.append(_status_validation(count))
+    _save_atomic(wb, path)
+    return count
+
+
+@timed("excel.patch")
+def patch_rows(upserts: Optional[List[Dict]] = None,
+               deleted_links: Optional[List[str]] = None,
+               path: str = TRACKER_FILE,
+               update_existing: bool = True) -> Dict:
+    """Update, append and remove individual rows of an existing workbook
+
+    Rows are matched on the Link column. Untouched rows are left as they are
+    (including any manual formatting), and the workbook is saved once.
+
+    Args:
+        update_existing: If False, upserts whose link is already present are
+            skipped instead of overwriting the row (append-only mode)
+
+    Returns:
+        dict: {"updated", "appended", "deleted"} row counts
+    """
+    upserts = upserts or []
+    deleted = set(deleted_links or [])
+
+    from openpyxl import load_workbook
+    wb = load_workbook(path)
+    ws = wb.active
+
+    header = [cell.value for cell in ws[1]]
+    col_index = {name: idx + 1 for idx, name in enumerate(header) if name in HEADERS}
+    link_col = col_index.get("Link")
+    if link_col is None:
+        raise ValueError(f"{path} has no 'Link' column")
+
+    row_by_link = {}
+    for row_idx, (link,) in enumerate(
+            ws.iter_rows(min_row=2, min_col=link_col, max_col=link_col, values_only=True), start=2):
+        if link is not None:
+            row_by_link[link] = row_idx
+
+    result = {"updated": 0, "appended": 0, "deleted": 0}
+
+    for job in upserts:
+        link = job.get("link")
+        if link in deleted:
+            continue
+        row_idx = row_by_link.get(link)
+        if row_idx is None:
+            ws.append(_row_values(job))
+            row_by_link[link] = ws.max_row
+            result["appended"] += 1
+            continue
+        if not update_existing:
+            continue
+        for header_name, column in COLUMN_MAP:
+            if column in job and header_name in col_index:
+                ws.cell(row=row_idx, column=col_index[header_name], value=_cell_value(job[column]))
+        result["updated"] += 1
+
+    # Delete bottom-up so earlier row numbers stay valid
+    for row_idx in sorted((row_by_link[l] for l in deleted if l in row_by_link), reverse=True):
+        ws.delete_rows(row_idx)
+        result["deleted"] += 1
+
+    if result["appended"] or result["deleted"]:
+        ws.data_validations.dataValidation = []
+        ws.add_data_validation(_status_validation(ws.max_row - 1))
+
+    if any(result.values()):
+        _save_atomic(wb, path)
+    return result
+
+
+class ExcelExportScheduler:
+    """Debounces tracker edits into one workbook write
+
+    Patch requests are merged (latest values per link win) until no new
+    request has arrived for `delay` seconds; a full-export request replaces
+    any pending patch. Writes run on a timer thread.
+    """
+
+    def __init__(self, fetch_all_jobs: Callable[[], List[Dict]],
+                 path: str = TRACKER_FILE,
+                 delay: float = EXPORT_DEBOUNCE_SECONDS):
+        self.fetch_all_jobs = fetch_all_jobs
+        self.path = path
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._timer = None
+        self._full = False
+        self._upserts = {}
+        self._deleted = set()
+
+    def request_patch(self, upserts: Optional[List[Dict]] = None,
+                      deleted_links: Optional[List[str]] = None):
+        with self._lock:
+            for job in upserts or []:
+                link = job.get("link")
+                self._upserts.setdefault(link, {}).update(job)
+                self._deleted.discard(link)
+            for link in deleted_links or []:
+                self._upserts.pop(link, None)
+                self._deleted.add(link)
+            self._restart_timer()
+
+    def request_full(self):
+        with self._lock:
+            self._full = True
+            self._upserts.clear()
+            self._deleted.clear()
+            self._restart_timer()
+
+    def _restart_timer(self):
+        if self._timer:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """Write any pending changes now"""
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            full, upserts, deleted = self._full, list(self._upserts.values()), list(self._deleted)
+            self._full = False
+            self._upserts = {}
+            self._deleted = set()
+
+        if not (full or upserts or deleted):
+            return
+        with self._write_lock:
+            self._write(full, upserts, deleted)
+
+    def _write(self, full: bool, upserts: List[Dict], deleted: List[str]):
+        try:
+            if not full and os.path.exists(self.path):
+                try:
+                    result = patch_rows(upserts, deleted, self.path)
+                    print(f"✅ Patched Excel tracker ({result['updated']} updated, "
+                          f"{result['appended']} added, {result['deleted']} removed)")
+                    return
+                except Exception as e:
+                    print(f"⚠️ Could not patch Excel tracker, rewriting it: {e}")
+            count = write_full_export(self.fetch_all_jobs(), self.path)
+            print(f"✅ Synced {count} jobs to Excel")
+        except Exception as e:
+            print(f"Error syncing to Excel: {e}")
@@ -0,0 +1,137 @@
+"""
+Login Guard for the JobSniper Dashboard
+Sliding-window rate limiting of failed logins (kept in memory, persisted to a
+small JSON file) and a size-rotated, gzip-compressed authentication audit log
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import shutil
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from progress_reporter import write_json_atomic
+
+ATTEMPTS_FILE = os.path.join("data", "login_attempts.json")
+AUDIT_LOG_FILE = os.path.join("data", "auth_audit.log")
+
+MAX_LOGIN_ATTEMPTS = 5
+LOCKOUT_DURATION = 900  # 15 minutes in seconds
+
+# Rotate the audit log past this size, keeping this many compressed copies
+AUDIT_LOG_MAX_BYTES = int(os.getenv("AUTH_AUDIT_MAX_BYTES", str(1024 * 1024)))
+AUDIT_LOG_BACKUPS = int(os.getenv("AUTH_AUDIT_BACKUPS", "5"))
+
+
+class LoginRateLimiter:
+    """Failed login attempts per username over a sliding window
+
+    Only failures inside the window are kept; older ones are dropped as
+    usernames are checked, so a check costs O(attempts in window).
+    """
+
+    def __init__(self, path: str = ATTEMPTS_FILE,
+                 max_attempts: int = MAX_LOGIN_ATTEMPTS,
+                 window: float = LOCKOUT_DURATION):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.window = window
+        self._lock = threading.Lock()
+        self._failures: Dict[str, Deque[float]] = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                saved = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Could not read {self.path}: {e}")
+            return
+        cutoff = time.time() - self.window
+        for username, times in saved.items():
+            recent = deque(t for t in sorted(times) if t > cutoff)
+            if recent:
+                self._failures[username] = recent
+
+    def _save(self):
+        write_json_atomic(self.path, {user: list(times) for user, times in self._failures.items()})
+
+    def _expire(self, username: str, now: float) -> Deque[float]:
+        times = self._failures.get(username)
+        if times is None:
+            return deque()
+        cutoff = now - self.window
+        while times and times[0] <= cutoff:
+            times.popleft()
+        if not times:
+            del self._failures[username]
+        return times
+
+    def is_allowed(self, username: str) -> bool:
+        """True if the user is below the failed-attempt limit"""
+        with self._lock:
+            return len(self._expire(username, time.time())) < self.max_attempts
+
+    def record_failure(self, username: str):
+        """Count a failed attempt and persist the (expired-pruned) store"""
+        now = time.time()
+        with self._lock:
+            self._expire(username, now)
+            self._failures.setdefault(username, deque()).append(now)
+            # Drop users whose whole window has lapsed so the file stays small
+            for user in list(self._failures):
+                self._expire(user, now)
+            self._save()
+
+
+def _rotate(path: str, backups: int):
+    """auth_audit.log -> auth_audit.log.1.gz, shifting older copies up"""
+    for i in range(backups - 1, 0, -1):
+        older = f"{path}.{i}.gz"
+        if os.path.exists(older):
+            os.replace(older, f"{path}.{i + 1}.gz")
+    if backups > 0:
+        with open(path, 'rb') as src, gzip.open(f"{path}.1.gz", 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+    os.remove(path)
+
+
+_audit_lock = threading.Lock()
+
+def log_auth_attempt(username: str, success: bool, ip: str = "unknown",
+                     path: str = AUDIT_LOG_FILE,
+                     max_bytes: int = AUDIT_LOG_MAX_BYTES,
+                     backups: int = AUDIT_LOG_BACKUPS):
+    """Append an authentication attempt to the audit log, rotating by size"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    status = "SUCCESS" if success else "FAILED"
+    log_entry = f"{datetime.now().isoformat()} | {status} | User: {username} | IP: {ip}\n"
+
+    with _audit_lock:
+        try:
+            if os.path.getsize(path) + len(log_entry) > max_bytes:
+                _rotate(path, backups)
+        except OSError:
+            pass
+        with open(path, 'a') as f:
+            f.write(log_entry)
+
+
+# Shared limiter per process
+_limiter = None
+_limiter_lock = threading.Lock()
+
+def get_login_limiter() -> LoginRateLimiter:
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = LoginRateLimiter()
+        return _limiter
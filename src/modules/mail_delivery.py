@@ -0,0 +1,120 @@
+"""
+SMTP Delivery Engine for JobSniper Notifications
+Keeps one authenticated SMTP session per notifier run and retries transient
+failures with exponential backoff
+"""
+
+import smtplib
+import time
+from typing import List, Optional
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_SECONDS = 2.0
+
+# Failures worth reconnecting and retrying for; 5xx replies are permanent
+TRANSIENT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError)
+
+
+def _is_transient(error: Exception) -> bool:
+    if isinstance(error, smtplib.SMTPAuthenticationError):
+        return False
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+class SMTPDelivery:
+    """One reusable SMTP session (connect + STARTTLS + login happen once)
+
+    Use as a context manager; the connection is opened lazily on the first
+    send and closed on exit. A dropped connection is re-established
+    transparently on the next attempt.
+    """
+
+    def __init__(self, server: str, port: int, sender: str,
+                 password: Optional[str] = None,
+                 use_tls: bool = True,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF_SECONDS):
+        """
+        Args:
+            server, port: SMTP server address
+            sender: Envelope sender (and login user when a password is given)
+            password: Login password; None skips AUTH (e.g. a local test server)
+            use_tls: Upgrade the connection with STARTTLS
+            max_retries: Retries per message for transient failures
+            backoff: Initial retry delay in seconds, doubled on each retry
+        """
+        self.server = server
+        self.port = port
+        self.sender = sender
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self._smtp = None
+        self.sent = 0
+        self.connections = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def connect(self):
+        """Open and authenticate the session (no-op if already connected)"""
+        if self._smtp is not None:
+            return
+        smtp = smtplib.SMTP(self.server, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                smtp.starttls()
+            if self.password:
+                smtp.login(self.sender, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        self._smtp = smtp
+        self.connections += 1
+
+    def close(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        self._smtp = None
+
+    def send(self, message, recipients: List[str]):
+        """Send one message to the given recipients
+
+        Args:
+            message: An email.message.Message (MIMEMultipart etc.)
+            recipients: Envelope recipients
+
+        Raises:
+            smtplib.SMTPException/OSError: Permanent failure, or a transient
+                one that persisted through all retries
+        """
+        payload = message.as_string()
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.connect()
+                self._smtp.sendmail(self.sender, recipients, payload)
+                self.sent += 1
+                return
+            except Exception as e:
+                if not _is_transient(e) or attempt == self.max_retries:
+                    raise
+                delay = self.backoff * (2 ** attempt)
+                print(f"   ⚠️ SMTP error ({e}); retrying in {delay:.0f}s...")
+                self.close()
+                time.sleep(delay)
@@ -1,52 +1,88 @@
-import smtplib
 import os
+import sys
 import json
 import pandas as pd
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from progress_reporter import start_phase, report_progress
+from mail_delivery import SMTPDelivery
+from email_render import render_digest
+from email_history import get_email_history
+from run_metrics import span, count
+
 load_dotenv()
 
 # --- Configuration ---
-SMTP_SERVER = "smtp.gmail.com"
-SMTP_PORT = 587
+SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_USE_TLS = os.getenv("SMTP_USE_TLS", "true").lower() != "false"
 SENDER_EMAIL = "jeevananthan9806@gmail.com"
 RECIPIENT_EMAIL = "jeevananthan9806@gmail.com"
 SENDER_PASSWORD = os.getenv("EMAIL_APP_PASSWORD") 
 
+# Comma-separated list; defaults to the single recipient above
+RECIPIENT_EMAILS = [r.strip() for r in os.getenv("NOTIFY_RECIPIENTS", RECIPIENT_EMAIL).split(",") if r.strip()]
+
 VERIFIED_JOBS_FILE = os.path.join("data", "verified", "verified_jobs.csv")
-HISTORY_FILE = os.path.join("data", "history.json")
+
+# Optional digest config: a JSON list of
+#   {"name": ..., "min_score": 75, "max_score": 100, "recipients": [...]}
+# Each digest gets the new jobs in its score tier; all are sent over one SMTP session.
+DIGESTS_FILE = os.path.join("data", "notify_digests.json")
 
 # Lowered threshold to work with enhanced local scoring
 MIN_MATCH_SCORE = 55 
 
-def load_history():
-    if not os.path.exists(HISTORY_FILE): return []
+def load_digests():
+    """Digest definitions from DIGESTS_FILE, or one digest of every new match"""
+    default = [{"name": "Daily Brief", "min_score": MIN_MATCH_SCORE, "recipients": RECIPIENT_EMAILS}]
+    if not os.path.exists(DIGESTS_FILE): return default
     try:
-        with open(HISTORY_FILE, 'r') as f: return json.load(f)
-    except: return []
-
-def save_history(new_urls):
-    current_history = load_history()
-    updated_history = list(set(current_history + new_urls))
-    with open(HISTORY_FILE, 'w') as f:
-        json.dump(updated_history, f, indent=2)
-
-def send_email(subject, body):
+        with open(DIGESTS_FILE, 'r') as f: digests = json.load(f)
+    except Exception as e:
+        print(f"⚠️ Could not read {DIGESTS_FILE}, using the default digest: {e}")
+        return default
+    for digest in digests:
+        digest.setdefault("recipients", RECIPIENT_EMAILS)
+        digest.setdefault("min_score", MIN_MATCH_SCORE)
+    return digests
+
+def create_mailer():
+    """SMTP session shared by every email of a notifier run"""
+    return SMTPDelivery(SMTP_SERVER, SMTP_PORT, SENDER_EMAIL, SENDER_PASSWORD, use_tls=SMTP_USE_TLS)
+
+def build_message(subject, body, recipients, text_body=None):
+    """multipart/alternative message: plaintext first, HTML preferred"""
+    msg = MIMEMultipart('alternative')
+    msg['From'] = SENDER_EMAIL
+    msg['To'] = ", ".join(recipients)
+    msg['Subject'] = subject
+    if text_body:
+        msg.attach(MIMEText(text_body, 'plain', 'utf-8'))
+    msg.attach(MIMEText(body, 'html', 'utf-8'))
+    return msg
+
+def send_email(subject, body, recipients=None, mailer=None, text_body=None):
+    """Send one HTML email (with an optional plaintext alternative)
+    
+    Args:
+        recipients: Defaults to RECIPIENT_EMAILS
+        mailer: Open SMTPDelivery session to reuse; a one-off session is used if None
+    """
+    recipients = recipients or RECIPIENT_EMAILS
     try:
-        if not SENDER_PASSWORD: return False
-        msg = MIMEMultipart()
-        msg['From'] = SENDER_EMAIL
-        msg['To'] = RECIPIENT_EMAIL
-        msg['Subject'] = subject
-        msg.attach(MIMEText(body, 'html'))
-        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
-        server.starttls()
-        server.login(SENDER_EMAIL, SENDER_PASSWORD)
-        server.sendmail(SENDER_EMAIL, RECIPIENT_EMAIL, msg.as_string())
-        server.quit()
-        print(f"📧 Email sent to {RECIPIENT_EMAIL}")
+        # No password is fine: SMTPDelivery skips AUTH (e.g. a local relay)
+        if not SENDER_EMAIL: return False
+        msg = build_message(subject, body, recipients, text_body)
+        if mailer is not None:
+            mailer.send(msg, recipients)
+        else:
+            with create_mailer() as one_off:
+                one_off.send(msg, recipients)
+        print(f"📧 Email sent to {', '.join(recipients)}")
         return True
     except Exception as e:
         print(f"❌ Email Failed: {e}")
@@ -54,6 +90,7 @@ def send_email(subject, body):
 
 def run_notifier():
     print("--- 📨 Starting Notifier (Enhanced Layout) ---")
+    start_phase("notifying")
     
     if not os.path.exists(VERIFIED_JOBS_FILE): return
     df = pd.read_csv(VERIFIED_JOBS_FILE)
@@ -64,74 +101,46 @@ def run_notifier():
     high_value_df = df[df['relevance_score'] >= MIN_MATCH_SCORE]
     
     # 2. Filter History
-    history = load_history()
-    new_jobs_df = high_value_df[~high_value_df['job_url'].isin(history)]
+    history = get_email_history()
+    new_jobs_df = high_value_df[[url not in history for url in high_value_df['job_url']]]
     
     if new_jobs_df.empty:
         print("✅ No NEW jobs to report.")
         return
 
-    # 3. Build Email
-    print(f"🚀 Preparing email for {len(new_jobs_df)} jobs...")
+    # 3. Build & send one digest per score tier over a single SMTP session
+    digests = load_digests()
+    print(f"🚀 Preparing {len(digests)} digest(s) for {len(new_jobs_df)} jobs...")
     
-    job_rows = ""
-    for _, row in new_jobs_df.iterrows():
-        score = row['relevance_score']
-        color = "#27ae60" if score > 75 else "#d35400" # Green or Orange
-        
-        # Fallbacks for missing data
-        duration = row.get('duration', 'Not Specified')
-        work_mode = row.get('work_mode', 'On-site')
-        
-        job_rows += f"""
-        <div style="margin-bottom: 25px; padding: 20px; border: 1px solid #e0e0e0; border-radius: 12px; font-family: sans-serif; background-color: #ffffff;">
+    sent_urls = set()
+    with create_mailer() as mailer:
+        for digest in digests:
+            tier_df = new_jobs_df[new_jobs_df['relevance_score'] >= digest["min_score"]]
+            if digest.get("max_score") is not None:
+                tier_df = tier_df[tier_df['relevance_score'] <= digest["max_score"]]
+            if tier_df.empty:
+                continue
             
-            <div style="border-bottom: 1px solid #f0f0f0; padding-bottom: 10px; margin-bottom: 10px;">
-                <h2 style="margin: 0; color: #2c3e50; font-size: 20px;">{row['title']}</h2>
-                <p style="margin: 5px 0; color: #7f8c8d; font-size: 16px;">🏢 <strong>{row['company']}</strong></p>
-            </div>
-
-            <div style="display: flex; gap: 15px; margin-bottom: 15px; font-size: 14px;">
-                <span style="background-color: #e8f6f3; color: #16a085; padding: 5px 10px; border-radius: 5px;">
-                    📍 {work_mode}
-                </span>
-                <span style="background-color: #fef9e7; color: #f1c40f; padding: 5px 10px; border-radius: 5px;">
-                    ⏳ {duration}
-                </span>
-                <span style="background-color: {color}; color: white; padding: 5px 10px; border-radius: 5px; font-weight: bold;">
-                    🎯 Score: {score}/100
-                </span>
-            </div>
-
-            <div style="background-color: #f9f9f9; padding: 15px; border-radius: 8px; margin-bottom: 15px; color: #444; line-height: 1.5;">
-                <strong>💡 Why this matches:</strong><br>
-                {row['match_reason']}
-            </div>
-
-            <div style="text-align: right;">
-                <a href="{row['job_url']}" style="background-color: #007bff; color: white; padding: 10px 20px; text-decoration: none; border-radius: 6px; font-weight: bold; font-size: 14px;">
-                    Apply Now 🚀
-                </a>
-            </div>
-        </div>
-        """
-
-    email_body = f"""
-    <html>
-    <body style="background-color: #f4f6f8; padding: 20px; font-family: sans-serif;">
-        <div style="max-width: 600px; margin: 0 auto; background-color: transparent;">
-            <h2 style="text-align: center; color: #2c3e50;">🎯 JobSniper Daily Brief</h2>
-            <p style="text-align: center; color: #7f8c8d;">Found <strong>{len(new_jobs_df)}</strong> new matches for you today.</p>
-            {job_rows}
-            <hr style="border: 0; border-top: 1px solid #ddd; margin-top: 30px;">
-            <p style="text-align: center; font-size: 12px; color: #999;">Generated by JobSniper v2.0</p>
-        </div>
-    </body>
-    </html>
-    """
-
-    if send_email(f"🎯 JobSniper: {len(new_jobs_df)} New Matches", email_body):
-        save_history(new_jobs_df['job_url'].tolist())
+            subject = f"🎯 JobSniper: {len(tier_df)} New Matches"
+            if digest["name"] != "Daily Brief":
+                subject += f" ({digest['name']})"
+            with span("notify.render"):
+                html_body, text_body, shown = render_digest(tier_df.to_dict('records'), digest["name"])
+            if shown < len(tier_df):
+                print(f"✂️ {digest['name']}: {len(tier_df) - shown} jobs summarized to keep the email under the size limit")
+            with span("notify.smtp_send"):
+                sent = send_email(subject, html_body, digest["recipients"], mailer, text_body)
+            if sent:
+                count("emails_sent")
+                sent_urls.update(tier_df['job_url'].tolist())
+    
+    if mailer.connections > 1:
+        print(f"🔌 Reconnected {mailer.connections - 1} time(s) during delivery")
+    
+    if sent_urls:
+        count("jobs_emailed", len(sent_urls))
+        history.add(sent_urls)
+        report_progress(jobs_emailed=len(sent_urls))
 
 if __name__ == "__main__":
     run_notifier()
\ No newline at end of file
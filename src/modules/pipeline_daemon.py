@@ -0,0 +1,371 @@
+"""
+Pipeline Daemon for JobSniper
+A long-lived process that keeps the pipeline warm (stage modules and their
+dependencies imported, profile, processed-job and email-history sets loaded)
+and starts each run by forking itself, so a run begins in milliseconds
+instead of re-importing pandas, jobspy and friends
+
+BackgroundScraper (and so the dashboard and run queue) hands runs to the
+daemon over a local Unix socket when it is running, and falls back to
+spawning `src/main.py` when it is not. Each run is still its own process:
+stopping, PID tracking, progress/telemetry files and resource limits work
+exactly as before. POSIX only (fork + Unix sockets).
+
+Usage:
+    python src/modules/pipeline_daemon.py            # serve (foreground)
+    python src/modules/pipeline_daemon.py --status
+    python src/modules/pipeline_daemon.py --stop
+"""
+
+import os
+import sys
+import json
+import time
+import errno
+import signal
+import socket
+import argparse
+import traceback
+from datetime import datetime
+from typing import Dict, List, Optional
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+sys.path.append(os.path.dirname(SRC_DIR))  # config/, as src/main.py does
+
+# Relative to the project root (the daemon and dashboard both run there);
+# Unix socket paths are limited to ~100 characters
+DAEMON_SOCKET = os.path.join("data", "pipeline_daemon.sock")
+DAEMON_SOCKET_ENV = "JOBSNIPER_DAEMON_SOCKET"
+
+# Clients give up quickly and fall back to a fresh process
+CLIENT_TIMEOUT_SECONDS = 2.0
+# How often the accept loop wakes up to log finished runs
+ACCEPT_POLL_SECONDS = 1.0
+REQUEST_MAX_BYTES = 1024 * 1024
+
+# Environment variables forwarded with each run (resource limits etc.)
+FORWARDED_ENV_PREFIX = "JOBSNIPER_"
+
+# Modules imported once by the daemon and shared with every run
+WARM_MODULES = [
+    "modules.scraper", "modules.auditor", "modules.rescorer", "modules.notifier",
+    "modules.tracker", "modules.email_history", "modules.db_manager",
+    "modules.run_profiler", "main",
+]
+
+
+def daemon_socket_path() -> str:
+    return os.getenv(DAEMON_SOCKET_ENV) or DAEMON_SOCKET
+
+
+# --- Client side (used by BackgroundScraper) ---
+def daemon_request(payload: Dict, path: Optional[str] = None,
+                   timeout: float = CLIENT_TIMEOUT_SECONDS) -> Optional[Dict]:
+    """Send one request to the daemon
+
+    Returns:
+        dict: The daemon's reply, or None if no daemon is listening
+    """
+    path = path or daemon_socket_path()
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(path)
+            client.sendall(json.dumps(payload).encode() + b"\n")
+            reply = client.makefile('rb').readline()
+        return json.loads(reply) if reply else None
+    except (OSError, ValueError):
+        return None
+
+
+def submit_run(args: List[str], env: Dict[str, str], log_file: str,
+               path: Optional[str] = None) -> Optional[Dict]:
+    """Ask the daemon to start a pipeline run
+
+    Args:
+        args: src/main.py command-line arguments
+        env: Environment overrides for the run (progress/telemetry files);
+            JOBSNIPER_* variables of this process are forwarded too
+        log_file: File receiving the run's stdout/stderr (appended to)
+
+    Returns:
+        dict: {"pid", "create_time"} of the run, or None if no daemon
+        accepted it (start a regular process instead)
+    """
+    forwarded = {k: v for k, v in os.environ.items() if k.startswith(FORWARDED_ENV_PREFIX)}
+    reply = daemon_request({"cmd": "run", "args": list(args), "env": {**forwarded, **env},
+                            "log_file": os.path.abspath(log_file), "cwd": os.getcwd()}, path)
+    if not reply or not reply.get("ok"):
+        if reply:
+            print(f"⚠️ Pipeline daemon refused the run: {reply.get('error')}")
+        return None
+    return reply
+
+
+def daemon_status(path: Optional[str] = None) -> Optional[Dict]:
+    """The daemon's status, or None if it isn't running"""
+    return daemon_request({"cmd": "status"}, path)
+
+
+# --- Daemon side ---
+class PipelineDaemon:
+    """Serves run requests on a Unix socket, forking one process per run"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or daemon_socket_path()
+        self.started_at = time.time()
+        self.runs_started = 0
+        self.last_run = None
+        self.warm_seconds = None
+        self.children = {}
+        self._finished = []
+        self._server = None
+        self._stopping = False
+
+    # Warm state
+    def warm_up(self):
+        """Import the pipeline and load the state every run reads"""
+        started = time.perf_counter()
+        import importlib
+        for name in WARM_MODULES:
+            importlib.import_module(name)
+
+        from config import settings
+        auditor = sys.modules["modules.auditor"]
+        if settings.USE_GEMINI and auditor.API_KEY:
+            auditor.load_gemini()
+        # Libraries the stages import lazily
+        for name in ("pyarrow.dataset", "openpyxl"):
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+        if os.getenv("SUPABASE_URL") and os.getenv("SUPABASE_KEY"):
+            try:
+                import supabase
+            except ImportError:
+                pass
+        self.refresh()
+        self.warm_seconds = round(time.perf_counter() - started, 2)
+
+    def refresh(self):
+        """Bring cached files up to date before forking a run
+
+        Open database connections are deliberately not warmed: SQLite handles
+        and HTTP connection pools must not be shared across fork, so each run
+        creates its own backend (the client libraries are already imported).
+        """
+        auditor = sys.modules["modules.auditor"]
+        auditor.load_user_profile()
+        auditor.load_processed_metadata()
+        for name in ("modules.email_history", "email_history"):
+            if name in sys.modules:
+                sys.modules[name].get_email_history().refresh()
+
+    # Serving
+    def serve(self):
+        if os.path.exists(self.path):
+            if daemon_status(self.path):
+                raise RuntimeError(f"A pipeline daemon is already listening on {self.path}")
+            os.remove(self.path)  # stale socket from a crashed daemon
+
+        print("🔥 Warming up pipeline daemon...")
+        self.warm_up()
+        print(f"✅ Warm in {self.warm_seconds}s")
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(self.path)
+        self._server.listen(8)
+        self._server.settimeout(ACCEPT_POLL_SECONDS)
+        signal.signal(signal.SIGCHLD, self._reap)
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        print(f"👂 Pipeline daemon (PID {os.getpid()}) listening on {self.path}")
+
+        try:
+            while not self._stopping:
+                self._log_finished()
+                try:
+                    conn, _ = self._server.accept()
+                except socket.timeout:
+                    continue
+                except OSError as e:
+                    if e.errno == errno.EINTR:
+                        continue
+                    if self._stopping:
+                        break
+                    raise
+                with conn:
+                    self._handle(conn)
+        finally:
+            self._server.close()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            print("👋 Pipeline daemon stopped")
+
+    def _request_stop(self, signum=None, frame=None):
+        self._stopping = True
+        if self._server:
+            # Wake the blocking accept()
+            try:
+                self._server.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _reap(self, signum=None, frame=None):
+        """SIGCHLD: collect finished runs so they don't linger as zombies
+
+        (Logging happens in the accept loop; printing from a signal handler
+        can collide with a print already in progress.)
+        """
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            run = self.children.pop(pid, None)
+            if run is not None:
+                self._finished.append((pid, os.waitstatus_to_exitcode(status), time.time() - run["started"]))
+
+    def _log_finished(self):
+        while self._finished:
+            pid, code, seconds = self._finished.pop(0)
+            print(f"🏁 Run {pid} finished (exit {code}) after {seconds:.1f}s")
+
+    def _handle(self, conn: socket.socket):
+        conn.settimeout(CLIENT_TIMEOUT_SECONDS)
+        try:
+            request = json.loads(conn.makefile('rb').readline(REQUEST_MAX_BYTES) or b"{}")
+            cmd = request.get("cmd")
+            if cmd == "run":
+                reply = self._start_run(request)
+            elif cmd == "status":
+                reply = self.status()
+            elif cmd == "shutdown":
+                self._stopping = True
+                reply = {"ok": True}
+            else:
+                reply = {"ok": False, "error": f"Unknown command: {cmd!r}"}
+        except Exception as e:
+            reply = {"ok": False, "error": str(e)}
+        try:
+            conn.sendall(json.dumps(reply).encode() + b"\n")
+        except OSError:
+            pass
+
+    def status(self) -> Dict:
+        return {
+            "ok": True,
+            "pid": os.getpid(),
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(timespec="seconds"),
+            "uptime_seconds": round(time.time() - self.started_at),
+            "warm_seconds": self.warm_seconds,
+            "runs_started": self.runs_started,
+            "active_runs": sorted(self.children),
+            "last_run": self.last_run,
+        }
+
+    def _start_run(self, request: Dict) -> Dict:
+        requested = time.perf_counter()
+        # Warm state (and the pipeline's relative data/ paths) belong to the
+        # daemon's project directory
+        if os.path.realpath(request.get("cwd") or os.getcwd()) != os.path.realpath(os.getcwd()):
+            return {"ok": False, "error": f"Daemon serves {os.getcwd()}, not {request.get('cwd')}"}
+        self.refresh()
+        # Hold SIGCHLD until the child is registered, in case it exits at once
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGCHLD})
+        try:
+            pid = os.fork()
+            if pid == 0:
+                self._run_child(request)  # never returns
+            self.children[pid] = {"started": time.time()}
+        finally:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGCHLD})
+
+        import psutil
+        try:
+            create_time = psutil.Process(pid).create_time()
+        except psutil.Error:
+            create_time = None
+        self.runs_started += 1
+        self.last_run = {"pid": pid, "args": request.get("args", []),
+                         "started_at": datetime.now().isoformat(timespec="seconds"),
+                         "fork_ms": round((time.perf_counter() - requested) * 1000, 1)}
+        print(f"🚀 Run {pid} started ({' '.join(request.get('args', [])) or 'full pipeline'}) "
+              f"in {self.last_run['fork_ms']} ms")
+        return {"ok": True, "pid": pid, "create_time": create_time}
+
+    def _run_child(self, request: Dict):
+        """Body of a forked run: detach, redirect output, run main()"""
+        code = 1
+        try:
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            # Python's handler: the memory limit interrupts the run through it
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGCHLD})
+            self._server.close()
+            os.setsid()
+            # Per-run collector bound to this process, not the daemon
+            for name in ("run_metrics", "modules.run_metrics"):
+                if name in sys.modules:
+                    sys.modules[name]._run_metrics = None
+
+            os.environ.update(request.get("env") or {})
+
+            devnull = os.open(os.devnull, os.O_RDONLY)
+            os.dup2(devnull, 0)
+            log_fd = os.open(request["log_file"], os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            os.dup2(log_fd, 1)
+            os.dup2(log_fd, 2)
+            # Unbuffered like `python -u`, so the dashboard can follow the log
+            sys.stdout = open(1, 'w', encoding='utf-8', errors='replace', buffering=1, closefd=False)
+            sys.stderr = open(2, 'w', encoding='utf-8', errors='replace', buffering=1, closefd=False)
+
+            sys.modules["main"].main(request.get("args", []))
+            code = 0
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+            finally:
+                os._exit(code)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep the JobSniper pipeline warm between runs")
+    parser.add_argument("--status", action="store_true", help="Show the running daemon's status")
+    parser.add_argument("--stop", action="store_true", help="Stop the running daemon")
+    parser.add_argument("--socket", help=f"Socket path (default {DAEMON_SOCKET})")
+    args = parser.parse_args(argv)
+
+    if args.status or args.stop:
+        reply = daemon_request({"cmd": "shutdown" if args.stop else "status"}, args.socket)
+        if reply is None:
+            print("ℹ️ No pipeline daemon is running.")
+            return 1
+        print("🛑 Pipeline daemon stopping." if args.stop else json.dumps(reply, indent=2))
+        return 0
+
+    if not hasattr(os, "fork") or not hasattr(socket, "AF_UNIX"):
+        print("❌ The pipeline daemon needs fork() and Unix sockets (Linux/macOS).")
+        return 1
+    # Line-buffered log output when run in the background
+    sys.stdout.reconfigure(line_buffering=True)
+    PipelineDaemon(args.socket).serve()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
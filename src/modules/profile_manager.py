@@ -1,12 +1,22 @@
 import json
 import os
+import hashlib
 
 PROFILE_PATH = os.path.join("data", "profile.json")
 
+# Profile fields the local scorer reads
+SCORING_FIELDS = ["target_role", "skills", "preferences"]
+
+def profile_version(profile):
+    """Short hash of the profile fields that affect scoring"""
+    relevant = {field: profile.get(field) for field in SCORING_FIELDS}
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True).encode()).hexdigest()[:12]
+
 class ProfileManager:
     def __init__(self):
         self.profile_path = PROFILE_PATH
         self.data = self._load_profile()
+        self.loaded_version = profile_version(self.data)
 
     def _load_profile(self):
         """Loads profile data or returns a skeleton if missing."""
@@ -62,6 +72,17 @@ class ProfileManager:
         else:
             print(f"❌ Project '{project_name}' not found.")
 
+    # --- RE-SCORING ---
+    def rescore_if_changed(self):
+        """Re-score stored jobs if skills/role/preferences changed since loading"""
+        if profile_version(self.data) == self.loaded_version:
+            return None
+        from modules.rescorer import rescore, print_report
+        report = rescore(self.data, force=True)
+        print_report(report)
+        self.loaded_version = profile_version(self.data)
+        return report
+
     def list_profile(self):
         """Prints a summary of the current profile."""
         print(f"\n👤 Name: {self.data.get('name', 'N/A')}")
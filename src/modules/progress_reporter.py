@@ -0,0 +1,122 @@
+"""
+Pipeline Progress Reporter
+Lets the scraper, auditor and notifier publish structured progress to
+data/scraper_progress.json so the dashboard can read it without re-parsing CSVs
+"""
+
+import os
+import json
+import time
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+PROGRESS_FILE = os.path.join("data", "scraper_progress.json")
+
+# Set by BackgroundScraper so queued runs each report to their own file
+PROGRESS_FILE_ENV = "JOBSNIPER_PROGRESS_FILE"
+
+# Counters reset at the start of every pipeline run
+RUN_COUNTERS = {
+    "jobs_scraped": 0,
+    "jobs_verified": 0,
+    "high_score_jobs": 0,
+    "jobs_emailed": 0,
+    "step": 0,
+    "total_steps": None,
+    "eta_seconds": None,
+}
+
+# Serializes report_progress's read-modify-write between threads
+_progress_lock = threading.Lock()
+
+
+def write_json_atomic(path: str, data: Dict):
+    """Write JSON to a temp file and rename it into place
+
+    Readers polling the file never see a half-written document, and
+    concurrent writers (threads or processes) each get their own temp file.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def progress_path() -> str:
+    """Progress file for this process (per-run override or the default)"""
+    return os.getenv(PROGRESS_FILE_ENV) or PROGRESS_FILE
+
+
+def read_progress(path: Optional[str] = None) -> Dict:
+    """Return the current progress document ({} if missing or unreadable)"""
+    path = path or progress_path()
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def report_progress(path: Optional[str] = None, **fields) -> Dict:
+    """Merge fields into the progress file
+
+    If `step` is given and the current phase has a `total_steps`, an ETA for
+    the phase is derived from the average time per step so far.
+
+    Returns:
+        dict: The progress document as written
+    """
+    path = path or progress_path()
+    with _progress_lock:
+        progress = read_progress(path)
+        progress.update(fields)
+
+        step, total = progress.get("step"), progress.get("total_steps")
+        if "step" in fields and step and total and progress.get("phase_started"):
+            elapsed = time.time() - progress["phase_started"]
+            progress["eta_seconds"] = round(elapsed / step * max(total - step, 0))
+
+        progress["last_update"] = datetime.now().isoformat()
+        try:
+            write_json_atomic(path, progress)
+        except OSError as e:
+            print(f"⚠️ Could not write progress: {e}")
+    return progress
+
+
+def begin_run(path: Optional[str] = None) -> Dict:
+    """Mark the pipeline as running
+
+    Keeps the start time and backup info written by the dashboard launcher;
+    runs started any other way (CLI, cron) get a fresh start time.
+    """
+    progress = read_progress(path)
+    fields = dict(RUN_COUNTERS, status="running", error=None)
+    if progress.get("status") != "starting":
+        fields["start_time"] = datetime.now().isoformat()
+        fields["backup_name"] = None
+    return report_progress(path, **fields)
+
+
+def start_phase(phase: str, total_steps: Optional[int] = None, path: Optional[str] = None) -> Dict:
+    """Enter a pipeline phase, optionally with a known number of steps"""
+    return report_progress(path, phase=phase, step=0, total_steps=total_steps,
+                           eta_seconds=None, phase_started=time.time())
+
+
+def finish_run(status: str = "completed", error: Optional[str] = None,
+               path: Optional[str] = None, **fields) -> Dict:
+    """Record the final pipeline status (plus any extra fields, e.g. peak_rss_mb)"""
+    return report_progress(path, status=status, phase="done" if status == "completed" else status,
+                           eta_seconds=None, error=error, end_time=datetime.now().isoformat(), **fields)
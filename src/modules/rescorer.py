@@ -0,0 +1,259 @@
+"""
+Profile Re-scorer for JobSniper
+When the profile's scoring inputs change, re-runs the local scorer over every
+stored posting (search index + scrape archive) without re-scraping, then
+updates scores in the search index, verified_jobs.csv and the tracker
+
+Usage:
+    python src/modules/rescorer.py           # only if the profile changed
+    python src/modules/rescorer.py --force   # re-score regardless
+"""
+
+import os
+import sys
+import json
+import argparse
+from datetime import datetime
+from typing import Dict, Optional
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Project root, for config.settings (used by the auditor)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from progress_reporter import write_json_atomic, start_phase, report_progress
+from profile_manager import profile_version
+from auditor import analyze_locally, load_user_profile, OUTPUT_FILE
+from notifier import MIN_MATCH_SCORE
+from search_index import get_search_index
+from scrape_archive import read_archive
+
+RESCORE_STATE_FILE = os.path.join("data", "rescore_state.json")
+
+# Promoted jobs not emailed yet. The auditor rewrites verified_jobs.csv on
+# each run, so the pipeline merges these back in before track/notify.
+PENDING_PROMOTIONS_FILE = os.path.join("data", "verified", "rescored_pending.csv")
+
+# Postings scored between progress file updates
+PROGRESS_EVERY = 25
+
+
+def load_rescore_state() -> Dict:
+    if not os.path.exists(RESCORE_STATE_FILE):
+        return {}
+    try:
+        with open(RESCORE_STATE_FILE, 'r') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def load_stored_postings() -> pd.DataFrame:
+    """Every posting we still have a description for, newest copy per URL
+
+    Indexed postings are the audited ones (with their current scores); the
+    scrape archive adds jobs that were never verified.
+    """
+    frames = []
+    indexed = get_search_index().postings()
+    if len(indexed) > 0:
+        frames.append(indexed.assign(old_score=indexed['relevance_score']))
+    try:
+        archived = read_archive(columns=["job_url", "title", "company", "location", "description", "scraped_at"])
+        if len(archived) > 0:
+            archived = archived.sort_values("scraped_at").drop(columns=["scraped_at"])
+            frames.append(archived.astype(object).assign(old_score=None))
+    except ImportError as e:
+        print(f"⚠️ Skipping scrape archive: {e}")
+
+    if not frames:
+        return pd.DataFrame()
+    postings = pd.concat(frames, ignore_index=True)
+    postings = postings.dropna(subset=['job_url', 'description'])
+    # Indexed rows come first, so they keep their current score
+    return postings.drop_duplicates(subset=['job_url'], keep='first')
+
+
+def rescore(profile: Optional[Dict] = None, force: bool = False,
+            min_score: float = MIN_MATCH_SCORE) -> Dict:
+    """Re-score stored postings if the profile changed since the last run
+
+    The first run without saved state only records the profile version.
+
+    Args:
+        profile: Profile to score against (default: data/profile.json)
+        force: Re-score even if the profile version is unchanged
+        min_score: Threshold whose crossings are reported
+
+    Returns:
+        dict: profile_version, changed (bool), rescored, promoted and
+        demoted (lists of {job_url, title, company, old_score, new_score})
+        and tracker_updated
+    """
+    profile = profile or load_user_profile()
+    version = profile_version(profile)
+    state = load_rescore_state()
+    report = {"profile_version": version, "changed": False, "rescored": 0,
+              "promoted": [], "demoted": [], "tracker_updated": 0}
+
+    if not force and state.get("profile_version") in (None, version):
+        if state.get("profile_version") is None:
+            write_json_atomic(RESCORE_STATE_FILE, {"profile_version": version,
+                                                   "rescored_at": None})
+        return report
+    report["changed"] = True
+
+    from db_manager import get_all_jobs, update_job_scores
+    tracker = get_all_jobs()
+    tracker_scores = dict(zip(tracker['link'], tracker['match_score'])) if len(tracker) > 0 else {}
+
+    postings = load_stored_postings()
+    start_phase("rescoring", len(postings))
+    rescored = []
+    for step, posting in enumerate(postings.to_dict('records'), start=1):
+        if step % PROGRESS_EVERY == 0:
+            report_progress(step=step)
+        audit = analyze_locally(posting['description'], posting.get('location') or 'Unknown', profile)
+        if audit['is_scam']:
+            continue
+        old_score = posting.get('old_score')
+        # Only indexed postings carry an old_score of their own
+        indexed = old_score is not None and not pd.isna(old_score)
+        if not indexed:
+            old_score = tracker_scores.get(posting['job_url'])
+        old_score = None if old_score is None or pd.isna(old_score) else float(old_score)
+        new_score = float(audit['relevance_score'])
+        rescored.append({**posting, "relevance_score": new_score, "match_reason": audit['match_reason'],
+                         "work_mode": posting.get('work_mode') or audit['work_mode'],
+                         "duration": posting.get('duration') or audit['duration'],
+                         "indexed": indexed})
+
+        crossing = {"job_url": posting['job_url'], "title": posting.get('title'),
+                    "company": posting.get('company'), "old_score": old_score, "new_score": new_score}
+        was_match = old_score is not None and old_score >= min_score
+        if new_score >= min_score and not was_match:
+            report["promoted"].append(crossing)
+        elif was_match and new_score < min_score:
+            report["demoted"].append(crossing)
+    report["rescored"] = len(rescored)
+    report_progress(step=len(postings))
+
+    if rescored:
+        rescored_df = pd.DataFrame(rescored).drop(columns=['old_score'])
+        # The index holds audited postings: update those, and add archived
+        # jobs only once they score as a match
+        to_index = rescored_df['indexed'] | (rescored_df['relevance_score'] >= min_score)
+        rescored_df = rescored_df.drop(columns=['indexed'])
+        get_search_index().add_dataframe(rescored_df[to_index])
+        promoted_urls = {job["job_url"] for job in report["promoted"]}
+        _update_verified_store(rescored_df, promoted_urls)
+        _update_pending_promotions(rescored_df, promoted_urls, min_score)
+        report["tracker_updated"] = update_job_scores(
+            dict(zip(rescored_df['job_url'], rescored_df['relevance_score']))
+        )
+
+    write_json_atomic(RESCORE_STATE_FILE, {"profile_version": version,
+                                           "rescored_at": datetime.now().isoformat(),
+                                           "rescored": report["rescored"],
+                                           "promoted": len(report["promoted"]),
+                                           "demoted": len(report["demoted"])})
+    return report
+
+
+def _update_verified_store(rescored_df: pd.DataFrame, promoted_urls: set):
+    """Refresh scores in verified_jobs.csv and add newly promoted jobs
+
+    Promoted jobs land in the CSV for a track/notify-only run; they are also
+    kept in the pending file, since the next audit rewrites the CSV.
+    """
+    scores = rescored_df.set_index('job_url')
+    verified = pd.read_csv(OUTPUT_FILE) if os.path.exists(OUTPUT_FILE) else pd.DataFrame(columns=['job_url'])
+
+    known = verified['job_url'].isin(scores.index)
+    for column in ['relevance_score', 'match_reason']:
+        verified.loc[known, column] = verified.loc[known, 'job_url'].map(scores[column])
+
+    new_urls = promoted_urls - set(verified['job_url'])
+    if new_urls:
+        verified = pd.concat([verified, rescored_df[rescored_df['job_url'].isin(new_urls)]], ignore_index=True)
+
+    os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
+    verified.sort_values(by='relevance_score', ascending=False).to_csv(OUTPUT_FILE, index=False)
+
+
+def _read_pending_promotions() -> pd.DataFrame:
+    if not os.path.exists(PENDING_PROMOTIONS_FILE):
+        return pd.DataFrame(columns=['job_url'])
+    try:
+        return pd.read_csv(PENDING_PROMOTIONS_FILE)
+    except (OSError, ValueError, pd.errors.EmptyDataError):
+        return pd.DataFrame(columns=['job_url'])
+
+
+def _write_pending_promotions(pending: pd.DataFrame):
+    if len(pending) > 0:
+        os.makedirs(os.path.dirname(PENDING_PROMOTIONS_FILE), exist_ok=True)
+        pending.to_csv(PENDING_PROMOTIONS_FILE, index=False)
+    elif os.path.exists(PENDING_PROMOTIONS_FILE):
+        os.remove(PENDING_PROMOTIONS_FILE)
+
+
+def _update_pending_promotions(rescored_df: pd.DataFrame, promoted_urls: set, min_score: float):
+    """Add promoted jobs to the pending file; re-score or drop the ones already there"""
+    pending = _read_pending_promotions()
+    keep = (set(pending['job_url']) | promoted_urls)
+    updated = rescored_df[rescored_df['job_url'].isin(keep) & (rescored_df['relevance_score'] >= min_score)]
+    pending = pending[~pending['job_url'].isin(rescored_df['job_url'])]
+    _write_pending_promotions(pd.concat([pending, updated], ignore_index=True))
+
+
+def restore_pending_promotions(verified_path: str = OUTPUT_FILE) -> int:
+    """Merge promoted jobs that aren't emailed yet back into verified_jobs.csv
+
+    Jobs leave the pending file once they are in the email history.
+
+    Returns:
+        int: Number of jobs added back to the CSV
+    """
+    pending = _read_pending_promotions()
+    if len(pending) == 0:
+        return 0
+    from email_history import get_email_history
+    history = get_email_history().refresh()
+    pending = pending[[url not in history for url in pending['job_url']]]
+    _write_pending_promotions(pending)
+
+    verified = pd.read_csv(verified_path) if os.path.exists(verified_path) else pd.DataFrame(columns=['job_url'])
+    missing = pending[~pending['job_url'].isin(verified['job_url'])]
+    if len(missing) > 0:
+        verified = pd.concat([verified, missing], ignore_index=True)
+        os.makedirs(os.path.dirname(verified_path), exist_ok=True)
+        verified.sort_values(by='relevance_score', ascending=False).to_csv(verified_path, index=False)
+    return len(missing)
+
+
+def print_report(report: Dict, min_score: float = MIN_MATCH_SCORE):
+    if not report["changed"]:
+        print(f"ℹ️ Profile unchanged (version {report['profile_version']}); nothing to re-score.")
+        return
+    print(f"🔁 Re-scored {report['rescored']} stored jobs for profile version {report['profile_version']}")
+    print(f"   📋 Tracker scores updated: {report['tracker_updated']}")
+    for label, jobs in [(f"⬆️ Now above {min_score}", report["promoted"]),
+                        (f"⬇️ Now below {min_score}", report["demoted"])]:
+        print(f"   {label}: {len(jobs)}")
+        for job in jobs[:20]:
+            old = "—" if job["old_score"] is None else f"{job['old_score']:.0f}"
+            print(f"      {job['title']} @ {job['company']}: {old} → {job['new_score']:.0f}")
+        if len(jobs) > 20:
+            print(f"      ... and {len(jobs) - 20} more")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score stored jobs after a profile change")
+    parser.add_argument("--force", action="store_true", help="Re-score even if the profile is unchanged")
+    args = parser.parse_args(argv)
+    print_report(rescore(force=args.force))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Resource Governor & Telemetry for the Pipeline Process
+Applies configurable CPU/memory/nice limits to a scraper run and samples its
+RSS, CPU% and open files into an NDJSON time series for the dashboard
+"""
+
+import os
+import json
+import time
+import signal
+import _thread
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import psutil
+
+try:
+    import resource  # POSIX only
+except ImportError:
+    resource = None
+
+TELEMETRY_FILE = os.path.join("data", "scraper_telemetry.ndjson")
+
+# Set by BackgroundScraper so queued runs each sample to their own file
+TELEMETRY_FILE_ENV = "JOBSNIPER_TELEMETRY_FILE"
+TELEMETRY_INTERVAL_SECONDS = 2.0
+
+# Limits (unset/0 = unlimited). The memory limit is enforced on RSS by the
+# sampler, which stops the run cleanly instead of letting it push the host
+# (and the dashboard) into swap.
+MEMORY_LIMIT_ENV = "JOBSNIPER_SCRAPER_MEMORY_MB"
+CPU_LIMIT_ENV = "JOBSNIPER_SCRAPER_CPU_SECONDS"
+NICE_ENV = "JOBSNIPER_SCRAPER_NICE"
+DEFAULT_NICE = 10
+
+# After interrupting the main thread over the memory limit, how long the
+# run gets to unwind (recording the failure) before it is terminated
+MEMORY_LIMIT_GRACE_SECONDS = 30.0
+
+
+def _env_number(name: str, default: float = 0) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        print(f"⚠️ Ignoring invalid {name}={os.getenv(name)!r}")
+        return default
+
+
+def apply_resource_limits(cpu_seconds: Optional[float] = None, nice: Optional[int] = None):
+    """Lower this process's priority and cap its CPU time
+
+    Args:
+        cpu_seconds: Hard CPU-time limit (RLIMIT_CPU); default from the environment
+        nice: Niceness increment; default from the environment (10)
+    """
+    cpu_seconds = _env_number(CPU_LIMIT_ENV) if cpu_seconds is None else cpu_seconds
+    nice = int(_env_number(NICE_ENV, DEFAULT_NICE)) if nice is None else nice
+
+    if nice and hasattr(os, "nice"):
+        try:
+            os.nice(nice)
+        except OSError as e:
+            print(f"⚠️ Could not lower priority: {e}")
+
+    if cpu_seconds and resource is not None:
+        try:
+            # The soft limit sends SIGXCPU; the hard limit a few seconds later kills
+            resource.setrlimit(resource.RLIMIT_CPU, (int(cpu_seconds), int(cpu_seconds) + 5))
+            print(f"⏱️ CPU time limited to {int(cpu_seconds)}s")
+        except (ValueError, OSError) as e:
+            print(f"⚠️ Could not set CPU limit: {e}")
+
+
+def sample_process(process: psutil.Process, known: Optional[Dict[int, psutil.Process]] = None) -> Dict:
+    """Resource usage of a process and its children
+
+    Args:
+        known: Process objects from earlier samples, keyed by PID; reusing
+            them keeps cpu_percent meaningful for child processes
+    """
+    known = {} if known is None else known
+    processes = [process]
+    try:
+        for child in process.children(recursive=True):
+            processes.append(known.setdefault(child.pid, child))
+    except psutil.Error:
+        pass
+
+    rss = cpu = open_files = 0
+    for proc in processes:
+        try:
+            with proc.oneshot():
+                rss += proc.memory_info().rss
+                cpu += proc.cpu_percent(interval=None)
+                open_files += proc.num_fds() if hasattr(proc, "num_fds") else len(proc.open_files())
+        except psutil.Error:
+            continue
+
+    return {
+        "rss_mb": round(rss / (1024 * 1024), 1),
+        "cpu_percent": round(cpu, 1),
+        "open_files": open_files,
+    }
+
+
+class TelemetrySampler:
+    """Background thread appending resource samples to an NDJSON file
+
+    Also tracks peak RSS (the main thread publishes it as peak_rss_mb in the
+    run's progress) and stops the run if RSS exceeds the memory limit.
+    """
+
+    def __init__(self, path: Optional[str] = None,
+                 interval: float = TELEMETRY_INTERVAL_SECONDS,
+                 memory_limit_mb: Optional[float] = None,
+                 pid: Optional[int] = None):
+        self.path = path or os.getenv(TELEMETRY_FILE_ENV) or TELEMETRY_FILE
+        self.interval = interval
+        self.memory_limit_mb = _env_number(MEMORY_LIMIT_ENV) if memory_limit_mb is None else memory_limit_mb
+        self.process = psutil.Process(pid or os.getpid())
+        self._children = {}
+        self.peak_rss_mb = 0.0
+        self._started = time.time()
+        self.limit_error = None
+        self._enforcing = False
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def sample(self) -> Dict:
+        """Take one sample, append it to the file and update the peak"""
+        sample = sample_process(self.process, self._children)
+        sample["time"] = datetime.now().isoformat(timespec="seconds")
+        sample["elapsed"] = round(time.time() - self._started, 1)
+
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(sample) + "\n")
+
+        if sample["rss_mb"] > self.peak_rss_mb:
+            self.peak_rss_mb = sample["rss_mb"]
+        return sample
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                sample = self.sample()
+            except Exception as e:
+                print(f"⚠️ Telemetry sample failed: {e}")
+                continue
+            if self.memory_limit_mb and sample["rss_mb"] > self.memory_limit_mb:
+                self.limit_error = (f"Memory limit exceeded ({sample['rss_mb']:.0f} MB > "
+                                    f"{self.memory_limit_mb:.0f} MB)")
+                print(f"\n🛑 {self.limit_error}; stopping run")
+                self._interrupt_main()
+                return
+
+    def _interrupt_main(self):
+        """Interrupt the main thread until it stops the sampler, then terminate
+
+        enforce_memory_limit() turns the interrupt into a MemoryError, so the
+        run fails through its normal error path. The interrupt is repeated in
+        case a bare except swallows one; SIGTERM is the last resort.
+        """
+        deadline = time.time() + MEMORY_LIMIT_GRACE_SECONDS
+        while time.time() < deadline:
+            if self._enforcing:
+                _thread.interrupt_main()
+            if self._stopped.wait(min(self.interval, 1.0)):
+                return
+        print("🛑 Run did not stop after the memory limit; terminating")
+        os.kill(self.process.pid, signal.SIGTERM)
+
+    @contextmanager
+    def enforce_memory_limit(self):
+        """Raise MemoryError in the block when the sampler hits the limit"""
+        self._enforcing = True
+        try:
+            yield
+        except KeyboardInterrupt:
+            if self.limit_error is None:
+                raise
+            raise MemoryError(self.limit_error) from None
+        finally:
+            self._enforcing = False
+
+    def start(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # Prime cpu_percent so the first real sample has a baseline
+        sample_process(self.process, self._children)
+        self._thread = threading.Thread(target=self._run, name="jobsniper-telemetry", daemon=True)
+        self._thread.start()
+        if self.memory_limit_mb:
+            print(f"🧠 Memory limited to {self.memory_limit_mb:.0f} MB RSS")
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+        try:
+            self.sample()
+        except Exception:
+            pass
+
+
+def parse_telemetry(lines: List[str]) -> List[Dict]:
+    """Parse NDJSON telemetry lines, skipping any partial/corrupt line"""
+    samples = []
+    for line in lines:
+        try:
+            samples.append(json.loads(line))
+        except ValueError:
+            continue
+    return samples
@@ -0,0 +1,220 @@
+"""
+Run Metrics for the Pipeline
+Span timers and counters around each stage and its hot sub-steps (site
+calls, audits, DB round-trips, Excel writes) plus peak RSS per stage, written
+to data/metrics/ as one JSON file per run so the dashboard can chart runs
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import functools
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import psutil
+
+try:
+    import resource  # POSIX only
+except ImportError:
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from progress_reporter import write_json_atomic
+
+METRICS_DIR = os.path.join("data", "metrics")
+METRICS_KEEP_RUNS = 200
+
+# Span exits sample RSS at most this often (seconds); psutil calls aren't free
+RSS_SAMPLE_INTERVAL = 0.1
+
+MB = 1024 * 1024
+
+
+def _max_rss_mb() -> Optional[float]:
+    """Process-lifetime peak RSS from the kernel (None where unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KB on Linux, bytes on macOS
+    return round(peak / (MB if sys.platform == "darwin" else 1024), 1)
+
+
+class RunMetrics:
+    """Span timings, counters and per-stage peak RSS for one pipeline run
+
+    Spans are aggregated by name (count, total and max seconds), so timing a
+    per-job step costs a dict update rather than a growing list. Safe to use
+    from the write-queue and Excel scheduler threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._process = psutil.Process(os.getpid())
+        self.reset()
+
+    def reset(self):
+        """Start a fresh run"""
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self._started = time.perf_counter()
+        self.spans: Dict[str, Dict] = {}
+        self.counters: Dict[str, float] = {}
+        self.stages: List[Dict] = []
+        self._stage: Optional[Dict] = None
+        self._last_rss_sample = 0.0
+
+    def _sample_rss(self, force: bool = False):
+        stage = self._stage
+        now = time.perf_counter()
+        if stage is None or (not force and now - self._last_rss_sample < RSS_SAMPLE_INTERVAL):
+            return
+        self._last_rss_sample = now
+        try:
+            rss = round(self._process.memory_info().rss / MB, 1)
+        except psutil.Error:
+            return
+        if rss > stage["peak_rss_mb"]:
+            stage["peak_rss_mb"] = rss
+
+    def record(self, name: str, seconds: float):
+        """Add one timing to the named span"""
+        with self._lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                stats = self.spans[name] = {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            stats["count"] += 1
+            stats["total_seconds"] += seconds
+            if seconds > stats["max_seconds"]:
+                stats["max_seconds"] = seconds
+        self._sample_rss()
+
+    @contextmanager
+    def span(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def count(self, name: str, n: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a pipeline stage and track its peak RSS (stages don't nest)"""
+        record = {"name": name, "seconds": None, "start_rss_mb": 0.0, "peak_rss_mb": 0.0, "status": "running"}
+        self.stages.append(record)
+        self._stage = record
+        self._sample_rss(force=True)
+        record["start_rss_mb"] = record["peak_rss_mb"]
+        max_before = _max_rss_mb()
+        started = time.perf_counter()
+        try:
+            yield record
+            record["status"] = "ok"
+        except BaseException:
+            record["status"] = "error"
+            raise
+        finally:
+            record["seconds"] = round(time.perf_counter() - started, 3)
+            self._sample_rss(force=True)
+            # A new process high-water mark during this stage is its exact peak
+            max_after = _max_rss_mb()
+            if max_before is not None and max_after > max_before:
+                record["peak_rss_mb"] = max(record["peak_rss_mb"], max_after)
+            self._stage = None
+
+    def to_dict(self, status: str = "completed", error: Optional[str] = None, **extra) -> Dict:
+        with self._lock:
+            spans = {
+                name: {"count": stats["count"],
+                       "total_seconds": round(stats["total_seconds"], 4),
+                       "mean_ms": round(stats["total_seconds"] / stats["count"] * 1000, 3),
+                       "max_ms": round(stats["max_seconds"] * 1000, 3)}
+                for name, stats in sorted(self.spans.items(), key=lambda item: -item[1]["total_seconds"])
+            }
+            counters = dict(self.counters)
+        peaks = [stage["peak_rss_mb"] for stage in self.stages]
+        return {
+            "started_at": self.started_at,
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "total_seconds": round(time.perf_counter() - self._started, 3),
+            "status": status,
+            "error": error,
+            "peak_rss_mb": max(peaks + [_max_rss_mb() or 0]),
+            "stages": [dict(stage) for stage in self.stages],
+            "spans": spans,
+            "counters": counters,
+            **extra,
+        }
+
+    def write(self, status: str = "completed", error: Optional[str] = None,
+              directory: str = METRICS_DIR, **extra) -> str:
+        """Write this run's metrics file and prune old ones
+
+        Returns:
+            str: Path of the written file
+        """
+        path = os.path.join(directory, f"run_{datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}.json")
+        write_json_atomic(path, self.to_dict(status, error, **extra))
+        for old in sorted(glob.glob(os.path.join(directory, "run_*.json")))[:-METRICS_KEEP_RUNS]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+        return path
+
+
+_run_metrics: Optional[RunMetrics] = None
+
+
+def get_run_metrics() -> RunMetrics:
+    """Process-wide metrics collector"""
+    global _run_metrics
+    if _run_metrics is None:
+        _run_metrics = RunMetrics()
+    return _run_metrics
+
+
+def span(name: str):
+    """Time a block under `name` in the process-wide collector"""
+    return get_run_metrics().span(name)
+
+
+def count(name: str, n: float = 1):
+    get_run_metrics().count(name, n)
+
+
+def timed(name: str):
+    """Decorator form of span()"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def instrument_methods(obj, prefix: str, names: List[str]):
+    """Wrap obj's methods in spans named '<prefix>.<method>' (in place)"""
+    for name in names:
+        setattr(obj, name, timed(f"{prefix}.{name}")(getattr(obj, name)))
+    return obj
+
+
+def load_run_metrics(limit: int = 50, directory: str = METRICS_DIR) -> List[Dict]:
+    """The most recent runs' metrics, oldest first (unreadable files skipped)"""
+    runs = []
+    for path in sorted(glob.glob(os.path.join(directory, "run_*.json")))[-limit:]:
+        try:
+            with open(path, 'r') as f:
+                runs.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return runs
@@ -0,0 +1,134 @@
+"""
+Opt-in Pipeline Profiler
+Runs the pipeline under cProfile (`src/main.py --profile`) and saves a pstats
+file plus a JSON summary of the hottest functions per run in data/profiles/
+
+Open a saved run in any pstats viewer, e.g.:
+    python -m pstats data/profiles/run_<timestamp>_<pid>.prof
+    snakeviz data/profiles/run_<timestamp>_<pid>.prof
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import cProfile
+import pstats
+from datetime import datetime
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from progress_reporter import write_json_atomic
+
+PROFILES_DIR = os.path.join("data", "profiles")
+PROFILE_KEEP_RUNS = 20
+
+# Functions kept in each summary ranking
+PROFILE_SUMMARY_TOP_N = 50
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _function_label(func: tuple) -> str:
+    """'module/path.py:123(name)', relative to the project or site-packages"""
+    filename, line, name = func
+    if filename == "~":  # builtins
+        return name
+    for prefix in [PROJECT_ROOT] + [path for path in sys.path if "packages" in path]:
+        if prefix and filename.startswith(prefix + os.sep):
+            filename = filename[len(prefix) + 1:]
+            break
+    return f"{filename}:{line}({name})"
+
+
+def summarize_stats(stats: pstats.Stats, sort: str = "cumulative",
+                    top_n: int = PROFILE_SUMMARY_TOP_N) -> List[Dict]:
+    """Top functions by cumulative or self ("tottime") time
+
+    Returns:
+        list: {function, calls, primitive_calls, self_seconds, cumulative_seconds}
+    """
+    key = {"cumulative": 3, "tottime": 2}[sort]
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][key], reverse=True)[:top_n]
+    return [
+        {"function": _function_label(func),
+         "calls": calls,
+         "primitive_calls": primitive_calls,
+         "self_seconds": round(self_time, 4),
+         "cumulative_seconds": round(cumulative, 4)}
+        for func, (primitive_calls, calls, self_time, cumulative, _) in rows
+    ]
+
+
+class PipelineProfiler:
+    """Deterministic profile of one pipeline run
+
+    Only the thread that calls start() is profiled; the write-queue and
+    Excel export threads show up as time waiting on them.
+    """
+
+    def __init__(self, directory: str = PROFILES_DIR):
+        self.directory = directory
+        self._profiler = cProfile.Profile()
+        self._started = None
+        self.seconds = None
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._profiler.enable()
+        return self
+
+    def stop(self):
+        self._profiler.disable()
+        self.seconds = round(time.perf_counter() - self._started, 3)
+
+    def save(self, status: str = "completed", **extra) -> str:
+        """Write <run>.prof (pstats) and <run>.json (summary), pruning old runs
+
+        Returns:
+            str: Path of the .prof file
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        stem = os.path.join(self.directory, f"run_{datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}")
+        self._profiler.dump_stats(f"{stem}.prof")
+
+        stats = pstats.Stats(self._profiler)
+        write_json_atomic(f"{stem}.json", {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "status": status,
+            "total_seconds": self.seconds,
+            "total_calls": stats.total_calls,
+            "prof_file": os.path.basename(f"{stem}.prof"),
+            "top_cumulative": summarize_stats(stats, "cumulative"),
+            "top_self": summarize_stats(stats, "tottime"),
+            **extra,
+        })
+
+        for old in sorted(glob.glob(os.path.join(self.directory, "run_*.json")))[:-PROFILE_KEEP_RUNS]:
+            for path in (old, old[:-len(".json")] + ".prof"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        return f"{stem}.prof"
+
+    def print_top(self, top_n: int = 15, sort: str = "tottime"):
+        print(f"\n🔬 Top {top_n} functions by {'self' if sort == 'tottime' else 'cumulative'} time:")
+        for row in summarize_stats(pstats.Stats(self._profiler), sort, top_n):
+            print(f"   {row['self_seconds']:8.3f}s self  {row['cumulative_seconds']:8.3f}s cum  "
+                  f"{row['calls']:>9,} calls  {row['function']}")
+
+
+def load_profile_summaries(limit: int = PROFILE_KEEP_RUNS, directory: str = PROFILES_DIR) -> List[Dict]:
+    """Saved profile summaries, newest first (each with its .prof path)"""
+    summaries = []
+    for path in sorted(glob.glob(os.path.join(directory, "run_*.json")), reverse=True)[:limit]:
+        try:
+            with open(path, 'r') as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            continue
+        summary["prof_path"] = os.path.join(directory, summary.get("prof_file", ""))
+        summaries.append(summary)
+    return summaries
@@ -0,0 +1,514 @@
+"""
+Run Queue & Scheduler for JobSniper
+Queues parameterized pipeline runs, launches them through BackgroundScraper
+with bounded concurrency, fires cron-style schedules and keeps run history
+"""
+
+import os
+import sys
+import json
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from background_scraper import BackgroundScraper, get_scraper
+
+RUN_QUEUE_FILE = os.path.join("data", "run_queue.db")
+RUNS_DIR = os.path.join("data", "runs")
+
+# Runs share the pipeline's CSV/history files, so more than one at a time is
+# only safe for runs that touch different stages
+MAX_CONCURRENT_RUNS = int(os.getenv("JOBSNIPER_MAX_CONCURRENT_RUNS", "1"))
+POLL_INTERVAL_SECONDS = 15
+RUN_HISTORY_KEEP = 200
+
+# A claimed run gets this long to write its PID file before it's reaped as failed
+LAUNCH_GRACE_SECONDS = 60
+
+# Mirrors STAGES and ON_DEMAND_STAGES in src/main.py
+STAGES = ["scrape", "audit", "track", "notify"]
+ON_DEMAND_STAGES = ["rescore"]
+STAGE_ORDER = ["scrape", "audit", "rescore", "track", "notify"]
+
+# Common run shapes offered by the dashboard
+RUN_PRESETS = {
+    "Full pipeline": STAGES,
+    "Scrape & audit only": ["scrape", "audit"],
+    "Audit only": ["audit"],
+    "Notify only": ["track", "notify"],
+    "Re-score stored jobs": ["rescore"],
+}
+
+RUN_QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    params TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT 'manual',
+    status TEXT NOT NULL DEFAULT 'queued',
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    duration_seconds REAL,
+    run_dir TEXT,
+    pid INTEGER,
+    jobs_scraped INTEGER,
+    jobs_verified INTEGER,
+    high_score_jobs INTEGER,
+    jobs_emailed INTEGER,
+    peak_rss_mb REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_status ON runs (status);
+
+CREATE TABLE IF NOT EXISTS schedules (
+    name TEXT PRIMARY KEY,
+    cron TEXT NOT NULL,
+    params TEXT NOT NULL,
+    enabled INTEGER NOT NULL DEFAULT 1,
+    last_fired TEXT,
+    created_at TEXT NOT NULL
+);
+"""
+
+# (min, max) for minute, hour, day of month, month, day of week (0 or 7 = Sunday)
+CRON_FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+def _parse_cron_field(field: str, low: int, high: int) -> set:
+    values = set()
+    for part in field.split(","):
+        expr, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if expr == "*":
+            start, end = low, high
+        elif "-" in expr:
+            start, end = (int(x) for x in expr.split("-", 1))
+        else:
+            start = int(expr)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError(f"'{part}' is out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+def parse_cron(expr: str) -> List[set]:
+    """Parse a 5-field cron expression ("minute hour day month weekday")
+
+    Supports *, lists (1,15), ranges (9-17) and steps (*/30, 9-17/2).
+
+    Raises:
+        ValueError: If the expression is malformed
+    """
+    fields = expr.split()
+    if len(fields) != 5:
+        raise ValueError("cron expression needs 5 fields: minute hour day month weekday")
+    minute, hour, day, month, weekday = [_parse_cron_field(f, low, high)
+                                         for f, (low, high) in zip(fields, CRON_FIELD_RANGES)]
+    # 7 is Sunday too
+    weekday = {0 if value == 7 else value for value in weekday}
+    return [minute, hour, day, month, weekday]
+
+
+def cron_matches(expr: str, when: datetime) -> bool:
+    """Check whether a cron expression fires at the given minute
+
+    As in standard cron, when both day-of-month and weekday are restricted
+    (neither starts with *), either one matching is enough.
+    """
+    minute, hour, day, month, weekday = parse_cron(expr)
+    day_matches = when.day in day
+    weekday_matches = (when.weekday() + 1) % 7 in weekday
+    day_field, weekday_field = expr.split()[2], expr.split()[4]
+    if day_field.startswith("*") or weekday_field.startswith("*"):
+        day_ok = day_matches and weekday_matches
+    else:
+        day_ok = day_matches or weekday_matches
+    return when.minute in minute and when.hour in hour and when.month in month and day_ok
+
+
+def normalize_params(params: Optional[Dict] = None) -> Dict:
+    """Validate run parameters
+
+    Args:
+        params: {"queries", "locations", "sites": list or None (= all),
+                 "stages": list of STAGES/ON_DEMAND_STAGES (default STAGES),
+                 "profile": run under the profiler (default False)}
+
+    Raises:
+        ValueError: On unknown stages or an empty stage list
+    """
+    params = params or {}
+    stages = [s for s in STAGE_ORDER if s in (params.get("stages") or STAGES)]
+    unknown = set(params.get("stages") or []) - set(STAGE_ORDER)
+    if unknown or not stages:
+        raise ValueError(f"stages must be a non-empty subset of {STAGE_ORDER}")
+    return {
+        "queries": list(params.get("queries") or []) or None,
+        "locations": list(params.get("locations") or []) or None,
+        "sites": list(params.get("sites") or []) or None,
+        "stages": stages,
+        "profile": bool(params.get("profile")),
+    }
+
+
+def build_run_args(params: Dict) -> List[str]:
+    """Translate run parameters into src/main.py command-line arguments"""
+    args = []
+    for key in ("queries", "locations", "sites"):
+        if params.get(key):
+            args += [f"--{key}"] + list(params[key])
+    if params.get("stages") and params["stages"] != STAGES:
+        args += ["--stages"] + list(params["stages"])
+    if params.get("profile"):
+        args.append("--profile")
+    return args
+
+
+def describe_params(params: Dict) -> str:
+    """Short human-readable summary of a run's parameters"""
+    parts = []
+    if params.get("stages") and params["stages"] != STAGES:
+        parts.append("+".join(params["stages"]))
+    for key in ("queries", "locations", "sites"):
+        if params.get(key):
+            parts.append(f"{len(params[key])} {key}")
+    description = ", ".join(parts) or "full sweep"
+    return f"{description}, profiled" if params.get("profile") else description
+
+
+class RunQueue:
+    """Persistent queue of pipeline runs plus cron-style schedules
+
+    Each run gets its own directory under data/runs/<id>/ holding the
+    BackgroundScraper progress, PID and log files. tick() reaps finished runs
+    (recording duration and yields), enqueues due schedules and starts queued
+    runs while fewer than max_concurrency are active. A manual run started
+    from the dashboard counts against the limit.
+    """
+
+    def __init__(self, db_path: str = RUN_QUEUE_FILE,
+                 runs_dir: str = RUNS_DIR,
+                 max_concurrency: int = MAX_CONCURRENT_RUNS,
+                 poll_interval: float = POLL_INTERVAL_SECONDS):
+        self.db_path = db_path
+        self.runs_dir = runs_dir
+        self.max_concurrency = max(1, max_concurrency)
+        self.poll_interval = poll_interval
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(RUN_QUEUE_SCHEMA)
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(runs)")}
+        if "peak_rss_mb" not in columns:
+            self.conn.execute("ALTER TABLE runs ADD COLUMN peak_rss_mb REAL")
+
+        self._stopped = threading.Event()
+        self._thread = None
+
+    # --- Runs ---
+    def enqueue(self, params: Optional[Dict] = None, source: str = "manual") -> int:
+        """Queue a run
+
+        Returns:
+            int: The new run id
+        """
+        params = normalize_params(params)
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (params, source, created_at) VALUES (?, ?, ?)",
+                (json.dumps(params), source, datetime.now().isoformat())
+            )
+        return cursor.lastrowid
+
+    def cancel(self, run_id: int) -> bool:
+        """Cancel a queued run or stop a running one
+
+        Returns:
+            bool: True if the run was queued or running
+        """
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+            if row is None or row["status"] not in ("queued", "running"):
+                return False
+            if row["status"] == "running":
+                BackgroundScraper(row["run_dir"]).stop()
+                self._finish(row)
+            else:
+                with self.conn:
+                    self.conn.execute(
+                        "UPDATE runs SET status = 'cancelled', finished_at = ? WHERE id = ?",
+                        (datetime.now().isoformat(), run_id)
+                    )
+        return True
+
+    def list_runs(self, limit: int = 50) -> List[Dict]:
+        """Most recent runs first; running runs include live phase/step/ETA"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM runs ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        runs = []
+        for row in rows:
+            run = dict(row)
+            run["params"] = json.loads(run["params"])
+            if run["status"] == "running" and run["run_dir"]:
+                progress = BackgroundScraper(run["run_dir"]).get_progress()
+                for key in ("phase", "step", "total_steps", "eta_seconds",
+                            "jobs_scraped", "jobs_verified", "high_score_jobs", "jobs_emailed",
+                            "peak_rss_mb"):
+                    if progress.get(key) is not None:
+                        run[key] = progress[key]
+            runs.append(run)
+        return runs
+
+    def running_count(self) -> int:
+        """Queued runs currently executing"""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM runs WHERE status = 'running'").fetchone()[0]
+
+    def active_count(self) -> int:
+        with self._lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM runs WHERE status IN ('queued', 'running')"
+            ).fetchone()[0]
+
+    # --- Schedules ---
+    def add_schedule(self, name: str, cron: str, params: Optional[Dict] = None, enabled: bool = True):
+        """Create or replace a named schedule
+
+        Raises:
+            ValueError: If the cron expression or parameters are invalid
+        """
+        parse_cron(cron)
+        params = normalize_params(params)
+        with self._lock, self.conn:
+            self.conn.execute(
+                """INSERT INTO schedules (name, cron, params, enabled, created_at) VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(name) DO UPDATE SET cron = excluded.cron, params = excluded.params,
+                                                   enabled = excluded.enabled""",
+                (name, cron, json.dumps(params), int(enabled), datetime.now().isoformat())
+            )
+
+    def remove_schedule(self, name: str):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM schedules WHERE name = ?", (name,))
+
+    def set_schedule_enabled(self, name: str, enabled: bool):
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE schedules SET enabled = ? WHERE name = ?", (int(enabled), name))
+
+    def list_schedules(self) -> List[Dict]:
+        with self._lock:
+            rows = self.conn.execute("SELECT * FROM schedules ORDER BY name").fetchall()
+        schedules = []
+        for row in rows:
+            schedule = dict(row)
+            schedule["params"] = json.loads(schedule["params"])
+            schedule["enabled"] = bool(schedule["enabled"])
+            schedules.append(schedule)
+        return schedules
+
+    # --- Dispatching ---
+    def tick(self, now: Optional[datetime] = None):
+        """Reap finished runs, fire due schedules and start queued runs"""
+        now = now or datetime.now()
+        with self._lock:
+            reaped = self._reap()
+            self._fire_schedules(now)
+            self._dispatch()
+            if reaped:
+                self._prune()
+
+    def _reap(self) -> int:
+        running = self.conn.execute("SELECT * FROM runs WHERE status = 'running'").fetchall()
+        reaped = 0
+        for row in running:
+            if row["pid"] is None and self._launching(row):
+                continue  # claimed by a dispatcher that is starting it now
+            if not BackgroundScraper(row["run_dir"]).is_running():
+                reaped += self._finish(row)
+        return reaped
+
+    @staticmethod
+    def _launching(row) -> bool:
+        try:
+            started = datetime.fromisoformat(row["started_at"])
+        except (TypeError, ValueError):
+            return False
+        return (datetime.now() - started).total_seconds() < LAUNCH_GRACE_SECONDS
+
+    def _finish(self, row) -> bool:
+        """Record the outcome of a run whose process has exited
+
+        Returns:
+            bool: False if another dispatcher already recorded it
+        """
+        progress = BackgroundScraper(row["run_dir"]).get_progress()
+        status = progress.get("status")
+        if status not in ("completed", "cancelled"):
+            status = "failed"
+        error = progress.get("error") or (None if status != "failed" else "Process exited before completing")
+
+        finished_at = datetime.now()
+        try:
+            duration = (finished_at - datetime.fromisoformat(row["started_at"])).total_seconds()
+        except (TypeError, ValueError):
+            duration = None
+
+        with self.conn:
+            cursor = self.conn.execute(
+                """UPDATE runs SET status = ?, finished_at = ?, duration_seconds = ?, error = ?,
+                          jobs_scraped = ?, jobs_verified = ?, high_score_jobs = ?, jobs_emailed = ?,
+                          peak_rss_mb = ?
+                   WHERE id = ? AND status = 'running'""",
+                (status, finished_at.isoformat(), duration, error,
+                 progress.get("jobs_scraped"), progress.get("jobs_verified"),
+                 progress.get("high_score_jobs"), progress.get("jobs_emailed"),
+                 progress.get("peak_rss_mb"), row["id"])
+            )
+        if cursor.rowcount != 1:
+            return False
+        print(f"🏁 Run #{row['id']} {status}")
+        return True
+
+    def _fire_schedules(self, now: datetime):
+        minute = now.replace(second=0, microsecond=0).isoformat()
+        for schedule in self.conn.execute("SELECT * FROM schedules WHERE enabled = 1").fetchall():
+            if schedule["last_fired"] == minute:
+                continue
+            try:
+                if not cron_matches(schedule["cron"], now):
+                    continue
+            except ValueError as e:
+                print(f"⚠️ Schedule '{schedule['name']}' has an invalid cron expression: {e}")
+                continue
+
+            source = f"schedule:{schedule['name']}"
+            # Compare-and-set: only the dispatcher that records this minute fires it
+            with self.conn:
+                claimed = self.conn.execute(
+                    """UPDATE schedules SET last_fired = ?
+                       WHERE name = ? AND (last_fired IS NULL OR last_fired != ?)""",
+                    (minute, schedule["name"], minute)
+                ).rowcount == 1
+            if not claimed:
+                continue
+            # Don't pile up runs if the previous one is still queued or running
+            pending = self.conn.execute(
+                "SELECT 1 FROM runs WHERE source = ? AND status IN ('queued', 'running')", (source,)
+            ).fetchone()
+            if pending:
+                continue
+            run_id = self.enqueue(json.loads(schedule["params"]), source=source)
+            print(f"🗓️ Schedule '{schedule['name']}' queued run #{run_id}")
+
+    def _dispatch(self):
+        running = self.conn.execute("SELECT COUNT(*) FROM runs WHERE status = 'running'").fetchone()[0]
+        if get_scraper().is_running():
+            running += 1
+        slots = self.max_concurrency - running
+        if slots <= 0:
+            return
+
+        queued = self.conn.execute(
+            "SELECT * FROM runs WHERE status = 'queued' ORDER BY id LIMIT ?", (slots,)
+        ).fetchall()
+        for row in queued:
+            run_dir = os.path.join(self.runs_dir, str(row["id"]))
+            # Claim the run before starting it; the dashboard and a headless
+            # dispatcher may both be polling this queue
+            with self.conn:
+                claimed = self.conn.execute(
+                    "UPDATE runs SET status = 'running', started_at = ?, run_dir = ? WHERE id = ? AND status = 'queued'",
+                    (datetime.now().isoformat(), run_dir, row["id"])
+                ).rowcount == 1
+            if not claimed:
+                continue
+
+            result = BackgroundScraper(run_dir).start(build_run_args(json.loads(row["params"])))
+            with self.conn:
+                if result["success"]:
+                    recorded = self.conn.execute(
+                        "UPDATE runs SET pid = ? WHERE id = ? AND status = 'running'", (result["pid"], row["id"])
+                    ).rowcount == 1
+                    if recorded:
+                        print(f"🚀 Started run #{row['id']} ({describe_params(json.loads(row['params']))})")
+                    else:
+                        # Cancelled while it was starting
+                        BackgroundScraper(run_dir).stop()
+                else:
+                    self.conn.execute(
+                        "UPDATE runs SET status = 'failed', finished_at = ?, error = ? WHERE id = ?",
+                        (datetime.now().isoformat(), result["error"], row["id"])
+                    )
+
+    def _prune(self, keep: int = RUN_HISTORY_KEEP):
+        """Drop finished runs (and their log directories) beyond the newest `keep`"""
+        old = self.conn.execute(
+            """SELECT id, run_dir FROM runs WHERE status NOT IN ('queued', 'running')
+               ORDER BY id DESC LIMIT -1 OFFSET ?""", (keep,)
+        ).fetchall()
+        if not old:
+            return
+        for row in old:
+            if row["run_dir"]:
+                shutil.rmtree(row["run_dir"], ignore_errors=True)
+        with self.conn:
+            self.conn.executemany("DELETE FROM runs WHERE id = ?", [(row["id"],) for row in old])
+
+    # --- Background loop ---
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"⚠️ Run queue tick failed: {e}")
+            # Wake at least once a minute so no cron minute is skipped
+            self._stopped.wait(min(self.poll_interval, 30))
+
+    def start(self):
+        """Start the background dispatcher thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="jobsniper-run-queue", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+
+# Singleton instance
+_run_queue = None
+_run_queue_lock = threading.Lock()
+
+def get_run_queue():
+    """Get the singleton run queue, starting its dispatcher on first use"""
+    global _run_queue
+    with _run_queue_lock:
+        if _run_queue is None:
+            _run_queue = RunQueue()
+            _run_queue.start()
+    return _run_queue
+
+
+if __name__ == "__main__":
+    # Headless dispatcher: python src/modules/run_queue.py
+    queue = RunQueue()
+    print(f"🗓️ Run queue dispatcher started (max {queue.max_concurrency} concurrent run(s))")
+    try:
+        while True:
+            queue.tick()
+            time.sleep(min(queue.poll_interval, 30))
+    except KeyboardInterrupt:
+        print("\n👋 Dispatcher stopped")
@@ -0,0 +1,198 @@
+"""
+Scrape Archive for JobSniper
+Appends every scrape to a Parquet dataset under data/archive/, partitioned
+as date=YYYY-MM-DD/site=<board>/, and reads it back with partition and
+column pruning so later analysis or re-scoring never has to re-scrape
+"""
+
+import os
+import math
+import uuid
+from datetime import date, datetime
+from typing import List, Optional, Union
+
+import pandas as pd
+
+ARCHIVE_DIR = os.path.join("data", "archive")
+
+# Low-cardinality text columns stored dictionary-encoded
+CATEGORICAL_COLUMNS = [
+    "site", "company", "location", "job_type", "interval", "currency",
+    "job_level", "listing_type", "company_industry", "search_query",
+    "location_searched",
+]
+
+# jobspy columns whose type varies by board and run, always stored as text
+# (date_posted is a date from some boards and a string from others)
+TEXT_COLUMNS = ["date_posted"]
+
+# Long text compressed harder than the rest of the columns
+HEAVY_TEXT_COLUMNS = ["description", "company_description"]
+COMPRESSION = "zstd"
+HEAVY_TEXT_COMPRESSION_LEVEL = 9
+
+# Values jobspy can return that Parquet can store as-is
+_NATIVE_TYPES = {"boolean", "integer", "floating", "mixed-integer-float",
+                 "date", "datetime", "datetime64", "empty"}
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        return pyarrow
+    except ImportError:
+        raise ImportError("pyarrow is required for the scrape archive: pip install pyarrow")
+
+
+def _partitioning(pa):
+    return pa.dataset.partitioning(pa.schema([("date", pa.string()), ("site", pa.string())]),
+                                   flavor="hive")
+
+
+def _to_text(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return str(value)
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Give every column a Parquet-friendly, run-to-run stable type"""
+    df = df.copy()
+    for column in df.columns:
+        if column in TEXT_COLUMNS or (df[column].dtype == object and
+                                      pd.api.types.infer_dtype(df[column], skipna=True) not in _NATIVE_TYPES):
+            df[column] = df[column].map(_to_text)
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns and column != "site":
+            df[column] = df[column].map(_to_text).astype("category")
+    return df
+
+
+def archive_scrape(df: pd.DataFrame, scraped_at: Optional[datetime] = None,
+                   root: str = ARCHIVE_DIR) -> int:
+    """Append one scrape's jobs to the archive
+
+    Args:
+        df: Jobs as returned by run_extraction (jobspy columns)
+        scraped_at: Run timestamp; decides the date partition (default now)
+        root: Archive directory
+
+    Returns:
+        int: Number of rows written
+    """
+    if df is None or len(df) == 0:
+        return 0
+    pa = _pyarrow()
+    scraped_at = scraped_at or datetime.now()
+    run_id = f"{scraped_at.strftime('%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+    df = _normalize(df)
+    df["scraped_at"] = pd.Timestamp(scraped_at)
+    df["date"] = scraped_at.strftime("%Y-%m-%d")
+    df["site"] = df["site"].map(_to_text).fillna("unknown") if "site" in df.columns else "unknown"
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    file_format = pa.dataset.ParquetFileFormat()
+    options = file_format.make_write_options(
+        compression=COMPRESSION,
+        compression_level={column: HEAVY_TEXT_COMPRESSION_LEVEL
+                           for column in HEAVY_TEXT_COLUMNS if column in df.columns} or None,
+        use_dictionary=[column for column in CATEGORICAL_COLUMNS if column in df.columns],
+    )
+    os.makedirs(root, exist_ok=True)
+    pa.dataset.write_dataset(
+        table, root,
+        format=file_format,
+        file_options=options,
+        partitioning=_partitioning(pa),
+        basename_template=f"part-{run_id}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+    return len(df)
+
+
+def _unify_schemas(pa, schemas: list):
+    """Union of the files' schemas; columns whose types can't be merged
+    (e.g. written before a type was pinned) are read back as text"""
+    try:
+        return pa.unify_schemas(schemas, promote_options="permissive")
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        pass
+    fields = {}
+    for schema in schemas:
+        for field in schema:
+            if field.name not in fields:
+                fields[field.name] = field
+                continue
+            try:
+                fields[field.name] = pa.unify_schemas([pa.schema([fields[field.name]]), pa.schema([field])],
+                                                      promote_options="permissive").field(0)
+            except (pa.ArrowTypeError, pa.ArrowInvalid):
+                fields[field.name] = pa.field(field.name, pa.large_string())
+    return pa.schema(list(fields.values()))
+
+
+def _as_date_text(value: Union[str, date, datetime, None]) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    return str(value)[:10]
+
+
+def read_archive(columns: Optional[List[str]] = None,
+                 start_date: Union[str, date, None] = None,
+                 end_date: Union[str, date, None] = None,
+                 sites: Optional[List[str]] = None,
+                 companies: Optional[List[str]] = None,
+                 root: str = ARCHIVE_DIR) -> pd.DataFrame:
+    """Load archived jobs, reading only the partitions and columns needed
+
+    Date and site filters prune whole partition directories; the company
+    filter is pushed down to the Parquet row groups.
+
+    Args:
+        columns: Columns to load (default: all); "date" and "site" are
+            always available
+        start_date, end_date: Inclusive scrape-date range
+        sites: Only these job boards
+        companies: Only these companies (exact match)
+
+    Returns:
+        DataFrame: Matching jobs (empty if the archive doesn't exist yet)
+    """
+    if not os.path.isdir(root):
+        return pd.DataFrame(columns=columns or [])
+    pa = _pyarrow()
+    field = pa.dataset.field
+
+    dataset = pa.dataset.dataset(root, format="parquet", partitioning=_partitioning(pa))
+    partition_filter = None
+    for condition in [
+        field("date") >= _as_date_text(start_date) if start_date else None,
+        field("date") <= _as_date_text(end_date) if end_date else None,
+        field("site").isin(sites) if sites else None,
+    ]:
+        if condition is not None:
+            partition_filter = condition if partition_filter is None else partition_filter & condition
+
+    fragments = list(dataset.get_fragments(filter=partition_filter))
+    if not fragments:
+        return pd.DataFrame(columns=columns or [])
+
+    # Runs may differ in columns; read against the union of the matching files only
+    schema = _unify_schemas(pa, [fragment.physical_schema for fragment in fragments]
+                            + [_partitioning(pa).schema])
+    dataset = pa.dataset.dataset([fragment.path for fragment in fragments], schema=schema,
+                                 format="parquet", partitioning=_partitioning(pa),
+                                 partition_base_dir=root)
+
+    row_filter = partition_filter
+    if companies:
+        company_filter = field("company").isin(companies)
+        row_filter = company_filter if row_filter is None else row_filter & company_filter
+
+    if columns is not None:
+        columns = [column for column in columns if column in schema.names]
+    return dataset.to_table(columns=columns, filter=row_filter).to_pandas()
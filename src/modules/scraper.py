@@ -1,41 +1,84 @@
 import pandas as pd
+import os
+import sys
 import time
 import random
 from jobspy import scrape_jobs
 from config import settings
 import logging
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from progress_reporter import start_phase, report_progress
+from scrape_archive import archive_scrape
+from run_metrics import span, count
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def run_extraction():
+# Random pause before each board request (seconds), to be polite to the sites
+REQUEST_DELAY_SECONDS = (2, 4)
+
+def deduplicate_jobs(jobs_df):
+    """Drop repeat postings (same company + title), keeping the longest description
+    
+    Returns:
+        tuple: (deduplicated DataFrame, number of duplicates removed)
+    """
+    jobs_df = jobs_df.copy()
+    jobs_df['norm_company'] = jobs_df['company'].astype(str).str.lower().str.strip()
+    jobs_df['norm_title'] = jobs_df['title'].astype(str).str.lower().str.strip()
+    jobs_df['desc_len'] = jobs_df['description'].str.len()
+    jobs_df = jobs_df.sort_values('desc_len', ascending=False)
+    
+    before_dedup = len(jobs_df)
+    jobs_df = jobs_df.drop_duplicates(subset=['norm_company', 'norm_title'], keep='first')
+    jobs_df = jobs_df.drop(columns=['norm_company', 'norm_title', 'desc_len'])
+    return jobs_df, before_dedup - len(jobs_df)
+
+def run_extraction(queries=None, locations=None, sites=None):
+    """Scrape every query x location x site combination
+    
+    Args:
+        queries, locations, sites: Optional subsets to search; each
+            defaults to the full list from config/settings.py
+    """
+    queries = queries or settings.SEARCH_QUERIES
+    locations = locations or settings.LOCATIONS
+    sites = sites or settings.TARGET_SITES
     all_jobs = []
     
     print(f"🚀 Starting Extraction Engine (Multi-Location Mode)...")
-    print(f"🎯 Sites: {settings.TARGET_SITES}")
-    print(f"🌍 Locations: {settings.LOCATIONS}")
+    print(f"🎯 Sites: {sites}")
+    print(f"🌍 Locations: {locations}")
+    
+    total_combinations = len(queries) * len(locations) * len(sites)
+    start_phase("scraping", total_combinations)
+    combination = 0
+    jobs_found = 0
     
     # 1. Loop through SEARCH QUERIES
-    for query in settings.SEARCH_QUERIES:
+    for query in queries:
         print(f"\n🔎 Query: '{query}'")
         
         # 2. Loop through LOCATIONS (The Fix)
-        for loc in settings.LOCATIONS:
+        for loc in locations:
             print(f"   📍 Checking {loc}...", end="")
             
             # 3. Loop through SITES
-            for site in settings.TARGET_SITES:
+            for site in sites:
                 try:
                     # Random delay to be safe
-                    time.sleep(random.uniform(2, 4))
+                    with span("scrape.delay"):
+                        time.sleep(random.uniform(*REQUEST_DELAY_SECONDS))
                     
-                    jobs = scrape_jobs(
-                        site_name=[site],
-                        search_term=query,
-                        location=loc,  # <--- FIXED: Uses the loop variable, not [0]
-                        results_wanted=settings.RESULTS_WANTED,
-                        hours_old=settings.HOURS_OLD, 
-                        country_ind=settings.COUNTRY, 
-                    )
+                    with span(f"scrape.site.{site}"):
+                        jobs = scrape_jobs(
+                            site_name=[site],
+                            search_term=query,
+                            location=loc,  # <--- FIXED: Uses the loop variable, not [0]
+                            results_wanted=settings.RESULTS_WANTED,
+                            hours_old=settings.HOURS_OLD, 
+                            country_ind=settings.COUNTRY, 
+                        )
                     
                     if not jobs.empty:
                         # Clean empty descriptions immediately
@@ -46,11 +89,17 @@ def run_extraction():
                             jobs['search_query'] = query
                             jobs['location_searched'] = loc
                             all_jobs.append(jobs)
+                            jobs_found += len(jobs)
+                            count(f"jobs_scraped.{site}", len(jobs))
                             print(f" [Found {len(jobs)} on {site}]", end="")
                             
                 except Exception as e:
                     # Errors are expected on some site/location combos, just skip
-                    continue
+                    count(f"scrape_errors.{site}")
+                finally:
+                    combination += 1
+                    report_progress(step=combination, jobs_scraped=jobs_found,
+                                    current_search=f"{query} @ {loc} ({site})")
             print("") # New line after location is done
 
     # Combine and Deduplicate
@@ -58,19 +107,22 @@ def run_extraction():
         master_df = pd.concat(all_jobs, ignore_index=True)
         
         # SMART DEDUPLICATION
-        master_df['norm_company'] = master_df['company'].astype(str).str.lower().str.strip()
-        master_df['norm_title'] = master_df['title'].astype(str).str.lower().str.strip()
-        master_df['desc_len'] = master_df['description'].str.len()
-        master_df = master_df.sort_values('desc_len', ascending=False)
-        
         before_dedup = len(master_df)
-        master_df = master_df.drop_duplicates(subset=['norm_company', 'norm_title'], keep='first')
-        master_df = master_df.drop(columns=['norm_company', 'norm_title', 'desc_len'])
-        
-        dupes_removed = before_dedup - len(master_df)
+        with span("scrape.dedup"):
+            master_df, dupes_removed = deduplicate_jobs(master_df)
         
         filename = f"{settings.DATA_DIR}/jobs_latest.csv"
-        master_df.to_csv(filename, index=False)
+        with span("scrape.save_csv"):
+            master_df.to_csv(filename, index=False)
+        
+        # Keep every run's raw jobs (jobs_latest.csv only holds the last one)
+        try:
+            with span("scrape.archive"):
+                archived = archive_scrape(master_df)
+            print(f"\n🗄️ Archived {archived} jobs to data/archive/")
+        except Exception as e:
+            print(f"\n⚠️ Could not archive scrape: {e}")
+        report_progress(jobs_scraped=len(master_df), current_search=None)
         print(f"\n✨ Scrape Complete.")
         print(f"   - Raw Jobs Found: {before_dedup}")
         print(f"   - Duplicates Removed: {dupes_removed}")
@@ -78,4 +130,5 @@ def run_extraction():
         return master_df
     else:
         print("\n😔 No jobs found on any site/location.")
+        report_progress(jobs_scraped=0, current_search=None)
         return pd.DataFrame()
\ No newline at end of file
@@ -0,0 +1,201 @@
+"""
+Job Search Index for JobSniper
+SQLite FTS5 index over audited postings (title, company, description and
+match reason), updated by the auditor and queried by the dashboard
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+SEARCH_INDEX_FILE = os.path.join("data", "search_index.db")
+
+# Seed source for an empty index
+VERIFIED_JOBS_FILE = os.path.join("data", "verified", "verified_jobs.csv")
+
+# bm25 column weights: title, company, description, match_reason
+RANK_WEIGHTS = (5.0, 3.0, 1.0, 2.0)
+
+SEARCH_SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    id INTEGER PRIMARY KEY,
+    job_url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    company TEXT,
+    description TEXT,
+    match_reason TEXT,
+    location TEXT,
+    work_mode TEXT,
+    duration TEXT,
+    relevance_score REAL,
+    indexed_at TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS postings_fts USING fts5(
+    title, company, description, match_reason,
+    content='postings', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS postings_ai AFTER INSERT ON postings BEGIN
+    INSERT INTO postings_fts (rowid, title, company, description, match_reason)
+    VALUES (new.id, new.title, new.company, new.description, new.match_reason);
+END;
+CREATE TRIGGER IF NOT EXISTS postings_ad AFTER DELETE ON postings BEGIN
+    INSERT INTO postings_fts (postings_fts, rowid, title, company, description, match_reason)
+    VALUES ('delete', old.id, old.title, old.company, old.description, old.match_reason);
+END;
+CREATE TRIGGER IF NOT EXISTS postings_au AFTER UPDATE ON postings BEGIN
+    INSERT INTO postings_fts (postings_fts, rowid, title, company, description, match_reason)
+    VALUES ('delete', old.id, old.title, old.company, old.description, old.match_reason);
+    INSERT INTO postings_fts (rowid, title, company, description, match_reason)
+    VALUES (new.id, new.title, new.company, new.description, new.match_reason);
+END;
+"""
+
+POSTING_FIELDS = ["title", "company", "description", "match_reason",
+                  "location", "work_mode", "duration", "relevance_score"]
+
+
+def _value(value):
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    return value
+
+
+def build_match_query(text: str) -> Optional[str]:
+    """Turn free text into an FTS5 query
+
+    Words are ANDed and prefix-matched; "quoted phrases" stay phrases. FTS
+    operators typed by the user are treated as plain words.
+    """
+    terms = []
+    for phrase, word in re.findall(r'"([^"]+)"|(\S+)', text):
+        if phrase:
+            tokens = re.findall(r"\w+", phrase)
+            if tokens:
+                terms.append('"' + " ".join(tokens) + '"')
+        else:
+            terms.extend(f'"{token}"*' for token in re.findall(r"\w+", word))
+    return " ".join(terms) or None
+
+
+class JobSearchIndex:
+    """Full-text index of audited job postings, keyed by job URL"""
+
+    def __init__(self, db_path: str = SEARCH_INDEX_FILE):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SEARCH_SCHEMA)
+
+    def add_postings(self, postings: Iterable[Dict]) -> int:
+        """Insert or refresh postings (dicts with job_url plus POSTING_FIELDS)
+
+        Returns:
+            int: Number of postings written
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        rows = []
+        for posting in postings:
+            job_url = _value(posting.get("job_url"))
+            if not job_url:
+                continue
+            row = {field: _value(posting.get(field)) for field in POSTING_FIELDS}
+            row["job_url"] = str(job_url)
+            row["indexed_at"] = now
+            rows.append(row)
+        if not rows:
+            return 0
+
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO postings (job_url, title, company, description, match_reason, "
+                "location, work_mode, duration, relevance_score, indexed_at) "
+                "VALUES (:job_url, :title, :company, :description, :match_reason, "
+                ":location, :work_mode, :duration, :relevance_score, :indexed_at) "
+                "ON CONFLICT (job_url) DO UPDATE SET title = excluded.title, "
+                "company = excluded.company, description = excluded.description, "
+                "match_reason = excluded.match_reason, location = excluded.location, "
+                "work_mode = excluded.work_mode, duration = excluded.duration, "
+                "relevance_score = excluded.relevance_score, indexed_at = excluded.indexed_at",
+                rows
+            )
+        return len(rows)
+
+    def add_dataframe(self, df: pd.DataFrame) -> int:
+        if df is None or len(df) == 0 or "job_url" not in df.columns:
+            return 0
+        return self.add_postings(df.to_dict("records"))
+
+    def postings(self) -> pd.DataFrame:
+        """Every indexed posting (job_url plus POSTING_FIELDS)"""
+        with self._lock:
+            return pd.read_sql_query(
+                f"SELECT job_url, {', '.join(POSTING_FIELDS)} FROM postings", self.conn
+            )
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+
+    def search(self, text: str, limit: int = 50, min_score: Optional[float] = None,
+               work_mode: Optional[str] = None) -> List[Dict]:
+        """Ranked postings matching free text
+
+        Args:
+            text: Search words / "phrases"
+            limit: Maximum number of hits
+            min_score: Only postings scored at least this
+            work_mode: Only postings with this work mode
+
+        Returns:
+            list: Posting dicts, best match first, each with a "snippet"
+            (matched terms wrapped in **) and a "rank" (lower is better)
+        """
+        match = build_match_query(text)
+        if not match:
+            return []
+
+        sql = (
+            "SELECT p.*, bm25(postings_fts, ?, ?, ?, ?) AS rank, "
+            "snippet(postings_fts, -1, '**', '**', ' … ', 16) AS snippet "
+            "FROM postings_fts JOIN postings p ON p.id = postings_fts.rowid "
+            "WHERE postings_fts MATCH ?"
+        )
+        params = [*RANK_WEIGHTS, match]
+        if min_score is not None:
+            sql += " AND p.relevance_score >= ?"
+            params.append(min_score)
+        if work_mode:
+            sql += " AND p.work_mode = ?"
+            params.append(work_mode)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, params).fetchall()]
+
+
+# Shared index per process
+_index: Optional[JobSearchIndex] = None
+_index_lock = threading.Lock()
+
+def get_search_index() -> JobSearchIndex:
+    """Get the shared index, seeding it from verified_jobs.csv when empty"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = JobSearchIndex()
+            if _index.count() == 0 and os.path.exists(VERIFIED_JOBS_FILE):
+                try:
+                    added = _index.add_dataframe(pd.read_csv(VERIFIED_JOBS_FILE))
+                    print(f"🔎 Indexed {added} postings from {VERIFIED_JOBS_FILE}")
+                except Exception as e:
+                    print(f"⚠️ Could not seed search index: {e}")
+        return _index
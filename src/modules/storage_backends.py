@@ -0,0 +1,578 @@
+"""
+Storage Backends for JobSniper Application Tracker
+Common interface over the Supabase cloud database and an embedded SQLite file
+"""
+
+import os
+import sys
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import List, Dict, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from run_metrics import instrument_methods
+
+# Default location of the embedded database (override with SQLITE_DB_PATH)
+SQLITE_DB_PATH = os.path.join("data", "jobsniper.db")
+
+# Supabase HTTP settings: one keep-alive connection pool shared by all calls
+SUPABASE_TIMEOUT = 15  # seconds
+SUPABASE_MAX_CONNECTIONS = 10
+
+# How long a connection health check result is reused
+HEALTH_TTL = 60  # seconds
+
+# Rows per bulk write, and links per lookup (links travel in the PostgREST URL)
+BULK_WRITE_CHUNK = 500
+LINK_LOOKUP_CHUNK = 50
+
+# Backend calls timed as "db.<method>" spans in the run metrics (one round-trip each)
+TIMED_METHODS = ["ping", "insert_job", "fetch_jobs", "find_job_id", "fetch_jobs_by_ids",
+                 "fetch_jobs_by_links", "query_jobs", "update_job", "update_jobs", "delete_job",
+                 "delete_jobs_by_ids", "delete_all", "fetch_jobs_page", "id_bounds",
+                 "delete_jobs", "status_summary"]
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    company TEXT,
+    role TEXT,
+    location TEXT,
+    duration TEXT,
+    link TEXT NOT NULL,
+    match_score REAL,
+    status TEXT NOT NULL DEFAULT 'Not Applied',
+    notes TEXT,
+    date_found TEXT,
+    date_updated TEXT,
+    date_applied TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_link ON jobs(link);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+CREATE INDEX IF NOT EXISTS idx_jobs_date_found ON jobs(date_found DESC, match_score DESC);
+"""
+
+
+class StorageBackend(ABC):
+    """Interface implemented by every tracker storage backend
+
+    Abstract methods must be implemented (a backend missing one fails when
+    it is created); the rest have generic defaults. Methods raise on
+    failure; db_manager turns errors into its usual printed message and
+    False/empty return values.
+    """
+
+    name = "base"
+    label = "Database"
+
+    @abstractmethod
+    def ping(self) -> bool:
+        """Cheap round-trip used as a connection/health check"""
+
+    @abstractmethod
+    def insert_job(self, job_data: Dict) -> Optional[int]:
+        """Insert one job row (raises on duplicate link) and return its id"""
+
+    @abstractmethod
+    def fetch_jobs(self, status: Optional[str] = None) -> List[Dict]:
+        """Return job rows, newest first, optionally filtered by status"""
+
+    @abstractmethod
+    def find_job_id(self, link: str) -> Optional[int]:
+        """Return the id of the job with the given link, if any"""
+
+    def fetch_jobs_by_ids(self, job_ids: List[int]) -> List[Dict]:
+        """Return the rows for the given job ids"""
+        wanted = set(job_ids)
+        return [row for row in self.fetch_jobs() if row.get('id') in wanted]
+
+    def fetch_jobs_by_links(self, links: List[str]) -> List[Dict]:
+        """Return the rows whose link is in `links`"""
+        wanted = set(links)
+        return [row for row in self.fetch_jobs() if row.get('link') in wanted]
+
+    def query_jobs(self, status: Optional[str] = None, search: Optional[str] = None,
+                   min_score: Optional[float] = None,
+                   offset: int = 0, limit: int = 50) -> Tuple[List[Dict], int]:
+        """Return one page of filtered jobs (newest first) and the total match count
+
+        Args:
+            status: Exact status to match
+            search: Case-insensitive substring of company or role
+            min_score: Minimum match_score
+        """
+        rows = self.fetch_jobs(status=status)
+        if search:
+            needle = search.lower()
+            rows = [r for r in rows
+                    if needle in str(r.get('company') or '').lower()
+                    or needle in str(r.get('role') or '').lower()]
+        if min_score is not None:
+            rows = [r for r in rows if (r.get('match_score') or 0) >= min_score]
+        return rows[offset:offset + limit], len(rows)
+
+    @abstractmethod
+    def update_job(self, job_id: int, update_data: Dict) -> None:
+        """Update columns of a single job"""
+
+    def update_jobs(self, rows: List[Dict], columns: List[str]) -> None:
+        """Write `columns` of many jobs, batched where the backend can
+
+        Args:
+            rows: Full job rows (as fetched, with the new values), matched by id
+            columns: The columns that changed
+        """
+        for row in rows:
+            self.update_job(row['id'], {column: row[column] for column in columns})
+
+    @abstractmethod
+    def delete_job(self, job_id: int) -> None:
+        """Delete a single job"""
+
+    def delete_jobs_by_ids(self, job_ids: List[int]) -> None:
+        """Delete the given jobs, batched where the backend can"""
+        for job_id in job_ids:
+            self.delete_job(job_id)
+
+    @abstractmethod
+    def delete_all(self) -> None:
+        """Delete every job (table structure is preserved)"""
+
+    @abstractmethod
+    def fetch_jobs_page(self, after_id: int = 0, limit: int = 1000) -> List[Dict]:
+        """Return up to `limit` rows with id > after_id, in id order (keyset paging)"""
+
+    @abstractmethod
+    def id_bounds(self) -> Tuple[Optional[int], Optional[int]]:
+        """Return the (min, max) job id, or (None, None) if the table is empty"""
+
+    @abstractmethod
+    def delete_jobs(self, id_from: int, id_to: int,
+                    older_than: Optional[str] = None,
+                    statuses: Optional[List[str]] = None) -> int:
+        """Delete jobs with id_from <= id < id_to
+
+        If older_than (a YYYY-MM-DD date_found cutoff) and/or statuses are
+        given, only rows matching either criterion are deleted.
+
+        Returns:
+            int: Number of rows deleted
+        """
+
+    def status_summary(self) -> Dict:
+        """Return total count, per-status counts and average match score
+
+        The default implementation aggregates client-side from fetch_jobs();
+        backends that can aggregate server-side should override it.
+        """
+        rows = self.fetch_jobs()
+        by_status = {}
+        scores = []
+        for row in rows:
+            by_status[row.get('status')] = by_status.get(row.get('status'), 0) + 1
+            if row.get('match_score') is not None:
+                scores.append(float(row['match_score']))
+        return {
+            "total": len(rows),
+            "by_status": by_status,
+            "avg_match_score": sum(scores) / len(scores) if scores else None
+        }
+
+
+class SupabaseBackend(StorageBackend):
+    """Jobs table hosted in Supabase (PostgreSQL over PostgREST)"""
+
+    name = "supabase"
+    label = "Supabase"
+
+    def __init__(self, url: str, key: str, http_client=None):
+        import httpx
+        from supabase import create_client, ClientOptions
+
+        # Reuse one pooled HTTP/2 session for every PostgREST request
+        self.http_client = http_client or httpx.Client(
+            http2=True,
+            follow_redirects=True,
+            timeout=SUPABASE_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=SUPABASE_MAX_CONNECTIONS,
+                max_keepalive_connections=SUPABASE_MAX_CONNECTIONS
+            )
+        )
+        try:
+            options = ClientOptions(httpx_client=self.http_client)
+        except TypeError:
+            # supabase-py releases before 2.10 manage their own session
+            options = ClientOptions(postgrest_client_timeout=SUPABASE_TIMEOUT)
+        self.client = create_client(url, key, options=options)
+
+    def _table(self):
+        return self.client.table('jobs')
+
+    def ping(self) -> bool:
+        self._table().select("id").limit(1).execute()
+        return True
+
+    def insert_job(self, job_data: Dict) -> Optional[int]:
+        data = self._table().insert(job_data).execute().data
+        return data[0]['id'] if data else None
+
+    def fetch_jobs(self, status: Optional[str] = None) -> List[Dict]:
+        query = self._table().select("*")
+        if status is not None:
+            query = query.eq('status', status)
+        result = query.order('date_found', desc=True).order('match_score', desc=True).execute()
+        return result.data or []
+
+    def find_job_id(self, link: str) -> Optional[int]:
+        result = self._table().select("id").eq('link', link).limit(1).execute()
+        if result.data:
+            return result.data[0]['id']
+        return None
+
+    def fetch_jobs_by_ids(self, job_ids: List[int]) -> List[Dict]:
+        if not job_ids:
+            return []
+        return self._table().select("*").in_('id', list(job_ids)).execute().data or []
+
+    def fetch_jobs_by_links(self, links: List[str]) -> List[Dict]:
+        links = list(links)
+        rows = []
+        for start in range(0, len(links), LINK_LOOKUP_CHUNK):
+            chunk = links[start:start + LINK_LOOKUP_CHUNK]
+            rows.extend(self._table().select("*").in_('link', chunk).execute().data or [])
+        return rows
+
+    def query_jobs(self, status: Optional[str] = None, search: Optional[str] = None,
+                   min_score: Optional[float] = None,
+                   offset: int = 0, limit: int = 50) -> Tuple[List[Dict], int]:
+        from postgrest.types import CountMethod
+
+        query = self._table().select("*", count=CountMethod.exact)
+        if status is not None:
+            query = query.eq('status', status)
+        if search:
+            # PostgREST or-filter syntax; strip characters that would break it
+            term = "".join(ch for ch in search if ch not in ',()*"')
+            query = query.or_(f"company.ilike.*{term}*,role.ilike.*{term}*")
+        if min_score is not None:
+            query = query.gte('match_score', min_score)
+        result = (query.order('date_found', desc=True).order('match_score', desc=True)
+                  .range(offset, offset + limit - 1).execute())
+        return result.data or [], result.count or 0
+
+    def update_job(self, job_id: int, update_data: Dict) -> None:
+        self._table().update(update_data).eq('id', job_id).execute()
+
+    def update_jobs(self, rows: List[Dict], columns: List[str]) -> None:
+        # Full rows, so the upsert satisfies NOT NULL columns; id conflicts update
+        rows = list(rows)
+        for start in range(0, len(rows), BULK_WRITE_CHUNK):
+            self._table().upsert(rows[start:start + BULK_WRITE_CHUNK], on_conflict='id').execute()
+
+    def delete_job(self, job_id: int) -> None:
+        self._table().delete().eq('id', job_id).execute()
+
+    def delete_jobs_by_ids(self, job_ids: List[int]) -> None:
+        job_ids = [int(job_id) for job_id in job_ids]
+        for start in range(0, len(job_ids), BULK_WRITE_CHUNK):
+            self._table().delete().in_('id', job_ids[start:start + BULK_WRITE_CHUNK]).execute()
+
+    def delete_all(self) -> None:
+        self._table().delete().neq('id', 0).execute()
+
+    def fetch_jobs_page(self, after_id: int = 0, limit: int = 1000) -> List[Dict]:
+        result = self._table().select("*").gt('id', after_id).order('id').limit(limit).execute()
+        return result.data or []
+
+    def id_bounds(self) -> Tuple[Optional[int], Optional[int]]:
+        first = self._table().select("id").order('id').limit(1).execute().data
+        if not first:
+            return None, None
+        last = self._table().select("id").order('id', desc=True).limit(1).execute().data
+        return first[0]['id'], last[0]['id']
+
+    def delete_jobs(self, id_from: int, id_to: int,
+                    older_than: Optional[str] = None,
+                    statuses: Optional[List[str]] = None) -> int:
+        from postgrest.types import CountMethod, ReturnMethod
+
+        query = self._table().delete(count=CountMethod.exact, returning=ReturnMethod.minimal)
+        query = query.gte('id', id_from).lt('id', id_to)
+
+        conditions = []
+        if older_than:
+            conditions.append(f"date_found.lt.{older_than}")
+        if statuses:
+            quoted = ",".join(f'"{status}"' for status in statuses)
+            conditions.append(f"status.in.({quoted})")
+        if conditions:
+            query = query.or_(",".join(conditions))
+
+        return query.execute().count or 0
+
+
+class SQLiteBackend(StorageBackend):
+    """Jobs table in a local SQLite file for single-node/offline use"""
+
+    name = "sqlite"
+    label = "SQLite"
+
+    # Columns callers may write; guards the dynamic UPDATE statement
+    WRITABLE_COLUMNS = {
+        "company", "role", "location", "duration", "link", "match_score",
+        "status", "notes", "date_found", "date_updated", "date_applied"
+    }
+
+    def __init__(self, db_path: str = SQLITE_DB_PATH):
+        self.db_path = db_path
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        # Streamlit runs each session in its own thread, so share one
+        # connection behind a lock instead of binding it to a thread
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SQLITE_SCHEMA)
+
+    def _check_columns(self, data: Dict):
+        unknown = set(data) - self.WRITABLE_COLUMNS
+        if unknown:
+            raise ValueError(f"Unknown job columns: {sorted(unknown)}")
+
+    @staticmethod
+    def _to_sql(value):
+        """Unwrap numpy scalars (e.g. int64 scores from pandas) for sqlite3"""
+        return value.item() if hasattr(value, 'item') else value
+
+    def ping(self) -> bool:
+        with self._lock:
+            self.conn.execute("SELECT 1").fetchone()
+        return True
+
+    def insert_job(self, job_data: Dict) -> Optional[int]:
+        self._check_columns(job_data)
+        columns = list(job_data)
+        placeholders = ", ".join("?" for _ in columns)
+        sql = f"INSERT INTO jobs ({', '.join(columns)}) VALUES ({placeholders})"
+        with self._lock, self.conn:
+            return self.conn.execute(sql, [self._to_sql(job_data[c]) for c in columns]).lastrowid
+
+    def fetch_jobs(self, status: Optional[str] = None) -> List[Dict]:
+        sql = "SELECT * FROM jobs"
+        params = []
+        if status is not None:
+            sql += " WHERE status = ?"
+            params.append(status)
+        sql += " ORDER BY date_found DESC, match_score DESC"
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def find_job_id(self, link: str) -> Optional[int]:
+        with self._lock:
+            row = self.conn.execute("SELECT id FROM jobs WHERE link = ?", (link,)).fetchone()
+        return row["id"] if row else None
+
+    def fetch_jobs_by_ids(self, job_ids: List[int]) -> List[Dict]:
+        if not job_ids:
+            return []
+        placeholders = ", ".join("?" for _ in job_ids)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT * FROM jobs WHERE id IN ({placeholders})", [int(i) for i in job_ids]
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def fetch_jobs_by_links(self, links: List[str]) -> List[Dict]:
+        links = list(links)
+        rows = []
+        with self._lock:
+            for start in range(0, len(links), BULK_WRITE_CHUNK):
+                chunk = links[start:start + BULK_WRITE_CHUNK]
+                rows.extend(self.conn.execute(
+                    f"SELECT * FROM jobs WHERE link IN ({', '.join('?' for _ in chunk)})", chunk
+                ).fetchall())
+        return [dict(row) for row in rows]
+
+    def query_jobs(self, status: Optional[str] = None, search: Optional[str] = None,
+                   min_score: Optional[float] = None,
+                   offset: int = 0, limit: int = 50) -> Tuple[List[Dict], int]:
+        conditions = []
+        params = []
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if search:
+            # Literal substring match, like the other backends: escape LIKE wildcards
+            term = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            conditions.append("(company LIKE ? ESCAPE '\\' OR role LIKE ? ESCAPE '\\')")
+            params.extend([f"%{term}%", f"%{term}%"])
+        if min_score is not None:
+            conditions.append("match_score >= ?")
+            params.append(min_score)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        with self._lock:
+            total = self.conn.execute(f"SELECT COUNT(*) FROM jobs{where}", params).fetchone()[0]
+            rows = self.conn.execute(
+                f"SELECT * FROM jobs{where} ORDER BY date_found DESC, match_score DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        return [dict(row) for row in rows], total
+
+    def update_job(self, job_id: int, update_data: Dict) -> None:
+        if not update_data:
+            return
+        self._check_columns(update_data)
+        assignments = ", ".join(f"{c} = ?" for c in update_data)
+        with self._lock, self.conn:
+            self.conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ?",
+                [self._to_sql(v) for v in update_data.values()] + [job_id]
+            )
+
+    def update_jobs(self, rows: List[Dict], columns: List[str]) -> None:
+        if not rows or not columns:
+            return
+        self._check_columns(dict.fromkeys(columns))
+        assignments = ", ".join(f"{c} = ?" for c in columns)
+        with self._lock, self.conn:
+            self.conn.executemany(
+                f"UPDATE jobs SET {assignments} WHERE id = ?",
+                [[self._to_sql(row[c]) for c in columns] + [row['id']] for row in rows]
+            )
+
+    def delete_job(self, job_id: int) -> None:
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def delete_jobs_by_ids(self, job_ids: List[int]) -> None:
+        job_ids = [int(job_id) for job_id in job_ids]
+        with self._lock, self.conn:
+            for start in range(0, len(job_ids), BULK_WRITE_CHUNK):
+                chunk = job_ids[start:start + BULK_WRITE_CHUNK]
+                self.conn.execute(f"DELETE FROM jobs WHERE id IN ({', '.join('?' for _ in chunk)})", chunk)
+
+    def delete_all(self) -> None:
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM jobs")
+
+    def fetch_jobs_page(self, after_id: int = 0, limit: int = 1000) -> List[Dict]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM jobs WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def id_bounds(self) -> Tuple[Optional[int], Optional[int]]:
+        with self._lock:
+            row = self.conn.execute("SELECT MIN(id), MAX(id) FROM jobs").fetchone()
+        return row[0], row[1]
+
+    def delete_jobs(self, id_from: int, id_to: int,
+                    older_than: Optional[str] = None,
+                    statuses: Optional[List[str]] = None) -> int:
+        sql = "DELETE FROM jobs WHERE id >= ? AND id < ?"
+        params = [id_from, id_to]
+
+        conditions = []
+        if older_than:
+            conditions.append("date_found < ?")
+            params.append(older_than)
+        if statuses:
+            conditions.append(f"status IN ({', '.join('?' for _ in statuses)})")
+            params.extend(statuses)
+        if conditions:
+            sql += f" AND ({' OR '.join(conditions)})"
+
+        with self._lock, self.conn:
+            return self.conn.execute(sql, params).rowcount
+
+    def status_summary(self) -> Dict:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"
+            ).fetchall()
+            avg = self.conn.execute("SELECT AVG(match_score) FROM jobs").fetchone()[0]
+        by_status = {row["status"]: row["n"] for row in rows}
+        return {
+            "total": sum(by_status.values()),
+            "by_status": by_status,
+            "avg_match_score": avg
+        }
+
+
+def create_backend(name: Optional[str] = None) -> Optional[StorageBackend]:
+    """Create the configured storage backend
+
+    Args:
+        name: "supabase" or "sqlite"; defaults to the STORAGE_BACKEND env
+            var, then to Supabase if credentials are set and SQLite otherwise
+
+    Returns:
+        StorageBackend, or None if Supabase was requested without credentials
+    """
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_KEY")
+
+    name = name or os.getenv("STORAGE_BACKEND", "").strip() or ("supabase" if url and key else "sqlite")
+    name = name.lower()
+
+    if name == "sqlite":
+        return SQLiteBackend(os.getenv("SQLITE_DB_PATH", SQLITE_DB_PATH))
+    if name == "supabase":
+        if not (url and key):
+            return None
+        return SupabaseBackend(url, key)
+    raise ValueError(f"Unknown storage backend: {name}")
+
+
+# --- Process-wide backend and cached health status ---
+_backend: Optional[StorageBackend] = None
+_backend_created = False
+_backend_lock = threading.Lock()
+_health: Optional[Dict] = None
+
+
+def get_backend() -> Optional[StorageBackend]:
+    """Get the shared backend, creating it on first use (no work at import)"""
+    global _backend, _backend_created
+    if not _backend_created:
+        with _backend_lock:
+            if not _backend_created:
+                _backend = create_backend()
+                if _backend is not None:
+                    instrument_methods(_backend, "db", TIMED_METHODS)
+                _backend_created = True
+    return _backend
+
+
+def get_health(ttl: float = HEALTH_TTL, force: bool = False) -> Dict:
+    """Return the backend connection status, pinging at most once per ttl
+
+    Returns:
+        dict: {"ok", "backend", "label", "error", "checked_at"}
+    """
+    global _health
+    now = time.time()
+    if not force and _health is not None and now - _health["checked_at"] < ttl:
+        return _health
+
+    health = {"ok": False, "backend": None, "label": None, "error": None, "checked_at": now}
+    try:
+        backend = get_backend()
+        if backend is None:
+            health["error"] = "No database configured"
+        else:
+            health["backend"] = backend.name
+            health["label"] = backend.label
+            health["ok"] = backend.ping()
+    except Exception as e:
+        health["error"] = str(e)
+
+    _health = health
+    return health
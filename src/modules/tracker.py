@@ -1,8 +1,9 @@
-import pandas as pd
 import os
+import sys
 from datetime import datetime
-from openpyxl import load_workbook
-from openpyxl.worksheet.datavalidation import DataValidation
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from excel_export import write_full_export, patch_rows
 
 # Define the path for your tracker
 TRACKER_FILE = os.path.join("data", "Job_Application_Tracker.xlsx")
@@ -25,19 +26,22 @@ def update_excel_tracker(new_jobs_df):
         print("⚠️ Database manager not available, using Excel only")
         use_db = False
 
-    # 1. Prepare the Data Structure
-    export_df = pd.DataFrame()
-    export_df['Date Found'] = [datetime.now().strftime("%Y-%m-%d")] * len(new_jobs_df)
-    export_df['Company'] = new_jobs_df['company']
-    export_df['Role'] = new_jobs_df['title']
-    
-    # Use .get() to avoid errors if AI didn't find these fields
-    export_df['Location'] = new_jobs_df.get('work_mode', 'Unknown') 
-    export_df['Duration'] = new_jobs_df.get('duration', 'Not Specified')
-    
-    export_df['Link'] = new_jobs_df['job_url']
-    export_df['Match Score'] = new_jobs_df['relevance_score']
-    export_df['Status'] = "Not Applied" # Default Status
+    # 1. Prepare the Data Structure (tracker rows keyed by database column)
+    date_found = datetime.now().strftime("%Y-%m-%d")
+    export_rows = [
+        {
+            "date_found": date_found,
+            "company": row['company'],
+            "role": row['title'],
+            # Use .get() to avoid errors if AI didn't find these fields
+            "location": row.get('work_mode', 'Unknown'),
+            "duration": row.get('duration', 'Not Specified'),
+            "link": row['job_url'],
+            "match_score": row['relevance_score'],
+            "status": "Not Applied"  # Default Status
+        }
+        for _, row in new_jobs_df.iterrows()
+    ]
     
     # 2. Add to database if available
     if use_db:
@@ -55,41 +59,14 @@ def update_excel_tracker(new_jobs_df):
         print(f"   📝 Added {len(new_jobs_df)} jobs to database and Excel")
     else:
         # Fallback to Excel only
-        # 3. Check if Tracker exists
+        # 3. Append to the existing Tracker in place (one write, Status
+        #    dropdown refreshed); links already in Excel are left untouched
         if os.path.exists(TRACKER_FILE):
-            existing_df = pd.read_excel(TRACKER_FILE)
-            
-            # Double-check: Don't add if Link is already in Excel
-            export_df = export_df[~export_df['Link'].isin(existing_df['Link'])]
-            
-            if export_df.empty:
+            result = patch_rows(export_rows, path=TRACKER_FILE, update_existing=False)
+            added = result["appended"]
+            if added == 0:
                 return
-
-            final_df = pd.concat([existing_df, export_df], ignore_index=True)
         else:
-            final_df = export_df
-
-        # 4. Save to Excel
-        final_df.to_excel(TRACKER_FILE, index=False)
-
-        # 5. Add Dropdown Menus
-        add_dropdowns(TRACKER_FILE, len(final_df))
-        print(f"   📝 Added {len(export_df)} jobs to {TRACKER_FILE}")
-
-def add_dropdowns(filename, total_rows):
-    """Adds the 'Status' dropdown to the Excel file."""
-    try:
-        wb = load_workbook(filename)
-        ws = wb.active
+            added = write_full_export(export_rows, TRACKER_FILE)
 
-        # The Dropdown Options
-        options = '"Not Applied,Applied,Ongoing,Interviewing,Got Selected,Rejected"'
-        dv = DataValidation(type="list", formula1=options, allow_blank=True)
-        
-        # Apply to Column H (Status), from row 2 down to the end
-        dv.add(f'H2:H{total_rows + 50}') 
-        
-        ws.add_data_validation(dv)
-        wb.save(filename)
-    except Exception as e:
-        print(f"   ⚠️ Could not add dropdowns (System limitation): {e}")
\ No newline at end of file
+        print(f"   📝 Added {added} jobs to {TRACKER_FILE}")
\ No newline at end of file
@@ -0,0 +1,288 @@
+"""
+Write-Behind Queue for JobSniper Application Tracker
+Buffers tracker mutations in a local SQLite journal and flushes them in the background
+"""
+
+import os
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+PENDING_WRITES_FILE = os.path.join("data", "pending_writes.db")
+MAX_ATTEMPTS = 5
+
+QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_writes (
+    job_id INTEGER PRIMARY KEY,
+    op TEXT NOT NULL,
+    fields TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 1,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    enqueued_at TEXT NOT NULL,
+    last_error TEXT
+);
+CREATE TABLE IF NOT EXISTS dead_writes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL,
+    op TEXT NOT NULL,
+    fields TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    enqueued_at TEXT NOT NULL,
+    failed_at TEXT NOT NULL,
+    last_error TEXT
+);
+"""
+
+
+class WriteBehindQueue:
+    """Durable, coalescing queue of per-job tracker writes
+
+    Each job id has at most one pending entry: repeated updates are merged
+    field by field and a delete supersedes any pending update. Entries stay
+    in the journal until the apply callback has succeeded, so writes made
+    while offline (or before a restart) are replayed on the next flush.
+    An entry that keeps failing is moved to the dead_writes table after
+    max_attempts tries so it stops blocking the queue.
+    """
+
+    def __init__(self, apply_writes: Callable[[List[Tuple[int, str, Dict]]], None],
+                 queue_path: str = PENDING_WRITES_FILE,
+                 flush_interval: float = 2.0,
+                 batch_size: int = 50,
+                 max_backoff: float = 60.0,
+                 max_attempts: int = MAX_ATTEMPTS,
+                 on_flush: Optional[Callable[[List[Tuple[int, str, Dict]]], None]] = None):
+        """
+        Args:
+            apply_writes: Callable receiving a batch of (job_id, op, fields)
+                writes and applying them to the database in as few round
+                trips as it can; raising leaves the entries queued
+            queue_path: SQLite journal file
+            flush_interval: Seconds between background flushes
+            batch_size: Maximum entries applied per flush
+            max_backoff: Upper bound for the retry delay after failures
+            max_attempts: Failed tries before an entry is dead-lettered
+            on_flush: Optional callback receiving the applied (job_id, op, fields)
+                writes after a non-empty flush
+        """
+        self.apply_writes = apply_writes
+        self.queue_path = queue_path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self.on_flush = on_flush
+
+        os.makedirs(os.path.dirname(queue_path) or ".", exist_ok=True)
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self.conn = sqlite3.connect(queue_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(QUEUE_SCHEMA)
+
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    # --- Enqueue ---
+    def enqueue_update(self, job_id: int, fields: Dict) -> None:
+        """Queue column updates for a job, merging with any pending update"""
+        self.enqueue_updates({job_id: fields})
+
+    def enqueue_updates(self, updates: Dict[int, Dict]) -> None:
+        """Queue updates for several jobs in one journal transaction"""
+        self.enqueue_changes(updates)
+
+    def enqueue_changes(self, updates: Dict[int, Dict],
+                        deletes: Optional[Dict[int, Optional[Dict]]] = None) -> None:
+        """Queue updates and deletes for several jobs in one journal transaction
+
+        Args:
+            updates: {job_id: fields}
+            deletes: {job_id: context kept with the delete (e.g. the job link) or None}
+        """
+        now = datetime.now().isoformat()
+        with self._lock, self.conn:
+            for job_id, fields in updates.items():
+                job_id = int(job_id)
+                row = self.conn.execute(
+                    "SELECT op, fields FROM pending_writes WHERE job_id = ?", (job_id,)
+                ).fetchone()
+                if row is None:
+                    self.conn.execute(
+                        "INSERT INTO pending_writes (job_id, op, fields, enqueued_at) VALUES (?, 'update', ?, ?)",
+                        (job_id, json.dumps(fields), now)
+                    )
+                elif row["op"] == "update":
+                    merged = json.loads(row["fields"])
+                    merged.update(fields)
+                    self.conn.execute(
+                        "UPDATE pending_writes SET fields = ?, version = version + 1 WHERE job_id = ?",
+                        (json.dumps(merged), job_id)
+                    )
+                # A pending delete wins over later edits to the same job
+            for job_id, fields in (deletes or {}).items():
+                self.conn.execute(
+                    """INSERT INTO pending_writes (job_id, op, fields, enqueued_at) VALUES (?, 'delete', ?, ?)
+                       ON CONFLICT(job_id) DO UPDATE SET op = 'delete', fields = excluded.fields, version = version + 1""",
+                    (int(job_id), json.dumps(fields or {}), now)
+                )
+        self._wakeup.set()
+
+    def enqueue_delete(self, job_id: int, fields: Optional[Dict] = None) -> None:
+        """Queue deletion of a job, discarding any pending update
+
+        Args:
+            fields: Optional context kept with the delete (e.g. the job link)
+        """
+        self.enqueue_changes({}, {job_id: fields})
+
+    # --- Inspection ---
+    def pending(self) -> Dict[int, Dict]:
+        """Return {job_id: {"op": ..., "fields": {...}}} for all queued writes"""
+        with self._lock:
+            rows = self.conn.execute("SELECT job_id, op, fields FROM pending_writes").fetchall()
+        return {row["job_id"]: {"op": row["op"], "fields": json.loads(row["fields"])} for row in rows}
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM pending_writes").fetchone()[0]
+
+    def dead_letters(self) -> List[Dict]:
+        """Return the writes given up on after max_attempts failures"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT job_id, op, fields, attempts, failed_at, last_error FROM dead_writes ORDER BY id"
+            ).fetchall()
+        return [{**dict(row), "fields": json.loads(row["fields"])} for row in rows]
+
+    # --- Flushing ---
+    def flush(self) -> int:
+        """Apply up to batch_size queued writes
+
+        Returns:
+            int: Number of writes applied; failed writes stay queued
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch = self.conn.execute(
+                    """SELECT job_id, op, fields, version, attempts, enqueued_at FROM pending_writes
+                       ORDER BY attempts, enqueued_at LIMIT ?""",
+                    (self.batch_size,)
+                ).fetchall()
+
+            writes = [(row["job_id"], row["op"], json.loads(row["fields"])) for row in batch]
+            if not writes:
+                return 0
+            try:
+                self.apply_writes(writes)
+                failures = [None] * len(writes)
+            except Exception as e:
+                if len(writes) == 1:
+                    failures = [e]
+                else:
+                    # Apply one by one so a bad entry doesn't hold back the rest
+                    failures = []
+                    for write in writes:
+                        try:
+                            self.apply_writes([write])
+                            failures.append(None)
+                        except Exception as write_error:
+                            failures.append(write_error)
+
+            applied = []
+            errors = 0
+            dead = 0
+            with self._lock, self.conn:
+                for row, write, error in zip(batch, writes, failures):
+                    if error is not None:
+                        errors += 1
+                        last_error = str(error)[:500]
+                        if row["attempts"] + 1 >= self.max_attempts:
+                            # Give up on it unless it was edited again mid-flush
+                            moved = self.conn.execute(
+                                "DELETE FROM pending_writes WHERE job_id = ? AND version = ?",
+                                (row["job_id"], row["version"])
+                            ).rowcount
+                            if moved:
+                                dead += 1
+                                self.conn.execute(
+                                    """INSERT INTO dead_writes (job_id, op, fields, attempts, enqueued_at, failed_at, last_error)
+                                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                                    (row["job_id"], row["op"], row["fields"], row["attempts"] + 1,
+                                     row["enqueued_at"], datetime.now().isoformat(), last_error)
+                                )
+                                continue
+                        self.conn.execute(
+                            "UPDATE pending_writes SET attempts = attempts + 1, last_error = ? WHERE job_id = ?",
+                            (last_error, row["job_id"])
+                        )
+                        continue
+                    # Only drop the entry if it was not edited again mid-flush
+                    self.conn.execute(
+                        "DELETE FROM pending_writes WHERE job_id = ? AND version = ?",
+                        (row["job_id"], row["version"])
+                    )
+                    applied.append(write)
+
+        if applied and self.on_flush:
+            try:
+                self.on_flush(applied)
+            except Exception as e:
+                print(f"⚠️ Post-flush hook failed: {e}")
+
+        if dead:
+            print(f"⚠️ Gave up on {dead} queued write(s) after {self.max_attempts} attempts; see dead_writes in {self.queue_path}")
+        if errors > dead:
+            raise RuntimeError(f"{errors - dead} queued write(s) failed; will retry")
+        return len(applied)
+
+    def flush_all(self) -> int:
+        """Flush until the queue is empty or a write fails"""
+        total = 0
+        while self.pending_count():
+            applied = self.flush()
+            if applied == 0:
+                break
+            total += applied
+        return total
+
+    def _run(self):
+        delay = self.flush_interval
+        while not self._stopped.is_set():
+            self._wakeup.wait(timeout=delay)
+            self._wakeup.clear()
+            # Give rapid successive edits a moment to coalesce
+            time.sleep(min(0.2, self.flush_interval))
+            try:
+                self.flush_all()
+                delay = self.flush_interval
+            except Exception as e:
+                print(f"⚠️ Write queue flush failed ({self.pending_count()} pending): {e}")
+                delay = min(delay * 2, self.max_backoff)
+
+    def start(self):
+        """Start the background flusher (replays writes left from a previous run)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="jobsniper-write-queue", daemon=True)
+        self._thread.start()
+        if self.pending_count():
+            self._wakeup.set()
+
+    def stop(self, flush: bool = True):
+        """Stop the background flusher, optionally flushing what is left"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        if flush:
+            try:
+                self.flush_all()
+            except Exception as e:
+                print(f"⚠️ {self.pending_count()} write(s) left queued for next start: {e}")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modules are imported as siblings, the same way the app imports them
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "modules"))
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from email_history import EmailHistory
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / "history.jsonl")
+
+
+def make_history(path):
+    return EmailHistory(path, legacy_path=None).refresh()
+
+
+def test_add_appends_only_new_urls(log_path):
+    history = make_history(log_path)
+    assert history.add(["https://a", "https://b"]) == 2
+    assert history.add(["https://b", "https://c"]) == 1
+
+    with open(log_path) as f:
+        assert [json.loads(line)["url"] for line in f] == ["https://a", "https://b", "https://c"]
+
+
+def test_refresh_picks_up_other_writers(log_path):
+    ours, theirs = make_history(log_path), make_history(log_path)
+    theirs.add(["https://theirs"])
+
+    assert "https://theirs" not in ours
+    assert "https://theirs" in ours.refresh()
+
+
+def test_own_append_does_not_skip_lines_written_before_it(log_path):
+    ours, theirs = make_history(log_path), make_history(log_path)
+    # Another process appends after our last refresh...
+    theirs.add(["https://theirs"])
+    with open(log_path, "a") as f:
+        f.write(json.dumps({"url": "https://raw", "emailed_at": None}) + "\n")
+    # ...then we append; add() refreshes first, so nothing is lost
+    ours.add(["https://ours"])
+
+    assert {"https://theirs", "https://raw", "https://ours"} <= set(ours.refresh())
+    assert len(ours) == 3
+
+
+def test_partial_last_line_is_read_once_complete(log_path):
+    history = make_history(log_path)
+    line = json.dumps({"url": "https://partial", "emailed_at": None}) + "\n"
+    with open(log_path, "a") as f:
+        f.write(line[:10])
+
+    assert "https://partial" not in history.refresh()
+    with open(log_path, "a") as f:
+        f.write(line[10:])
+    assert "https://partial" in history.refresh()
+
+
+def test_shrunken_log_is_reread(log_path):
+    history = make_history(log_path)
+    history.add(["https://old-1", "https://old-2"])
+    with open(log_path, "w") as f:
+        f.write(json.dumps({"url": "https://restored", "emailed_at": None}) + "\n")
+
+    assert set(history.refresh()) == {"https://restored"}
+
+
+def test_bad_lines_are_skipped(log_path):
+    with open(log_path, "w") as f:
+        f.write(json.dumps({"url": "https://good", "emailed_at": None}) + "\n")
+        f.write("not json\n")
+        f.write(json.dumps({"no_url": True}) + "\n")
+
+    assert set(make_history(log_path)) == {"https://good"}
+
+
+def test_legacy_history_is_migrated(tmp_path, log_path):
+    legacy_path = tmp_path / "history.json"
+    legacy_path.write_text(json.dumps(["https://legacy-1", "https://legacy-2"]))
+
+    history = EmailHistory(log_path, legacy_path=str(legacy_path)).refresh()
+    assert set(history) == {"https://legacy-1", "https://legacy-2"}
+    assert not legacy_path.exists()
+    assert (tmp_path / "history.json.migrated").exists()
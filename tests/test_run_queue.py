@@ -0,0 +1,59 @@
+from datetime import datetime
+
+import pytest
+
+from run_queue import cron_matches, parse_cron, normalize_params, STAGES
+
+# 2026-10-18 is a Sunday, 2026-10-19 a Monday
+SUNDAY = datetime(2026, 10, 18, 9, 0)
+MONDAY = datetime(2026, 10, 19, 9, 0)
+
+
+def test_parse_cron_fields():
+    minute, hour, day, month, weekday = parse_cron("*/15 9-17/4 1,15 * 1-5")
+    assert minute == {0, 15, 30, 45}
+    assert hour == {9, 13, 17}
+    assert day == {1, 15}
+    assert month == set(range(1, 13))
+    assert weekday == {1, 2, 3, 4, 5}
+
+
+@pytest.mark.parametrize("expr", ["* * *", "60 * * * *", "* 24 * * *", "* * 0 * *", "* * * * 8", "5-1 * * * *"])
+def test_parse_cron_rejects_bad_expressions(expr):
+    with pytest.raises(ValueError):
+        parse_cron(expr)
+
+
+def test_seven_is_sunday():
+    assert parse_cron("0 9 * * 7")[4] == {0}
+    assert parse_cron("0 9 * * 5-7")[4] == {5, 6, 0}
+    assert cron_matches("0 9 * * 7", SUNDAY)
+    assert not cron_matches("0 9 * * 7", MONDAY)
+
+
+def test_day_of_month_or_weekday_when_both_restricted():
+    # Fires on the 1st of the month and on every Monday
+    assert cron_matches("0 9 1 * 1", MONDAY)
+    assert cron_matches("0 9 1 * 1", datetime(2026, 10, 1, 9, 0))
+    assert not cron_matches("0 9 1 * 1", SUNDAY)
+
+
+def test_day_fields_combine_with_and_when_one_is_a_wildcard():
+    assert cron_matches("0 9 * * 1", MONDAY)
+    assert not cron_matches("0 9 * * 1", SUNDAY)
+    assert cron_matches("0 9 19 * *", MONDAY)
+    # */2 is the odd days; the 26th is an even Monday
+    assert cron_matches("0 9 */2 * 1", MONDAY)
+    assert not cron_matches("0 9 */2 * 1", datetime(2026, 10, 26, 9, 0))
+
+
+def test_minute_and_hour_must_match():
+    assert not cron_matches("30 9 * * *", MONDAY)
+    assert not cron_matches("0 10 * * *", MONDAY)
+
+
+def test_normalize_params_orders_stages():
+    assert normalize_params()["stages"] == STAGES
+    assert normalize_params({"stages": ["notify", "rescore"]})["stages"] == ["rescore", "notify"]
+    with pytest.raises(ValueError):
+        normalize_params({"stages": ["deploy"]})
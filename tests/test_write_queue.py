@@ -0,0 +1,120 @@
+import pytest
+
+from write_queue import WriteBehindQueue
+
+
+class RecordingApplier:
+    """apply_writes stand-in that records batches and can fail chosen jobs"""
+
+    def __init__(self, failing=()):
+        self.batches = []
+        self.failing = set(failing)
+
+    def __call__(self, writes):
+        self.batches.append(list(writes))
+        if any(job_id in self.failing for job_id, _, _ in writes):
+            raise RuntimeError("backend rejected the write")
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    queues = []
+
+    def make(apply_writes, **kwargs):
+        queue = WriteBehindQueue(apply_writes, queue_path=str(tmp_path / "pending_writes.db"), **kwargs)
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        queue.conn.close()
+
+
+def test_updates_to_the_same_job_are_merged(make_queue):
+    queue = make_queue(RecordingApplier())
+    queue.enqueue_update(1, {"status": "Applied", "notes": "first"})
+    queue.enqueue_update(1, {"notes": "second"})
+
+    assert queue.pending() == {1: {"op": "update", "fields": {"status": "Applied", "notes": "second"}}}
+
+
+def test_delete_supersedes_pending_and_later_updates(make_queue):
+    queue = make_queue(RecordingApplier())
+    queue.enqueue_update(1, {"status": "Applied"})
+    queue.enqueue_delete(1, {"link": "https://example.com/1"})
+    queue.enqueue_update(1, {"notes": "too late"})
+
+    assert queue.pending() == {1: {"op": "delete", "fields": {"link": "https://example.com/1"}}}
+
+
+def test_flush_applies_the_whole_batch_in_one_call(make_queue):
+    applier = RecordingApplier()
+    applied = []
+    queue = make_queue(applier, on_flush=applied.extend)
+    queue.enqueue_changes({1: {"status": "Applied"}, 2: {"notes": "x"}}, {3: None})
+
+    assert queue.flush() == 3
+    assert len(applier.batches) == 1
+    assert sorted(job_id for job_id, _, _ in applier.batches[0]) == [1, 2, 3]
+    assert sorted(applied) == [(1, "update", {"status": "Applied"}), (2, "update", {"notes": "x"}),
+                               (3, "delete", {})]
+    assert queue.pending_count() == 0
+
+
+def test_edit_made_during_flush_stays_queued(make_queue):
+    queue = None
+
+    def apply_and_edit(writes):
+        # Another edit lands while the first version is being written
+        queue.enqueue_update(1, {"notes": "newer"})
+
+    queue = make_queue(apply_and_edit)
+    queue.enqueue_update(1, {"notes": "older"})
+
+    assert queue.flush() == 1
+    assert queue.pending() == {1: {"op": "update", "fields": {"notes": "newer"}}}
+
+
+def test_failing_entry_does_not_hold_back_the_rest(make_queue):
+    queue = make_queue(RecordingApplier(failing={2}))
+    queue.enqueue_updates({1: {"notes": "a"}, 2: {"notes": "b"}, 3: {"notes": "c"}})
+
+    with pytest.raises(RuntimeError):
+        queue.flush()
+    assert list(queue.pending()) == [2]
+
+
+def test_entry_is_dead_lettered_after_max_attempts(make_queue):
+    queue = make_queue(RecordingApplier(failing={1}), max_attempts=2)
+    queue.enqueue_update(1, {"notes": "poison"})
+
+    with pytest.raises(RuntimeError):
+        queue.flush()
+    assert queue.pending_count() == 1
+
+    assert queue.flush() == 0
+    assert queue.pending_count() == 0
+    [dead] = queue.dead_letters()
+    assert dead["job_id"] == 1
+    assert dead["attempts"] == 2
+    assert dead["fields"] == {"notes": "poison"}
+
+
+def test_failing_entries_are_retried_after_fresh_ones(make_queue):
+    applier = RecordingApplier(failing={1})
+    queue = make_queue(applier, batch_size=1)
+    queue.enqueue_update(1, {"notes": "poison"})
+    with pytest.raises(RuntimeError):
+        queue.flush()
+    queue.enqueue_update(2, {"notes": "fresh"})
+
+    assert queue.flush() == 1
+    assert applier.batches[-1] == [(2, "update", {"notes": "fresh"})]
+
+
+def test_journal_survives_a_restart(make_queue):
+    make_queue(RecordingApplier()).enqueue_update(5, {"status": "Rejected"})
+
+    applier = RecordingApplier()
+    assert make_queue(applier).flush_all() == 1
+    assert applier.batches == [[(5, "update", {"status": "Rejected"})]]